@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A benchmark script which measures how many plotters per second can be constructed (settings resolution and
+BasePlotter.__init__ only, nothing is drawn) and how fast settings are snapshot and cloned into a new plotter.
+Run from the repository root with:
+    PYTHONPATH=. python benchmarks/construct_plotters.py [count]
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+import sys
+import time
+import numpy as np
+import pandas as pd
+import readyplot as rp
+
+# %% BUILD SMALL INPUTS ONCE SO THE TIMING ONLY COVERS PLOTTER CONSTRUCTION
+def main(count=2000):
+    DF = pd.DataFrame({'x': np.repeat(['A', 'B'], 10), 'y': np.arange(20.0), 'z': np.tile(['C', 'D'], 10)})
+    x, y = list(range(20)), list(range(20))
+    source = rp.bar(DF, xlab='x', ylab='y', zlab='z', title='T')
+    snapshot = source.get_copy_settings(include_problematic=True)
+    cases = {
+        'settings only': lambda: rp.initialize_common_defaults((DF,), {'xlab': 'x', 'ylab': 'y', 'zlab': 'z'}),
+        'bar(DF)': lambda: rp.bar(DF, xlab='x', ylab='y', zlab='z'),
+        'scatter(x,y)': lambda: rp.scatter(x, y, dpi=100, legend_kwargs={'loc': 'upper left'}),
+        'boxwhisker(DF, settings)': lambda: rp.boxwhisker(DF, xlab='x', ylab='y', zlab='z', colors=['k', 'r'],
+                                                          title='T', errorbar='sd'),
+        'get_copy_settings()': lambda: source.get_copy_settings(),
+        'bar(imported_settings=...)': lambda: rp.bar(imported_settings=snapshot, dpi=100),
+    }
+    for name, build in cases.items():
+        build()
+        start = time.perf_counter()
+        for _ in range(count): build()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<28}{count / elapsed:>10.0f} /s  ({1e6 * elapsed / count:.1f} us each)")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A benchmark script which renders and saves many scatter plots in fresh interpreters, leaving the figures open, with
+auto_close=True and with auto_close=True and a FigurePool, and reports the open pyplot figures and the growth of the
+peak memory between the first tenth of the renders and the end. Fails (exit code 1) if a managed run grows by more than
+TARGET_MB. Run from the repository root with:
+    PYTHONPATH=. python benchmarks/figure_memory.py [renders]
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+import ast
+import os
+import subprocess
+import sys
+import tempfile
+
+# %% PINNED TARGET: PEAK MEMORY GROWTH (MB) ALLOWED ONCE THE FIGURES ARE CLOSED OR POOLED
+TARGET_MB = 20
+
+# %% ONE FRESH PROCESS RENDERING renders PLOTS WITH THE GIVEN LIFECYCLE SETTINGS
+WORKER = """
+import resource, numpy as np, readyplot as rp
+from matplotlib import pyplot as plt
+settings = {settings}
+if settings.pop('pool', False): settings['figure_pool'] = rp.FigurePool()
+rng = np.random.default_rng(0)
+x, y, z = list(rng.random(500)), list(rng.random(500)), ['A', 'B'] * 250
+peaks = []
+for i in range({renders}):
+    rp.scatter(x, y, z, dpi=100, folder_name={folder!r} + '/plot.png', **settings).plot()
+    peaks.append(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+print([len(plt.get_fignums()), peaks[{renders} // 10], peaks[-1]])
+"""
+
+def run(settings, renders, folder):
+    code = WORKER.format(settings=settings, renders=renders, folder=folder)
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)})
+    return ast.literal_eval(result.stdout.strip().splitlines()[-1])
+
+def main(renders=200):
+    worst = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, settings in [('left open        ', {}), ('auto_close       ', {'auto_close': True}),
+                                ('auto_close + pool', {'auto_close': True, 'pool': True})]:
+            open_figures, early, late = run(settings, renders, tmp)
+            if settings: worst = max(worst, late - early)
+            print(f"{label}: {open_figures:4d} open pyplot figures, peak memory {early:6.1f} MB after "
+                  f"{renders // 10} renders, {late:6.1f} MB after {renders}")
+    print(f"largest growth with managed figures: {worst:.1f} MB (target {TARGET_MB} MB)")
+    if worst > TARGET_MB: sys.exit(1)
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
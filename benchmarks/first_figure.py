@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A benchmark script which measures, in fresh interpreters, how long the first figure takes to render and save compared
+with the second one, without and with rp.warmup() beforehand (its own time is reported separately). Run from the
+repository root with:
+    PYTHONPATH=. python benchmarks/first_figure.py [runs]
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+import ast
+import os
+import subprocess
+import sys
+import tempfile
+
+# %% ONE FRESH PROCESS: OPTIONAL WARMUP, THEN TWO IDENTICAL BAR PLOTS SAVED TO A TEMPORARY FOLDER
+WORKER = """
+import time, readyplot as rp
+warm = rp.warmup(cache_dir={cache_dir!r}) if {warm} else 0.0
+times = []
+for i in range(2):
+    start = time.perf_counter()
+    rp.bar(['A', 'A', 'B', 'B'] * 5, list(range(20)), ['C', 'D'] * 10, use_pyplot=False,
+           folder_name={folder!r} + f'/{{i}}.png').plot()
+    times.append(time.perf_counter() - start)
+print([warm] + times)
+"""
+
+def run(warm, cache_dir, folder):
+    code = WORKER.format(warm=warm, cache_dir=cache_dir, folder=folder)
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)})
+    return ast.literal_eval(result.stdout.strip().splitlines()[-1])
+
+def main(runs=3):
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, 'cache')
+        for warm in [False, True]:
+            # TAKE THE FASTEST OF SEVERAL RUNS, THE FIRST WARM RUN ALSO CREATES THE PERSISTENT CACHE DIRECTORY
+            timings = min((run(warm, cache_dir, tmp) for _ in range(runs)), key=lambda t: t[1])
+            label = 'with warmup   ' if warm else 'without warmup'
+            print(f"{label}: first figure {timings[1] * 1000:7.1f} ms, second {timings[2] * 1000:7.1f} ms"
+                  + (f", warmup itself {timings[0] * 1000:.1f} ms" if warm else ''))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A benchmark script which measures the cost of `import readyplot` with python -X importtime and fails (exit code 1) if
+it is above TARGET_MS, if a heavy dependency was loaded up front or if rp.subplots stops being callable once the
+readyplot.subplots module is imported (lazily loading it must not shadow the function). Run from the repository root with:
+    PYTHONPATH=. python benchmarks/import_time.py [runs]
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+import ast
+import os
+import subprocess
+import sys
+
+# %% PINNED TARGETS: CUMULATIVE IMPORT TIME OF THE PACKAGE AND MODULES THAT MUST ONLY LOAD ON FIRST USE
+TARGET_MS = 150
+LAZY_MODULES = ['pandas', 'numpy', 'seaborn', 'scipy', 'matplotlib']
+
+def import_time_ms():
+    # THE LAST -X importtime LINE IS THE TOP-LEVEL PACKAGE, ITS SECOND COLUMN IS THE CUMULATIVE TIME IN MICROSECONDS
+    check = f"import readyplot, sys; print([m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', check], capture_output=True, text=True,
+                            env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}, check=True)
+    package_line = [line for line in result.stderr.splitlines() if line.rstrip().endswith('| readyplot')][-1]
+    return int(package_line.split('|')[1]) / 1000, ast.literal_eval(result.stdout)
+
+def subplots_callable():
+    # IMPORT THE SUBMODULE DIRECTLY, THROUGH THE LAZY rp.SubPlots AND THROUGH rp.subplots(), CHECKING THE FUNCTION EACH TIME
+    check = ("import readyplot as rp; from readyplot.subplots import SubPlots; a = callable(rp.subplots); "
+             "rp.SubPlots; b = callable(rp.subplots); rp.subplots(1, 2); print(a and b and callable(rp.subplots))")
+    result = subprocess.run([sys.executable, '-c', check], capture_output=True, text=True,
+                            env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)})
+    return result.stdout.strip().endswith('True')
+
+def main(runs=5):
+    # TAKE THE FASTEST OF SEVERAL FRESH INTERPRETERS, THE FIRST ONE ALSO WARMS THE BYTECODE CACHE
+    timings = [import_time_ms() for _ in range(runs)]
+    best, loaded = min(ms for ms, _ in timings), timings[-1][1]
+    print(f"import readyplot: {best:.1f} ms (target {TARGET_MS} ms), eagerly loaded heavy modules: {loaded or 'none'}")
+    callable_subplots = subplots_callable()
+    print(f"rp.subplots callable after importing readyplot.subplots: {callable_subplots}")
+    if best > TARGET_MS or loaded or not callable_subplots: sys.exit(1)
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A benchmark script which counts how often the tick locators run (every call makes matplotlib place ticks, and usually
+format their labels) during each stage of one render per plot type, and fails (exit code 1) if formatting the axes in
+post_format needs more than TARGET_POST_FORMAT calls. Saving draws the figure, its calls are reported but not pinned.
+The repository has no test suite, so this pin stands in for a regression test and has to be run by hand (or in CI).
+Run from the repository root with:
+    PYTHONPATH=. python benchmarks/locator_calls.py
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+import sys
+import tempfile
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.axis
+import numpy as np
+import pandas as pd
+import readyplot as rp
+
+# %% PINNED TARGET: LOCATOR CALLS DURING post_format (LEGEND, TITLES AND AXIS FORMATTING) FOR ANY PLOT TYPE
+TARGET_POST_FORMAT = 0
+CALLS = [0]
+
+def counted(method):
+    def wrapper(self, *args, **kwargs):
+        CALLS[0] += 1
+        return method(self, *args, **kwargs)
+    return wrapper
+
+matplotlib.axis.Axis.get_majorticklocs = counted(matplotlib.axis.Axis.get_majorticklocs)
+matplotlib.axis.Axis.get_minorticklocs = counted(matplotlib.axis.Axis.get_minorticklocs)
+
+# %% ONE RENDER PER PLOT TYPE, COUNTING THE LOCATOR CALLS OF EACH STAGE
+def stage_calls(plotter):
+    counts = {}
+    for stage in ['pre_format', 'just_plot', 'post_format', 'save']:
+        CALLS[0] = 0
+        getattr(plotter, stage)()
+        counts[stage] = CALLS[0]
+    return counts
+
+def main():
+    rng = np.random.default_rng(0)
+    DF = pd.DataFrame({'x': rng.choice(['A', 'B', 'C'], 200), 'y': rng.normal(5, 1, 200) * 1e4,
+                       'z': rng.choice(['C', 'D'], 200), 'v': rng.normal(0, 1, 200)})
+    worst = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind, labels in [('bar', ('x', 'y')), ('boxwhisker', ('x', 'y')), ('strip', ('x', 'y')),
+                             ('scatter', ('v', 'y')), ('line', ('v', 'y')), ('hist', ('v', None))]:
+            plotter = getattr(rp, kind)(DF.sort_values('v'), xlab=labels[0], ylab=labels[1], zlab='z',
+                                        use_pyplot=False, folder_name=f'{tmp}/{kind}.png')
+            counts = stage_calls(plotter)
+            worst = max(worst, counts['post_format'])
+            print(f"{kind:>10}: " + ', '.join(f"{stage} {count}" for stage, count in counts.items()))
+    print(f"most locator calls in post_format: {worst} (target {TARGET_POST_FORMAT})")
+    if worst > TARGET_POST_FORMAT: sys.exit(1)
+
+if __name__ == '__main__':
+    main()
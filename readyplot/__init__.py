@@ -6,201 +6,62 @@ An initialization file which also holds shared expected inputs (differentiates t
 """
 # readyplot/__init__.py
 # %% IMPORT PACKAGES
-from .bar_plotter import BarPlotter
-from .boxwhisker_plotter import BoxWhiskerPlotter
-from .hist_plotter import HistPlotter
-from .scatter_plotter import ScatterPlotter
-from .line_plotter import LinePlotter
-from .strip_plotter import StripPlotter
-from .subplots import SubPlots
-import pandas as pd
-import numpy as np
-from .utils import dict_update_nested
-from matplotlib import pyplot as plt
+# ONLY LIGHTWEIGHT MODULES LOAD WITH THE PACKAGE, PANDAS, SEABORN, PYPLOT AND SCIPY LOAD ON FIRST USE (SEE __getattr__)
+from .settings import resolve_settings
+
+# %% NAMES RESOLVED ON FIRST ACCESS, rp.BarPlotter IMPORTS bar_plotter (AND SEABORN) ONLY WHEN IT IS FIRST USED
+LAZY_NAMES = {'BarPlotter': '.bar_plotter', 'BoxWhiskerPlotter': '.boxwhisker_plotter', 'HistPlotter': '.hist_plotter',
+              'ScatterPlotter': '.scatter_plotter', 'LinePlotter': '.line_plotter', 'StripPlotter': '.strip_plotter',
+              'SubPlots': '.subplots_plotter', 'FigurePool': '.figure_pool', 'set_cache_options': '.loaders',
+              'clear_cache': '.loaders'}
+
+def __getattr__(name):
+    if name not in LAZY_NAMES: raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    from importlib import import_module
+    value = getattr(import_module(LAZY_NAMES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+# %% THE readyplot.subplots MODULE IS LOADED NOW (IT IS ONLY A LAZY SHIM), IMPORTING A SUBMODULE BINDS IT ON THE PACKAGE
+# THE FIRST TIME ONLY, SO THE subplots() FUNCTION DEFINED BELOW REPLACES IT FOR GOOD
+from . import subplots
+
+def __dir__():
+    return sorted(list(globals()) + list(LAZY_NAMES))
 
 #%%---------------------------------------------------------------------------------------------------------------------
 # MAIN INITIALIZATION
 #-----------------------------------------------------------------------------------------------------------------------
 # %% PARSE ARGS AND PREPARE DATA FRAME COLUMN NAMES TO HANDLE ANY COMBINATION OF STRING INPUTS (OR NON-INPUTS)
-def initialize_common_defaults(args,input_dict):
+def initialize_common_defaults(args,input_dict,plot_type=None):
     input_dict = parse_args(locals())
     input_dict,xlab,ylab,zlab = prepare_data_frame_col_names(locals())
-    for var in ['xlab','ylab','zlab']:
-        if locals()[var] is None: del locals()[var]
-    del args, var
-
-    # %% INITIALIZE DEFAULT VALUES
-    # GENERAL ESSENTIALS IN FRONT-END OR BACK-END
-    # Input Data
-    DF = None
-    x = None
-    y = None
-    z = None
-    excel_path = None
-    sheet_name = None
-    csv_path = None
-
-    # Groups (xlab,ylab,zlab maybe created above during prepare_data_frame_col_names)
-    colors = ['#199940', 'r', 'b', 'y', 'c', 'm', 'k', 'w']
-    markers = ['o', 's', 'D', 'p', 'h', '*', 'x', '+', '^', 'v', '>', '<']
-    hatches = ['....', '---', '//', '++', 'OO', '**']
-    style = None
-
-    # Input Handles
-    input_fig = None
-    input_ax = None
-    plot_type = None
-    first_time_legend = True
-    handles = None
-    labels = None
-
-    # Output Fig
-    folder_name = "OUTPUT_FIGURES"
-    dpi = 300
-    fig_width = 7
-    fig_height = 5
-
-    # ERRORS, GENERAL TEXT, ESTHETICS
-    # Errors
-    capsize = 0.4
-    yerror_vals = None
-    hi_yerror_vals = None
-    low_yerror_vals = None
-    xerror_vals = None
-    hi_xerror_vals = None
-    low_xerror_vals = None
-    err_names = ['xerror_vals','yerror_vals','low_xerror_vals','hi_xerror_vals','low_yerror_vals','hi_yerror_vals']
-    error_lim_affect = False
-
-    # General Text
-    custom_x_label = None
-    custom_y_label = None
-    title = None
-    def_font_sz = 16
-    fontweight = 'bold'
-
-    # General Esthetics
-    line_color = 'black'
-    back_color = 'white'
-    darkmode = False
-    apply_color_lines_only = False
-    transparent = False
-    sns_palette = "deep"
-    sns_style = "ticks"
-    sns_context = "notebook"
-    grid_color = "#444444"
-
-    # AXIS-RELATED SETTINGS
-    # Lines & Axes
-    box_edges = ['bottom', 'left']
-    def_line_w = 1.5
-    xtick_font_ratio = 1
-    ytick_font_ratio = 1
-    x_axis_sig_figs = 3
-    y_axis_sig_figs = 3
-
-    # Scientific Notation
-    x_exp_location = 0
-    y_exp_location = 0
-    low_x_cap0 = False
-    low_y_cap0 = False
-    sci_x_lims = (-1,3)
-    sci_y_lims = (-1,3)
-
-    # XLines and YLines
-    xlines = [None]
-    ylines = [None]
-    internal_xlines = []
-    internal_ylines = []
-    internal_patches = []
-    internal_lines = []
-
-    # NICHE FEATURES GENERALLY PLOT-TYPE DEPENDENT
-    # Legend Tool for Strip-Plot Overlay
-    handles_in_legend = 10
-
-    # Bar and Box Features
-    dodge = True
-    box_width = 0.8
-    plot_line_palette = None
-
-    # Trendline
-    trendline = False
-    show_r2 = False
-    annote_x_start = 0.7
-    annote_y_start = 0.7
-
-    # DICTIONARIES TO PASS AS KWARGS TO OTHER PACKAGES
-    # Grouped Kwargs
-    legend = None
-    legend_kwargs = {'prop': {'weight': 'bold'}, 'framealpha': 1}
-    trendline_kwargs = None
-    xylines_kwargs = None
-    imported_settings = {}
-
-    # %% PREPARE FOR INPUT SORTING
-    # EVERY VARIABLE INITIALIZED WITH A DEFAULT SO FAR IS EXPECTED IN SORTING, EVERY OTHER VARIABLE WILL BE A KWARG
-    expected_keys = list(locals().keys())
-    initialized_dict = {}
-    kwargs = {}
-
-    # SPECIFY LISTS OF VARIABLES TO IGNORE IN INPUT HANDLING
-    special_entries = ['special_entries','nested_kwargs','input_dict','expected_keys','initialized_dict','kwargs']
-    nested_kwargs = ['legend_kwargs','custom_error_kwargs']
-
-    # UNPACK THE INPUT KEYWORDS INTO LOCALS TO PREPARE FOR ITERATING
-    for name, value in input_dict.items():
-        if name in special_entries:
-            kwargs[name] = value
-        if name not in locals():
-            locals()[name] = value
-    del name, value
-
-    # APPLY IMPORTED SETTINGS BEFORE POPULATING THE REST OF THE INITIALIZED_DICT, SO OTHER INPUTS CAN OVERWRITE THESE
-    if 'imported_settings' in input_dict:
-        for key, value in input_dict['imported_settings'].items(): initialized_dict[key] = value
-        del key, value
-    else: input_dict['imported_settings'] = {}
-
-    # %% SORT USER INPUTS INTO REGULAR VARIABLES AND SEABORN KWARGS, HANDLE NESTED KWARG DICTIONARIES RECURSIVELY
-    for name, value in locals().items():
-        # IGNORE IMPORTED SETTINGS
-        if name == 'imported_settings' or (name in input_dict['imported_settings'] and name not in input_dict):
-            pass
-        # IF THE VARIABLE IS A NESTED KWARG USE RECURSIVE METHOD TO RESOLVE NESTED DICTIONARIES, NOT OVERWRITE ENTIRELY
-        elif name in nested_kwargs:
-            initialized_dict[name] = dict_update_nested(value,input_dict[name]) if name in input_dict else value
-
-        # SORT VARIABLE INTO REGULAR VARIABLES OR SEABORN KWARGS IF IT IS NOT A SPECIAL LOCAL VARIABLE
-        elif name not in special_entries and name != 'DFs':
-            if name in expected_keys: initialized_dict[name] = input_dict[name] if name in input_dict else value
-            else: kwargs[name] = value
-
-        # LEGACY CATCH, SOME PEOPLE MAY USE DFs INSTEAD OF DF AND THIS WILL CATCH THAT
-        elif name == 'DFs':
-            initialized_dict['DF'] = value
-
-    return initialized_dict, kwargs
+
+    # SORT THE INPUTS AGAINST THE PRECOMPUTED SETTINGS SCHEMA (SEE settings.py FOR EVERY DEFAULT)
+    return resolve_settings(input_dict, {'xlab': xlab, 'ylab': ylab, 'zlab': zlab})
 
 #%%---------------------------------------------------------------------------------------------------------------------
 # METHODS
 #-----------------------------------------------------------------------------------------------------------------------
 # %% PARSE USER ARGUMENTS
 def parse_args(l):
+    import pandas as pd
+    import numpy as np
+    from .loaders import arrow_format, is_frame_like, frame_from_interchange, needed_columns
+
     # UNPACK LOCALS INTO VARIABLES
-    args,input_dict = l['args'],l['input_dict']
+    args,input_dict,plot_type = l['args'],l['input_dict'],l['plot_type']
 
     # PARSE ARGS INTO DF IF PROVIDED, BEHAVIOR VARIES BY TEH NUMBER OF ARGS
     if len(args) == 1:
-        if isinstance(args[0], pd.DataFrame): input_dict['DF'] = args[0]
+        if isinstance(args[0], pd.DataFrame) or is_frame_like(args[0]): input_dict['DF'] = args[0]
         elif isinstance(args[0], str) and not isinstance(args[0], (list, np.ndarray)):
-            if '.csv' in args[0]: input_dict['DF'] = pd.read_csv(args[0])
-            else: input_dict['DF'] = pd.read_excel(args[0])
+            input_dict['DF'] = read_input_file(args[0], input_dict, file_format=arrow_format(args[0]))
         else: input_dict['x'] = args[0]
     elif len(args) == 2:
         if (isinstance(args[0], str) and not isinstance(args[0], (list, np.ndarray))) and (
                 isinstance(args[1], str) and not isinstance(args[1], (list, np.ndarray))):
-            input_dict['DF'] = pd.read_excel(args[0], sheet_name=args[1])
+            input_dict['DF'] = read_input_file(args[0], input_dict, sheet_name=args[1])
         else:
             input_dict['x'] = args[0]
             input_dict['y'] = args[1]
@@ -213,14 +74,41 @@ def parse_args(l):
     else:
         if ('excel_path' in input_dict and input_dict['excel_path'] is not None) and (
                 'sheet_name' in input_dict and input_dict['sheet_name'] is not None):
-            input_dict['DF'] = pd.read_excel(input_dict['excel_path'], sheet_name=input_dict['sheet_name'])
+            input_dict['DF'] = read_input_file(input_dict['excel_path'], input_dict, sheet_name=input_dict['sheet_name'])
         elif 'excel_path' in input_dict and input_dict['excel_path'] is not None:
-            input_dict['DF'] = pd.read_excel(input_dict['excel_path'])
+            input_dict['DF'] = read_input_file(input_dict['excel_path'], input_dict)
         elif 'csv_path' in input_dict and input_dict['csv_path'] is not None:
-            input_dict['DF'] = pd.read_csv(input_dict['csv_path'])
+            # WITH A CHUNKSIZE, PLOT TYPES WITH A STREAMING MODE READ THE FILE THEMSELVES UNLESS THEY NEED THE ROWS, ANY
+            # OTHER INPUT IS LOADED HERE SO THE LABELS BELOW RESOLVE AGAINST ITS COLUMNS
+            from .streaming import STREAMING_TYPES, can_stream
+            if input_dict.get('chunksize') is not None and (plot_type not in STREAMING_TYPES or not can_stream(input_dict)):
+                input_dict['chunksize'] = None
+            if input_dict.get('chunksize') is None: input_dict['DF'] = read_input_file(input_dict['csv_path'], input_dict)
+        elif 'parquet_path' in input_dict and input_dict['parquet_path'] is not None:
+            input_dict['DF'] = read_input_file(input_dict['parquet_path'], input_dict, file_format='parquet')
+        elif 'feather_path' in input_dict and input_dict['feather_path'] is not None:
+            input_dict['DF'] = read_input_file(input_dict['feather_path'], input_dict, file_format='feather')
+        elif 'arrow_path' in input_dict and input_dict['arrow_path'] is not None:
+            input_dict['DF'] = read_input_file(input_dict['arrow_path'], input_dict, file_format='ipc')
+        elif 'sql' in input_dict and input_dict['sql'] is not None:
+            # PLOT TYPES WITHOUT AGGREGATION PUSHDOWN FETCH THE ROWS HERE SO THE LABELS BELOW RESOLVE AGAINST THEIR COLUMNS
+            from .sql_source import PUSHDOWN_TYPES, sql_rows
+            if plot_type not in PUSHDOWN_TYPES: input_dict['DF'] = sql_rows(input_dict)
+
+    # CONVERT DATA FRAMES FROM OTHER LIBRARIES (POLARS, PYARROW, ...) KEEPING ONLY THE COLUMNS THE PLOT NEEDS
+    for key in ['DF', 'DFs']:
+        if is_frame_like(input_dict.get(key)):
+            input_dict[key] = frame_from_interchange(input_dict[key], needed_columns(input_dict))
 
     return input_dict
 
+# %% READ A FILE INPUT, ONLY LOADING THE COLUMNS AND GROUPS THE PLOT NEEDS WITH ANY USER DTYPES AND CSV ENGINE
+def read_input_file(path, input_dict, sheet_name=None, file_format=None):
+    from .loaders import load_table, needed_columns
+    return load_table(path, sheet_name=sheet_name, usecols=needed_columns(input_dict),
+                      dtypes=input_dict.get('dtypes'), engine=input_dict.get('csv_engine'), file_format=file_format,
+                      group_col=input_dict.get('zlab'), groups=input_dict.get('groups'))
+
 # %% PREPARE XLAB,YLAB,ZLAB HANDLING TO PROPERLY COMBINE REQUIRED INNER DEFAULTS WITH USER INPUT
 def prepare_data_frame_col_names(l):
     input_dict = l['input_dict']
@@ -272,38 +160,131 @@ def prepare_data_frame_col_names(l):
 #-----------------------------------------------------------------------------------------------------------------------
 # %% BAR PLOTS
 def bar(*args,**kwargs):
-    initialized_inputs, new_kwargs = initialize_common_defaults(args,kwargs)
+    from .bar_plotter import BarPlotter
+    initialized_inputs, new_kwargs = initialize_common_defaults(args,kwargs,'bar')
     return BarPlotter(initialized_inputs,**new_kwargs)
 
 # %% BOX-WHISKER PLOTS
 def boxwhisker(*args,**kwargs):
-    initialized_inputs, new_kwargs = initialize_common_defaults(args,kwargs)
+    from .boxwhisker_plotter import BoxWhiskerPlotter
+    initialized_inputs, new_kwargs = initialize_common_defaults(args,kwargs,'boxwhisker')
     return BoxWhiskerPlotter(initialized_inputs,**new_kwargs)
 
 # %% HISTOGRAM PLOTS
 def hist(*args,**kwargs):
-    initialized_inputs, new_kwargs = initialize_common_defaults(args,kwargs)
+    from .hist_plotter import HistPlotter
+    initialized_inputs, new_kwargs = initialize_common_defaults(args,kwargs,'hist')
     return HistPlotter(initialized_inputs,**new_kwargs)
 
 # %% LINE PLOTS
 def line(*args,**kwargs):
-    initialized_inputs, new_kwargs = initialize_common_defaults(args,kwargs)
+    from .line_plotter import LinePlotter
+    initialized_inputs, new_kwargs = initialize_common_defaults(args,kwargs,'line')
     return LinePlotter(initialized_inputs,**new_kwargs)
 
 # %% SCATTER PLOTS
 def scatter(*args,**kwargs):
-    initialized_inputs, new_kwargs = initialize_common_defaults(args,kwargs)
+    from .scatter_plotter import ScatterPlotter
+    initialized_inputs, new_kwargs = initialize_common_defaults(args,kwargs,'scatter')
     return ScatterPlotter(initialized_inputs,**new_kwargs)
 
 # %% STRIP PLOTS
 def strip(*args,**kwargs):
-    initialized_inputs, new_kwargs = initialize_common_defaults(args,kwargs)
+    from .strip_plotter import StripPlotter
+    initialized_inputs, new_kwargs = initialize_common_defaults(args,kwargs,'strip')
     return StripPlotter(initialized_inputs,**new_kwargs)
 
 # %% SUB PLOTS
 def subplots(*args,**kwargs):
+    from .subplots_plotter import SubPlots
     return SubPlots(*args,**kwargs)
 
+#%%---------------------------------------------------------------------------------------------------------------------
+# BATCH ENTRY POINTS
+#-----------------------------------------------------------------------------------------------------------------------
+# %% WHOLE WORKBOOKS: PARSE EVERY REQUESTED SHEET IN ONE PASS, THEN RENDER ONE FIGURE PER SHEET IN A WORKER POOL
+def from_workbook(path,kind='boxwhisker',sheets='all',max_workers=None,**kwargs):
+    """
+    Plots every sheet (or the listed sheets) of an excel workbook with the plotter named by kind, saving one figure per
+    sheet under folder_name. The title defaults to the sheet name, and '{sheet}' inside a given title is replaced by it.
+    A file name as folder_name gets the sheet name added to its stem when more than one sheet is plotted.
+    max_workers=1 renders in this process. Returns {sheet name: saved file path}.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from .loaders import load_workbook, needed_columns
+    if kind not in PLOTTERS: raise ValueError(f"kind must be one of {list(PLOTTERS)}, got '{kind}'")
+    sheet_names = None if sheets == 'all' else [sheets] if isinstance(sheets, (str, int)) else list(sheets)
+    DFs = load_workbook(path, sheet_names, usecols=needed_columns(kwargs), dtypes=kwargs.get('dtypes'))
+
+    jobs = [(kind, DF, sheet, sheet_kwargs(kwargs, sheet, len(DFs))) for sheet, DF in DFs.items()]
+    if max_workers == 1: saved = [render_sheet(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool: saved = list(pool.map(render_sheet, *zip(*jobs)))
+    return dict(zip(DFs.keys(), saved))
+
+def sheet_kwargs(kwargs,sheet,n_sheets):
+    # THE SHEET NAME FILLS '{sheet}' IN THE TITLE (A MISSING OR NONE TITLE IS THE SHEET NAME)
+    title = '{sheet}' if kwargs.get('title') is None else kwargs['title']
+    kwargs = {**kwargs, 'title': title.replace('{sheet}', str(sheet))}
+
+    # SEVERAL SHEETS SAVED TO ONE FILE NAME WOULD OVERWRITE EACH OTHER, SO THE SHEET NAME GOES INTO THE FILE STEM
+    folder_name = kwargs.get('folder_name')
+    if n_sheets > 1 and folder_name is not None and '.' in str(folder_name):
+        import os
+        stem, ext = os.path.splitext(str(folder_name))
+        kwargs['folder_name'] = f"{stem}_{str(sheet).replace('/', '_per_')}{ext}"
+    return kwargs
+
+def render_sheet(kind,DF,sheet,kwargs):
+    # RENDER AND SAVE ONE SHEET, THEN CLOSE THE FIGURE SO LONG BATCHES DO NOT ACCUMULATE OPEN FIGURES
+    plotter = PLOTTERS[kind](DF, **kwargs)
+    fig, ax = plotter.plot(save=True)
+    save_name = plotter.folder_name if '.' in plotter.folder_name else plotter.save_name_autopopulated()[0]
+    plotter.close()
+    return str(save_name)
+
+# %% WARM UP A (WORKER) PROCESS SO ITS FIRST FIGURE RENDERS AT STEADY-STATE SPEED
+def warmup(themes=None,font_sizes=None,cache_dir=None):
+    """
+    Loads matplotlib's font manager, seaborn and the Agg canvas, builds the theme rc dictionaries and lays out the bold
+    default text at each font size by rendering one small off-screen bar plot per theme and font size. themes is a list
+    of setting dicts (e.g. [{}, {'darkmode': True}, {'sns_context': 'paper'}]) and font_sizes a list of def_font_sz
+    values, both default to readyplot's defaults. cache_dir holds matplotlib's font list so later workers skip font
+    discovery. When MPLCONFIGDIR is unset, warmup sets it to cache_dir for the rest of this process, which changes
+    matplotlib's cache for this process (when called before matplotlib is imported) and for every child process
+    started afterwards. MPLCONFIGDIR is also where matplotlib looks for the user's matplotlibrc and stylelib, so those
+    processes no longer read ~/.config/matplotlib. When MPLCONFIGDIR is already set it is left alone and the font list
+    is only written to cache_dir, so workers export MPLCONFIGDIR=cache_dir themselves. Returns the seconds spent.
+    """
+    import os, sys, time
+    start = time.perf_counter()
+
+    # POINT MATPLOTLIB'S CACHE AT cache_dir BEFORE THE FONT MANAGER LOADS, UNLESS THE CALLER ALREADY CHOSE ONE
+    # (CHILD PROCESSES INHERIT THE ENVIRONMENT, AND MATPLOTLIB ALSO READS matplotlibrc AND stylelib FROM THIS DIRECTORY)
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        os.environ.setdefault('MPLCONFIGDIR', os.path.abspath(cache_dir))
+    import matplotlib
+    from matplotlib import font_manager
+    from .settings import CONSTANT_DEFAULTS
+
+    # MATPLOTLIB USES ANOTHER CACHE DIRECTORY (IT WAS ALREADY LOADED, OR MPLCONFIGDIR WAS SET), SO WRITE THE FONT LIST
+    # WHERE LATER PROCESSES USING cache_dir WILL LOOK FOR IT
+    if cache_dir is not None and os.path.abspath(matplotlib.get_cachedir()) != os.path.abspath(cache_dir):
+        font_list = os.path.join(cache_dir, f"fontlist-v{font_manager.FontManager.__version__}.json")
+        if not os.path.exists(font_list): font_manager.json_dump(font_manager.fontManager, font_list)
+
+    # RENDER A SMALL PLOT PER THEME AND FONT SIZE, THIS FILLS THE FONT, GLYPH AND TEXT LAYOUT CACHES FOR THOSE SETTINGS
+    x, y, z = ['A', 'A', 'B', 'B'], [1.0, 2.0, 3.0, 4.0], ['C', 'D', 'C', 'D']
+    for theme in themes or [{}]:
+        for size in font_sizes or [CONSTANT_DEFAULTS['def_font_sz']]:
+            plotter = bar(x, y, z, **{**theme, 'def_font_sz': size, 'use_pyplot': False, 'title': 'warmup'})
+            fig, ax = plotter.plot(save=False)
+            fig.canvas.draw()
+    return time.perf_counter() - start
+
+PLOTTERS = {'bar': bar, 'boxwhisker': boxwhisker, 'hist': hist, 'line': line, 'scatter': scatter, 'strip': strip}
+
 # %% EXPLICITLY STATE HOW TO IMPORT THE ENTIRE MODULE (eg: import *)
 __all__ = ['boxwhisker',
            'scatter',
@@ -317,4 +298,9 @@ __all__ = ['boxwhisker',
            'BarPlotter',
            'HistPlotter',
            'StripPlotter',
-           'SubPlots']
+           'SubPlots',
+           'FigurePool',
+           'from_workbook',
+           'warmup',
+           'set_cache_options',
+           'clear_cache']
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+An artist spec file, artist_specs, which records readyplot's annotations (xlines, ylines, lines, rectangles, circles
+and polygons) as small picklable specs when they are created, so a copy of a plot replays them onto
+its own axes instead of cloning artists through .properties() (which computes bboxes and window extents)
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+import itertools
+from dataclasses import dataclass, field
+import matplotlib.lines as mlines
+import matplotlib.patches as patches
+
+# %% PATCH CLASSES A SPEC CAN REBUILD, AND THE RESOLVED STYLE READ BACK FROM A DRAWN ARTIST THROUGH ITS PLAIN GETTERS
+PATCH_TYPES = {'rectangle': patches.Rectangle, 'circle': patches.Circle, 'polygon': patches.Polygon}
+PATCH_STYLE = ['facecolor', 'edgecolor', 'linewidth', 'linestyle', 'hatch', 'fill', 'capstyle', 'joinstyle',
+               'antialiased', 'visible', 'clip_on', 'in_layout', 'zorder']
+LINE_STYLE = ['color', 'linewidth', 'linestyle', 'marker', 'markersize', 'markerfacecolor', 'markeredgecolor',
+              'markeredgewidth', 'alpha', 'drawstyle', 'visible', 'clip_on', 'in_layout', 'zorder']
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# ARTIST SPEC
+#-----------------------------------------------------------------------------------------------------------------------
+@dataclass
+class ArtistSpec:
+    """
+    kind is one of xline, yline, line, rectangle, circle or polygon, args and kwargs are what it is drawn with.
+    """
+    kind: str
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+
+    # %% DRAW ONTO ax (OPTIONALLY AT ANOTHER ZORDER) AND RETURN THE NEW ARTIST
+    def draw(self, ax, zorder=None):
+        kwargs = dict(self.kwargs) if zorder is None else {**self.kwargs, 'zorder': zorder}
+        if self.kind == 'xline': return ax.axvline(*self.args, **kwargs)
+        if self.kind == 'yline': return ax.axhline(*self.args, **kwargs)
+        if self.kind == 'line': return ax.add_line(mlines.Line2D(*self.args, **kwargs))
+        return ax.add_patch(PATCH_TYPES[self.kind](*self.args, **kwargs))
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# METHODS
+#-----------------------------------------------------------------------------------------------------------------------
+# %% STYLE OF A DRAWN ARTIST, SO DEFAULTS (E.G. THE C0 COLOR) STAY AS THEY RESOLVED WHEN IT WAS CREATED
+def artist_style(artist):
+    keys = LINE_STYLE if isinstance(artist, mlines.Line2D) else PATCH_STYLE
+    style = {key: getattr(artist, 'get_' + key)() for key in keys}
+    if not artist.get_label().startswith('_'): style['label'] = artist.get_label()
+    return style
+
+def resolved(spec, artist):
+    # THE SPEC WITH THE ARTIST'S RESOLVED STYLE UNDERNEATH THE KWARGS IT WAS GIVEN
+    return ArtistSpec(spec.kind, spec.args, {**artist_style(artist), **spec.kwargs})
+
+# %% SPEC OF A PATCH BUILT OUTSIDE READYPLOT, None IF ITS TYPE CANNOT BE REBUILT
+def patch_spec(patch):
+    kwargs = artist_style(patch)
+    if isinstance(patch, patches.Rectangle):
+        return ArtistSpec('rectangle', (patch.get_xy(), patch.get_width(), patch.get_height()),
+                          {**kwargs, 'angle': patch.get_angle()})
+    if isinstance(patch, patches.Circle): return ArtistSpec('circle', (patch.get_center(), patch.get_radius()), kwargs)
+    if isinstance(patch, patches.Polygon):
+        xy = patch.get_xy()
+        return ArtistSpec('polygon', (xy[:-1] if patch.get_closed() else xy,), {**kwargs, 'closed': patch.get_closed()})
+    print ('PATCH TYPE NOT CURRENTLY SUPPORTED, SUBMIT REQUEST ON GITHUB TO ADD')
+    return None
+
+# %% THE i-TH DASH PATTERN SEABORN GIVES A STYLE LEVEL (SOLID FIRST, THEN LONG AND SHORT DASHES), FOR LEGEND PROXIES
+def style_dashes(i):
+    dashes = ['', (4, 1.5), (1, 1), (3, 1.25, 1.5, 1.25), (5, 1, 1, 1)]
+    p = 3
+    while len(dashes) <= i:
+        # COMBINATIONS OF p LONG AND SHORT DASHES, INTERLEAVING TWO STREAMS (ONE REVERSED), EACH GAP THE SHORTEST DASH
+        a = list(itertools.combinations_with_replacement([3, 1.25], p))[1:-1][::-1]
+        b = list(itertools.combinations_with_replacement([4, 1], p))[1:-1]
+        for segments in itertools.chain(*zip(a, b)):
+            dashes.append(tuple(itertools.chain(*((segment, min(segments)) for segment in segments))))
+        p += 1
+    return dashes[i]
@@ -5,11 +5,13 @@ A child class for the base plotter which produces bar charts with potential scat
 @author: Shawn Pavey
 """
 # %% IMPORT PACKAGES
-import matplotlib.pyplot as plt
 import seaborn as sns
-import numpy as np
 from .base_plotter import BasePlotter
-from .utils import match_rgba_to_color, check_labels_in_DF
+from .themes import themed
+from .streaming import stream_frame
+from .sql_source import sql_frame
+from .utils import match_rgba_to_color, check_labels_in_DF, replace_column
+from matplotlib.patches import Patch
 from matplotlib.colors import to_rgb
 import warnings
 
@@ -19,28 +21,35 @@ import warnings
 # %% INITIALIZE CHILD CLASS
 class BarPlotter(BasePlotter):
     def __init__(self, input_dict,**kwargs):
+        # FOLD A CHUNKSIZE CSV INPUT INTO PER-GROUP STATISTICS INSTEAD OF LOADING EVERY ROW
+        if input_dict['chunksize'] is not None and input_dict['DF'] is None and input_dict['csv_path'] is not None:
+            input_dict['DF'], kwargs = stream_frame('bar', input_dict, kwargs)
+        # PUSH THE AGGREGATION INTO THE DATABASE FOR SQL INPUTS
+        elif input_dict['sql'] is not None and input_dict['DF'] is None:
+            input_dict['DF'], kwargs = sql_frame('bar', input_dict, kwargs)
         super().__init__(input_dict,**kwargs)
         self.plot_type = 'bar'
 
     # %% DEFINE PLOTTER, PREPARE INPUTS
+    @themed
     def just_plot(self,**kwargs):
         self.ensure_fig_ax_exist()
-        self.DF[self.xlab] = self.DF[self.xlab].astype(str)
+        self.encode_x()
         conflict_vars,defaults_list,inputs,input_keys,outputs = self.generate_resolver_lists(locals(),kwargs)
         DF,kwargs, markers,palette,dodge,ax,capsize,linewidth,width = outputs
         palette, linewidth, width = super().var_existence_check(inputs,input_keys,defaults_list, kwargs=kwargs)
         xlab,ylab,zlab,dodge = self.label_prep(locals())
-        self.width = width
+        self.width, self.legend_palette = width, palette
 
         # %% PLOT WITH SEABORN
         sns.barplot(
             x=xlab,y=ylab,data=DF,hue=zlab,
             palette=palette,linewidth=linewidth,capsize=capsize,width=width,dodge=dodge,
-            ax=ax, err_kws={'color': self.line_color,'linewidth': self.def_line_w},**kwargs)
+            ax=ax, err_kws={'color': self.line_color,'linewidth': self.def_line_w},legend=False,**kwargs)
 
         # %% EXTRA PLOT EDITING
         if any(getattr(self, attr) is not None for attr in self.err_names): self.plot_errors(xlab, ylab, zlab)
-        self.local_scatter(locals())
+        if (self.chunksize is None or self.csv_path is None) and self.sql is None: self.local_scatter(locals())
         self.hatches_and_colors(locals())
         if self.custom_x_label is None: self.ax.set_xlabel("")
         else: self.ax.set_xlabel(self.custom_x_label)
@@ -51,7 +60,7 @@ class BarPlotter(BasePlotter):
 #-----------------------------------------------------------------------------------------------------------------------
 # %% LOAD ALL PARENT METHODS UNLESS THEY EXIST HERE
     def __getattr__(self, name):
-        super().__getattr__(name)
+        return super().__getattr__(name)
 
 # %% CUSTOM METHODS
     def generate_resolver_lists(self,loc_vars,kwargs):
@@ -69,17 +78,15 @@ class BarPlotter(BasePlotter):
         dodge,DF = l['dodge'],l['DF']
         xlab,ylab,zlab = check_labels_in_DF(self.DF,self.xlab,self.ylab,self.zlab)
         (zlab,dodge) = (xlab,False) if zlab is None else (zlab,dodge)
-        plt.ylim(DF[ylab].min(), DF[ylab].max())
+        self.ax.set_ylim(DF[ylab].min(), DF[ylab].max())
         return xlab,ylab,zlab,dodge
 
     def local_scatter(self,l):
         palette,xlab,ylab,zlab,dodge,ax = l['palette'],l['xlab'],l['ylab'],l['zlab'],l['dodge'],l['ax']
         dark_palette = []
 
-        try:
-            unique = self.DF[self.zlab].unique()
-        except KeyError:
-            unique = ['placeholder']
+        groups = self.group_index()
+        unique = groups.unique if groups.grouped else ['placeholder']
 
         if self.apply_color_lines_only:
             dark_palette = palette
@@ -90,9 +97,8 @@ class BarPlotter(BasePlotter):
                 dark_palette.append(self.line_color)
 
         for i, category in enumerate(unique):
-            df_copy = self.DF.copy()
-            if unique[0] != 'placeholder':
-                df_copy.loc[df_copy[self.zlab] != category, self.ylab] = np.nan
+            df_copy = self.DF
+            if unique[0] != 'placeholder': df_copy = replace_column(self.DF, self.ylab, self.only_group(self.DF, self.ylab, i))
 
             try:
                 sns.stripplot(
@@ -105,7 +111,7 @@ class BarPlotter(BasePlotter):
     def hatches_and_colors(self,l):
         ax = l['ax']
         while len(self.unique) > len(self.hatches):
-            self.hatches.extend(self.hatches)
+            self.hatches = self.hatches + self.hatches
         counter = 0
 
         for bar in self.ax.patches :
@@ -142,5 +148,13 @@ class BarPlotter(BasePlotter):
 
                 counter +=1
 
-
-
+    def legend_handle(self,i,color):
+        # A PATCH STYLED LIKE THIS GROUP'S BARS IN hatches_and_colors (SEABORN DESATURATES BAR FILLS TO 0.75)
+        index = self.colors.index(color) if color in self.colors else i
+        if self.apply_color_lines_only:
+            face_color = to_rgb(self.back_color) + tuple([0]) if self.transparent else self.back_color
+            return Patch(facecolor=face_color, edgecolor=color, linewidth=self.def_line_w,
+                         hatch=self.hatches[index % len(self.hatches)])
+        edge_color = self.plot_line_palette[index] if self.plot_line_palette else self.line_color
+        return Patch(facecolor=sns.desaturate(color, .75), edgecolor=edge_color, linewidth=self.def_line_w,
+                     hatch=self.hatches[index % len(self.hatches)])
@@ -8,38 +8,70 @@ A parent class, base plotter, which initializes plotters and holds common 'self'
 import numpy as np
 import pandas as pd
 import os
+import time
 import seaborn as sns
 import matplotlib
 from matplotlib import pyplot as plt
 import matplotlib.ticker as ticker
 from pathlib import Path
-from .utils import (numeric_checker, min_maxer, is_mostly_strings, ensure_data_frame, check_labels_in_DF,
-                    dict_update_nested, is_transparent, delete_ticks_by_sig_figs, mini_kwarg_resolver)
-import matplotlib.patches as patches
+from .utils import (axis_is_numeric, min_maxer, is_mostly_strings, ensure_data_frame, check_labels_in_DF,
+                    dict_update_nested, is_transparent, delete_ticks_by_sig_figs, mini_kwarg_resolver, agg_figure,
+                    encode_categories, hue_colors, fingerprint, retained_bytes)
+from .loaders import load_table, needed_columns, read_csv_tail, select_from_frame
+from .sql_source import sql_rows
+from .settings import LayeredSettings, KNOWN_KEYS, STAGE_SETTINGS, RENDER_STATE, DATA_INPUTS
+from .themes import themed, theme_colors, theme_rc, settle_figure
+from .group_index import GroupIndex
+from .artist_specs import ArtistSpec, patch_spec, resolved
+from functools import lru_cache
 from matplotlib.patches import Patch
-import matplotlib.lines as mlines
+from matplotlib.collections import LineCollection
 import warnings
-from matplotlib.colors import to_rgb
+
+# %% SETTING NAMES THAT ARE ALSO CLASS ATTRIBUTES, COMPUTED ONCE PER PLOTTER CLASS
+@lru_cache(maxsize=None)
+def shadowed_settings(cls):
+    return tuple(name for name in KNOWN_KEYS if hasattr(cls, name))
+
+# %% SETTINGS THE DATA STAGE DEPENDS ON (ALL BUT THE RENDER STATE AND THE COSMETIC STAGES), COMPUTED ONCE PER CLASS
+@lru_cache(maxsize=None)
+def data_settings(cls):
+    cosmetic = {name for names in cls.stage_settings.values() for name in names}
+    return tuple(sorted(KNOWN_KEYS - RENDER_STATE - cosmetic))
 
 #%%---------------------------------------------------------------------------------------------------------------------
 # PARENT CLASS MAIN
 #-----------------------------------------------------------------------------------------------------------------------
 # %% INITIALIZE PARENT CLASS
 class BasePlotter:
+    stage_settings = STAGE_SETTINGS
+
     def __init__(self,input_dict, **kwargs):
         # IGNORE WARNINGS ABOUT MARKER LISTS BEING TOO LONG, THE LOOPING BEHAVIOR IS SOMETIMES INTERNALLY EXPECTED
         warnings.filterwarnings("ignore", message="The markers list has more values")
         warnings.simplefilter("ignore", category=UserWarning)
 
-        # ITERATE THROUGH THE SORTED INPUT DICT AND INITIALIZE WITH: self.name = value
-        for name, value in input_dict.items(): setattr(self, name, value)
-        self.input_dict = input_dict
+        # KEEP THE LAYERED SETTINGS, self.name READS FALL BACK TO THEM UNTIL AN ATTRIBUTE IS SET ON THE INSTANCE
+        if not isinstance(input_dict, LayeredSettings): input_dict = LayeredSettings(input_dict)
+        self.settings = self.input_dict = input_dict
+
+        # SETTINGS NAMED LIKE A METHOD (title) LIVE ON THE INSTANCE SO THEY KEEP SHADOWING IT, AS THEY ALWAYS HAVE
+        for name in shadowed_settings(type(self)): self.__dict__[name] = input_dict[name]
+
+        # PLOTTERS BUILT STRAIGHT FROM AN INPUT DICT LOAD A CHUNKSIZE CSV INPUT IN FULL (rp.scatter() ETC. LOAD IN parse_args)
+        if self.DF is None and self.csv_path is not None and self.chunksize is not None:
+            self.DF = input_dict['DF'] = load_table(self.csv_path, usecols=needed_columns(input_dict), dtypes=self.dtypes,
+                                                    engine=self.csv_engine, group_col=self.zlab, groups=self.groups)
+        # LIKEWISE FOR THE PROJECTED ROWS OF A SQL INPUT (rp.scatter() ETC. FETCH THEM IN parse_args)
+        elif self.DF is None and self.sql is not None: self.DF = input_dict['DF'] = sql_rows(input_dict)
 
         # IF ANY X,Y,Z INPUTS ARE LISTS OR ARRAYS, FORCE THEM INTO DATA FRAME FORM
         if any(isinstance(i,(list,np.ndarray)) for i in (self.x,self.y,self.z)): self.DF = self.force_data_frame()
 
         # INITIALIZE REQUIRED BACKGROUND VARIABLES
         self.DF_counter,self.kwargs,self.max_list_x,self.max_list_y = 0,kwargs,[],[]
+        # ANNOTATION ARTISTS ON THIS AX, THE SPECS THEY WERE DRAWN FROM ARE SETTINGS (spec_xlines, ...) AND GET COPIED
+        self.internal_xlines,self.internal_ylines,self.internal_patches,self.internal_lines = [],[],[],[]
 
         # POPULATE SOME BACKGROUND VARIABLES
         self.__dict__.update(**kwargs)
@@ -56,30 +88,109 @@ class BasePlotter:
         # RESOLVE THE INPUT ERROR BARS AS MULTIPLE OPTIONS ARE AVAILABLE TO THE USER
         self.resolve_err_list()
 
-        # DETECT UNIQUE GROUPS IN ZLAB AS THIS WILL BE USED FOR COLOR AND MARKER SELECTION
-        try: self.unique = list(self.DF[self.zlab].unique())
-        except KeyError: self.unique = [self.zlab]
+        # DETECT UNIQUE GROUPS IN ZLAB AND PAIR THEM WITH MARKERS
+        self.resolve_groups()
 
-        # CREATE DICTIONARY OF MARKERS AND GROUPS FOR EASIER MARKER HANDLING LATER
-        try:
-            while len(self.unique) > len(self.markers): self.markers.extend(self.markers)
-            self.marker_dict = dict(zip(self.unique,self.markers))
-        except TypeError: self.marker_dict = {}
 
-        # RESOLVE INPUTS FOR SUBPLOTS SUCH AS EXISTING LEGENDS
-        try: self.add_to_legend([],[])
-        except: pass
-
-    # %% PLOT
+    # %% PLOT, THE ARTISTS ARE BUILT INSIDE THE THEME (AND THEME_LOCK), SAVING DRAWS THEM OUTSIDE IT
     def plot(self,save=True,**kwargs):
+        fig, ax = self.build(**kwargs)
+        if save: self.save()
+        return fig,ax
+
+    # %% A PLOT ALREADY DRAWN ONLY RE-RUNS THE STAGES WHOSE SETTINGS CHANGED (replot() AFTER EDITING DF IN PLACE)
+    @themed
+    def build(self,**kwargs):
+        dirty = self.dirty_stages(kwargs)
+        if 'just_plot' in dirty and self.__dict__.get('data_released'):
+            raise ValueError("This plot was rendered with low_memory=True and released its data, only titles, legend, "
+                             "lines and figure size can change. Create a new plotter to draw the data again")
+        if 'just_plot' in dirty: self.render(**kwargs)
+        else: self.restyle(dirty)
+        if 'just_plot' in dirty and self.low_memory: self.release_data()
+        self.stage_keys = {stage: self.stage_key(stage) for stage in self.stage_settings}
+        self.stage_keys['just_plot'] = self.stage_key('just_plot', kwargs)
+        settle_figure(self.fig)
+        return self.fig, self.ax
+
+    # %% FIX THE THEMED FONTS AND TICKS OF THE FIGURE SO IT CAN BE DRAWN OUTSIDE THE THEME (SEE themes.settle_figure)
+    @themed
+    def settle_theme(self):
+        settle_figure(self.fig)
+
+    # %% DRAW EVERYTHING, CLEARING A PREVIOUS RENDER FIRST
+    def render(self,**kwargs):
+        if self.__dict__.get('stage_keys'):
+            self.clear_axes()
+            # xlines/ylines CHANGED SINCE THE LAST RENDER ARE DRAWN FROM THE SETTINGS INSTEAD OF THEIR OLD SPECS
+            for name in ['xlines','ylines']:
+                if self.stage_keys[name] != self.stage_key(name): setattr(self, 'spec_' + name, [])
         self.pre_format()
         self.just_plot(**kwargs)
+        self.plot_limits = (self.ax.get_xlim(), self.ax.get_ylim())
         self.post_format()
-        if save:
-            self.save()
-        return self.fig,self.ax
+
+    # %% RE-RUN ONLY THE COSMETIC STAGES IN dirty ON THE AXES ALREADY DRAWN
+    def restyle(self,dirty):
+        if 'figure' in dirty:
+            self.fig.set_dpi(self.dpi)
+            self.size_figure()
+        if 'xlines' in dirty: self.set_xlines(self.xlines)
+        if 'ylines' in dirty: self.set_ylines(self.ylines)
+        if 'post_format' in dirty:
+            # START FROM THE LIMITS AND EMPTY TITLES just_plot LEFT, post_format ADDS MARGINS AND TITLES ON TOP OF THEM
+            self.ax.set_xlim(self.plot_limits[0])
+            self.ax.set_ylim(self.plot_limits[1])
+            for set_text in [self.ax.set_title, self.ax.set_xlabel, self.ax.set_ylabel]: set_text('')
+            self.post_format()
+
+    # %% STAGE KEYS FINGERPRINT THE SETTINGS A STAGE DEPENDS ON, AS THEY WERE WHEN IT LAST RAN
+    def stage_key(self,stage,kwargs=None):
+        names = data_settings(type(self)) if stage == 'just_plot' else self.stage_settings[stage]
+        return fingerprint([getattr(self, name, None) for name in names] + [kwargs])
+
+    def dirty_stages(self,kwargs):
+        # EVERYTHING IS REDRAWN UNTIL A RENDER EXISTS ON AXES THAT ARE STILL IN THE FIGURE
+        keys = self.__dict__.get('stage_keys')
+        if not keys or self.ax not in self.fig.axes: return {'just_plot'}
+        dirty = {stage for stage in self.stage_settings if keys[stage] != self.stage_key(stage)}
+        if keys['just_plot'] != self.stage_key('just_plot', kwargs): dirty.add('just_plot')
+        return dirty
+
+    # %% LOW MEMORY, A RENDERED PLOTTER KEEPS ONLY WHAT RESTYLING AND get_copy_settings NEED
+    def release_data(self):
+        # DF BECOMES AN EMPTY FRAME WITH THE SAME COLUMNS, DTYPES AND NAME, THE OTHER DATA INPUTS BECOME None
+        empty = self.DF.iloc[0:0].copy()
+        if hasattr(self.DF, 'name'): empty.name = self.DF.name
+        released = {name: None for name in DATA_INPUTS if not isinstance(self.settings.get(name), str)}
+        released['DF'] = empty
+
+        # ONE FLAT SETTINGS LAYER, SO LAYERS SHARED WITH OTHER PLOTTERS (WHICH MAY HOLD THE DATA) ARE NOT KEPT ALIVE
+        self.settings = self.input_dict = LayeredSettings({**self.settings, **released}, hidden=self.settings.hidden)
+        for name, value in released.items():
+            if name in self.__dict__: self.__dict__[name] = value
+        self.low_x_errs = self.hi_x_errs = self.low_y_errs = self.hi_y_errs = None
+        self.kwargs, self.group_cache, self.data_released = {}, None, True
+
+    def memory_footprint(self):
+        # BYTES RETAINED PER ATTRIBUTE (SETTINGS NOT SET ON THE INSTANCE INCLUDED), LARGEST FIRST, EACH OBJECT COUNTED ONCE
+        # THE SETTINGS GO FIRST, SO DATA SHARED WITH CACHES (group_cache HOLDS DF) IS COUNTED UNDER ITS OWN NAME
+        seen, footprint = set(), {}
+        settings = self.__dict__.get('settings')
+        for layer in (settings.maps if settings is not None else []):
+            for name, value in layer.items():
+                key = 'settings.' + name if name in vars(self) else name
+                footprint[key] = footprint.get(key, 0) + retained_bytes(value, seen)
+        for name, value in vars(self).items():
+            if name not in ['settings', 'input_dict']: footprint[name] = retained_bytes(value, seen)
+        return dict(sorted(footprint.items(), key=lambda item: -item[1]))
+
+    def mark_stage_clean(self,stage):
+        # FOR METHODS THAT ALREADY APPLIED THEIR CHANGE TO THE DRAWN AXES THEMSELVES
+        if self.__dict__.get('stage_keys'): self.stage_keys[stage] = self.stage_key(stage)
 
     # %% PRE FORMAT THE PLOT
+    @themed
     def pre_format(self):
         self.format_colors()
         self.manage_figure()
@@ -88,13 +199,14 @@ class BasePlotter:
         return self.fig,self.ax
 
     # %% POST FORMAT THE PLOT
+    @themed
     def post_format(self):
         self.manage_legend()
         self.set_titles()
         self.manage_axes()
         return self.fig, self.ax
 
-    # %% SAVE THE PLOT
+    # %% SAVE THE PLOT, ONLY SETTLING THE FIGURE TAKES THE THEME, DRAWING AND WRITING THE FILE DO NOT
     def save(self,**kwargs):
         # IF THE FOLDER NAME DOES NOT HAVE A '.' USE SAVE NAME AUTOPOPULATED FUNCTION WHICH BUILDS A NAME
         if '.' not in self.folder_name: save_name,dir_name = self.save_name_autopopulated()
@@ -110,15 +222,108 @@ class BasePlotter:
         except FileExistsError: pass#print(f"Directory '{dir_name}' already exists, overwriting and/or adding data.")
         #print(f"Directory '{dir_name}' created successfully.")
 
-        # SAVE FIGURE
+        # SAVE FIGURE, THEN CLOSE IT IF auto_close IS SET
+        self.settle_theme()
         self.fig.savefig(save_name, bbox_inches='tight',transparent=self.transparent, **kwargs)
-        return self.fig, self.ax
+        fig, ax = self.fig, self.ax
+        if self.auto_close: self.close()
+        return fig, ax
+
+    # %% CLOSE THE FIGURE THIS PLOTTER CREATED (A POOLED ONE GOES BACK TO ITS POOL), THE NEXT plot() STARTS A NEW ONE
+    def close(self):
+        fig, pool = self.__dict__.get('own_figure', (None, None))
+        if fig is not None and fig is self.__dict__.get('fig'):
+            if pool is not None: pool.release(fig)
+            else: plt.close(fig)
+        # FORGET THE AXES (A FIGURE OR AX THAT WAS PASSED IN IS LEFT OPEN) AND EVERYTHING DRAWN ON THEM
+        for name in ['fig','ax','own_figure','stage_keys','plot_limits','axis_formatters']: self.__dict__.pop(name, None)
+        self.internal_xlines,self.internal_ylines,self.internal_patches,self.internal_lines = [],[],[],[]
+        self.legend, self.first_time_legend = None, True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc_info):
+        self.close()
 
     # %% SHOW WITH PLT.SHOW WHICH WIPES OUT THE FIGURE
+    @themed
     def show(self,**kwargs):
         plt.show(self.fig,**kwargs)
         return self.fig, self.ax
 
+    # %% WATCH AN APPEND-ONLY CSV INPUT, READ ONLY THE NEW LINES AND RE-RENDER WHEN ROWS WERE ADDED
+    def watch(self,interval=1.0,debounce=0.5,max_updates=None,timeout=None,save=True):
+        """
+        Polls csv_path every interval seconds. Once the file has stopped growing for debounce seconds, only the bytes
+        appended since the last read are parsed and added to DF, then the figure is redrawn (and saved if save=True).
+        A file that shrank was rewritten, so it is reloaded in full. Stops after max_updates redraws, after timeout
+        seconds or on KeyboardInterrupt.
+        """
+        if self.csv_path is None: raise ValueError("watch() needs a plotter created with csv_path")
+        offset = self.DF.attrs.get('source_bytes', os.path.getsize(self.csv_path))
+        if not hasattr(self, 'fig'): self.plot(save=save)
+        updates, start = 0, time.monotonic()
+        try:
+            while (max_updates is None or updates < max_updates) and (timeout is None or time.monotonic()-start < timeout):
+                time.sleep(interval)
+                size = os.path.getsize(self.csv_path)
+                if size == offset: continue
+
+                # DEBOUNCE, WAIT FOR THE WRITER TO PAUSE SO A BURST OF APPENDS BECOMES ONE REDRAW
+                settled = None
+                while size != settled:
+                    time.sleep(debounce)
+                    settled, size = size, os.path.getsize(self.csv_path)
+
+                # TAIL-READ APPENDED LINES, OR RELOAD A REWRITTEN FILE
+                usecols, rewritten = list(self.DF.columns), size < offset
+                if rewritten:
+                    new_rows = load_table(self.csv_path, usecols=usecols, dtypes=self.dtypes)
+                    offset = new_rows.attrs['source_bytes']
+                else: new_rows, offset = read_csv_tail(self.csv_path, offset, usecols=usecols, dtypes=self.dtypes)
+                added = 0 if new_rows is None else self.append_rows(new_rows, replace=rewritten)
+                self.DF.attrs['source_bytes'] = offset
+                if added or rewritten:
+                    self.replot(save=save)
+                    updates += 1
+        except KeyboardInterrupt: pass
+        return self.fig, self.ax
+
+    # %% ADD (OR WITH replace=True SWAP IN) ROWS, RESOLVING ERROR BARS FOR THE NEW ROWS ONLY, RETURNS ROWS ADDED
+    def append_rows(self,new_rows,replace=False):
+        if self.groups is not None: new_rows = select_from_frame(new_rows, group_col=self.zlab, groups=self.groups)
+        if not len(new_rows) and not replace: return 0
+
+        # ERROR COLUMNS ARE READ FROM THE NEW ROWS, ERRORS PASSED AS VALUES DO NOT COVER THEM SO THEIRS ARE NAN
+        old_DF = self.DF.iloc[0:0] if replace else self.DF
+        new_rows = new_rows.reset_index(drop=True)
+        if self.low_x_errs is not None:
+            new_errs = self.error_arrays(new_rows, columns_only=True)
+            if not replace:
+                old_errs = (self.low_x_errs, self.hi_x_errs, self.low_y_errs, self.hi_y_errs)
+                new_errs = tuple(np.concatenate([old, new]) for old, new in zip(old_errs, new_errs))
+            self.low_x_errs, self.hi_x_errs, self.low_y_errs, self.hi_y_errs = new_errs
+
+        # KEEP THE FRAME NAME USED FOR AUTOMATIC SAVE NAMES AND REFRESH THE VALUES THAT DEPEND ON THE DATA
+        self.DF = pd.concat([old_DF, new_rows], ignore_index=True)
+        if hasattr(old_DF, 'name'): self.DF.name = old_DF.name
+        try: self.max_list_x[self.DF_counter] = self.DF[self.xlab].max()
+        except: pass
+        try: self.max_list_y[self.DF_counter] = self.DF[self.ylab].max()
+        except: pass
+        self.resolve_groups()
+        return len(new_rows)
+
+    # %% CLEAR THE FIGURE (OR ONLY THIS AX IF IT WAS PASSED IN) AND DRAW EVERYTHING AGAIN ON IT
+    def replot(self,save=True,**kwargs):
+        self.clear_axes()
+        self.stage_keys = {}
+        self.plot(save=save,**kwargs)
+        self.fig.canvas.draw_idle()
+        if self.use_pyplot and plt.isinteractive(): plt.pause(0.001)
+        return self.fig, self.ax
+
 #%%---------------------------------------------------------------------------------------------------------------------
 # ORGANIZED METHODS
 #-----------------------------------------------------------------------------------------------------------------------
@@ -129,7 +334,7 @@ class BasePlotter:
             # USE INPUT_FIGURE IF PROVIDED
             if self.input_fig is not None: self.fig = self.input_fig
             if hasattr(self,'fig'): self.fig.set_dpi(self.dpi)
-            elif self.input_ax is None: self.fig = plt.figure(dpi=self.dpi)
+            elif self.input_ax is None: self.fig = self.new_figure()
 
             # USE INPUT_AX IF PROVIDED, RESOLVE NEW FIGURE LOCATION
             if self.input_ax is not None:
@@ -139,20 +344,24 @@ class BasePlotter:
             else: self.ax = self.fig.add_subplot(*subplot_loc)
         else:
             # CREATE NEW FIG AND AX
-            self.fig = plt.figure(dpi=self.dpi)
+            self.fig = self.new_figure()
             self.ax = self.fig.add_subplot(111)
 
-        # INITIALIZE LEGEND
-        if self.legend is None: self.legend = self.ax.legend()
-        else:
-            if self.first_time_legend: self.plot_copied_legend()
-        self.first_time_legend = False
-
         # SET FIGURE DIMENSIONS
+        self.size_figure()
+
+        return self.fig, self.ax
+
+    def size_figure(self):
         self.fig.set_figwidth(self.fig_width)
         self.fig.set_figheight(self.fig_height)
 
-        return self.fig, self.ax
+    @themed
+    def clear_axes(self):
+        # CLEAR THE FIGURE, OR ONLY THIS AX IF IT WAS PASSED IN (A CLEARED AX IS REBUILT FROM THE THEME)
+        if self.input_ax is not None: self.ax.cla()
+        else: self.fig.clf()
+        self.legend, self.first_time_legend = None, True
 
     # %% TITLES AND AXIS LABELS
     def set_title(self,*args,fontweight=False, fontsize=False, color=False, **kwargs):
@@ -224,140 +433,87 @@ class BasePlotter:
 
     # %% PLOTING XLINE AND YLINE ANNOTATIONS
     def plot_xline_yline(self,xlines=[None],ylines=[None],zorder=2,**kwargs):
-        if (xlines[0] is None and len(self.internal_xlines) == 0) and (ylines[0] is None and len(self.internal_ylines) == 0):
-            xlines = self.xlines
-            ylines = self.ylines
-            zorder = 1
-        elif (xlines[0] is None and ylines[0] is None) and (len(self.internal_xlines) > 0 or len(self.internal_ylines) > 0):
-            self.plot_copied_xlines_ylines()
-        else:
-            xlines = xlines
-            ylines = ylines
-            zorder = 3
-
+        # THE FIRST CALL DRAWS THE xlines/ylines SETTINGS, LATER CALLS (E.G. ON A COPY) REPLAY THE SPECS RECORDED FOR THEM
+        if xlines[0] is None and ylines[0] is None:
+            if len(self.spec_xlines) > 0 or len(self.spec_ylines) > 0: return self.plot_copied_xlines_ylines()
+            self.draw_xlines_ylines(self.xlines,self.ylines,1,**kwargs)
+        else: self.draw_xlines_ylines(xlines,ylines,3,**kwargs)
+
+    def draw_xlines_ylines(self,xlines,ylines,zorder,**kwargs):
+        style = {'color': self.line_color, 'linewidth': self.def_line_w, 'linestyle': '--', 'zorder': zorder, **kwargs}
         if xlines[0] is not None:
-            for line in xlines:
-                temp_line = self.ax.axvline(x=line,color=self.line_color,linewidth=self.def_line_w,linestyle='--',zorder=zorder,**kwargs)
-                self.internal_xlines.append(temp_line)
+            for line in xlines: self.draw_spec(ArtistSpec('xline', (line,), style), 'xlines')
         if ylines[0] is not None:
-            for line in ylines:
-                temp_line = self.ax.axhline(y=line,color=self.line_color,linewidth=self.def_line_w,linestyle='--',zorder=zorder,**kwargs)
-                self.internal_ylines.append(temp_line)
+            for line in ylines: self.draw_spec(ArtistSpec('yline', (line,), style), 'ylines')
+
+    # %% ANNOTATION SPECS, name IS xlines, ylines, patches OR lines (MATCHING spec_name AND internal_name)
+    def draw_spec(self,spec,name):
+        # DRAW A NEW ANNOTATION, KEEP ITS SPEC (WITH THE STYLE IT RESOLVED TO) FOR COPIES AND ITS ARTIST FOR THIS AX
+        artist = spec.draw(self.ax)
+        setattr(self, 'spec_' + name, getattr(self, 'spec_' + name) + [resolved(spec, artist)])
+        setattr(self, 'internal_' + name, getattr(self, 'internal_' + name) + [artist])
+        return artist
+
+    def replay_specs(self,name,zorder=None):
+        # REDRAW EVERY RECORDED SPEC ONTO THIS AX, THE NEW ARTISTS REPLACE THE ONES KEPT BEFORE
+        setattr(self, 'internal_' + name, [spec.draw(self.ax, zorder) for spec in getattr(self, 'spec_' + name)])
 
     # %% PLOTTING COPIED XLINES AND YLINES FOR INSTANCE IN A SUBPLOT
     def plot_copied_xlines_ylines(self,zorder=None,**kwargs):
-        excluded_keywords = ['bbox', 'label', 'picker', 'transform', 'axes',
-                             'children', 'path', 'path_effects', 'tightbbox', 'transformed_clip_path_and_affine',
-                             'window_extent', 'xydata', 'figure', 'data', 'xdata', 'ydata','zorder']
-        temp_list = []
-        for line in self.internal_xlines:
-            filtered_properties = {key: value for key, value in line.properties().items() if
-                                   key not in excluded_keywords}
-            temp_line = self.ax.axvline(x=line.properties()['xdata'][0], **filtered_properties)
-            temp_list.append(temp_line)
-        self.internal_xlines = temp_list
-
-        temp_list = []
-        for line in self.internal_ylines:
-            filtered_properties = {key: value for key, value in line.properties().items() if
-                                   key not in excluded_keywords}
-            if zorder is not None: filtered_properties['zorder'] = zorder
-            temp_line = self.ax.axhline(y=line.properties()['ydata'][0], **filtered_properties)
-            temp_list.append(temp_line)
-        self.internal_ylines = temp_list
+        self.replay_specs('xlines', zorder)
+        self.replay_specs('ylines', zorder)
 
     # %% PLOTTING COPIED LINES FOR INSTANCE IN A SUBPLOT
     def plot_copied_lines(self,zorder=None):
-        excluded_keywords = ['bbox', 'label', 'picker', 'transform', 'axes',
-                             'children', 'path', 'path_effects', 'tightbbox', 'transformed_clip_path_and_affine',
-                             'window_extent', 'xydata', 'figure', 'data', 'xdata', 'ydata','zorder']
-        temp_list = []
-        for line in self.internal_lines:
-            filtered_properties = {key: value for key, value in line.properties().items() if
-                                   key not in excluded_keywords}
-            if zorder is not None: filtered_properties['zorder'] = zorder
-            temp = mlines.Line2D(line.properties()['xdata'],line.properties()['ydata'], **filtered_properties)
-            temp_line = self.ax.add_line(temp)
-            temp_list.append(temp_line)
-        self.internal_xlines = temp_list
+        self.replay_specs('lines', zorder)
 
     # %% PLOTTING COPIED PATCHES FOR INSTANCE IN A SUBPLOT
     def plot_copied_patches(self,zorder=None,**kwargs):
-        included_keywords = ['agg_filter','antialiased','aa', 'capstyle', 'clip_box', 'clip_on', 'clip_path', 'color',
-                             'edgecolor', 'facecolor', 'fill', 'hatch', 'joinstyle', 'label', 'linestyle', 'linewidth',
-                             'picker', 'snap', 'url', 'visible','in_layout',
-                             'angle','rotation_point','zorder']
-
-        temp_list = []
-        for patch in self.internal_patches:
-            filtered_properties = {key: value for key, value in patch.properties().items() if key in included_keywords}
-
-            if zorder is not None: filtered_properties['zorder'] = zorder
-
-            if isinstance(patch, patches.Rectangle):
-                corners = patch.properties()['corners']
-                xy = tuple(corners[0])
-                width = corners[1][0] - corners[0][0]
-                height = corners[3][1] - corners[0][1]
-                rec_args = xy,width,height
-                new_patch = patches.Rectangle(*rec_args,**filtered_properties)
-            elif isinstance(patch, patches.Circle):
-                xy = patch.properties()['center']
-                radius = patch.properties()['width']/2
-                circle_args = xy, radius
-                new_patch = patches.Circle(*circle_args,**filtered_properties)
-            elif isinstance(patch, patches.Polygon):
-                path = patch.properties()['path']
-                xy = [tuple(pos) for pos in path.vertices]
-                poly_args = xy[:-1]
-                new_patch = patches.Polygon(poly_args,**filtered_properties)
-            else:
-                print ('PATCH TYPE NOT CURRENTLY SUPPORTED, SUBMIT REQUEST ON GITHUB TO ADD')
-                return
-
-            temp_patch = self.ax.add_patch(new_patch)
-            temp_list.append(temp_patch)
-
-        self.internal_patches = temp_list
+        self.replay_specs('patches', zorder)
 
     # %% LEGEND METHODS
     def manage_legend(self):
-        # GET HANDLES AND LABELS
-        if not hasattr(self, 'copied_legend'):
-            handles, labels = self.ax.get_legend_handles_labels()
-
-            if self.plot_type == 'strip':
-                temp_handles, temp_labels = [],[]
-                for i in range(len(self.unique)):
-                    temp_handles.append(handles[i*(len(self.unique)+1)])#+2*len(self.unique)])
-                    temp_labels.append(labels[i*(len(self.unique)+1)])#+2*len(self.unique)])
-                handles,labels = temp_handles,temp_labels
-                self.handles, self.labels = handles,labels
-
-            # MANAGE STRANGE HISTOGRAM BEHAVIOR
-            if self.plot_type == 'hist':
-                labels,handles = self.unique.copy(),[]
-                for counter, lab in enumerate(labels): handles.append(Patch(color=self.colors[counter], label=lab))
-            if not labels and not handles or (self.plot_type == 'hist' and len(self.unique) < 2):
-                try: self.set_legend([],[],visible=False)#self.legend.set_visible(False)
-                except: pass
-            else:
-
-                # CREATE THE LEGEND AND CATCH ALL TEXT TO ADJUST COLOR, WITHIN MANAGE LEGEND USE GLOBAL TRANSPARENCY VALUE
-                self.legend_kwargs['framealpha'] = 0 if self.transparent else 1
-                if is_transparent(self.back_color): self.legend_kwargs['framealpha'] = 0
-                self.set_legend(handles[:self.handles_in_legend],labels[:self.handles_in_legend],**self.legend_kwargs)
-
-            if self.plot_type != 'strip': self.handles,self.labels = self.get_legend_handles_labels()
-            if self.plot_type in ['strip','boxwhisker','bar'] and len(self.unique)<2: self.add_to_legend([],[],visible=False)
-
-        else:
-            self.set_legend(self.handles,self.labels)
+        # BUILD THE LEGEND ONCE PER RENDER FROM THE CACHED GROUPS, A COPY BUILDS ITS OWN FROM THE SAME DATA AND legend_kwargs
+        # (AFTER low_memory RELEASED THE DATA, THE ENTRIES OF THE LAST RENDER ARE REUSED)
+        if not self.__dict__.get('data_released'): self.handles, self.labels = self.legend_entries()
+        few_groups = len(self.handles) < 2 and self.plot_type in ['strip','boxwhisker','bar','hist']
+
+        # WITHIN MANAGE LEGEND USE GLOBAL TRANSPARENCY VALUE
+        framealpha = 0 if self.transparent or is_transparent(self.back_color) else 1
+        self.legend_kwargs = {**self.legend_kwargs, 'framealpha': framealpha}
+        self.set_legend(self.handles[:self.handles_in_legend],self.labels[:self.handles_in_legend],
+                        visible=len(self.handles) > 0 and not few_groups,**self.legend_kwargs)
+
+    def legend_entries(self):
+        # SEABORN'S OWN ENTRIES WHEN IT LEGENDED STYLE OR SIZE GROUPS (SEE seaborn_legend)
+        if self.__dict__.get('uses_seaborn_legend'): return self.get_legend_handles_labels()
+
+        # OTHERWISE ONE PROXY HANDLE PER GROUP IN SEABORN'S HUE ORDER, NO ARTISTS ON THE AX ARE SCANNED
+        groups = self.group_index()
+        if not groups.grouped: return [],[]
+        levels = groups.hue_order()
+        palette = self.__dict__.get('legend_palette') or self.colors
+        entries = [(self.legend_handle(i,color),level) for i,(color,level) in enumerate(zip(hue_colors(palette,levels),levels))]
+
+        # LIKE MATPLOTLIB, LEAVE OUT GROUPS WITHOUT A LABEL (E.G. THE EMPTY zlab COLUMN OF LIST INPUTS)
+        entries = [(handle,level) for handle,level in entries if str(level) != '']
+        return [handle for handle,_ in entries], [level for _,level in entries]
+
+    def legend_handle(self,i,color):
+        # CHILD CLASSES BUILD HANDLES MATCHING THEIR OWN ARTISTS, A PATCH IN THE GROUP COLOR BY DEFAULT (HISTOGRAMS)
+        return Patch(color=color)
+
+    def seaborn_legend(self,style,zlab,kwargs):
+        # THE PROXIES ONLY KNOW THE zlab GROUPS, SO A style OTHER THAN zlab OR ANY size GROUPING KEEPS SEABORN'S LEGEND
+        other_style = style is not None and not (isinstance(style, str) and style == zlab)
+        self.uses_seaborn_legend = other_style or kwargs.get('size') is not None
+        return 'auto' if self.uses_seaborn_legend else False
 
     def set_legend(self,handles,labels,visible=True, text_color=None,**kwargs):
         # IF A TITLE IS PASSED ENSURE APPROPRIATE FONT, PREPARE COLOR SETTING FOR LATER
         if 'title' in kwargs and 'title_fontsize' not in kwargs: kwargs['title_fontproperties'] = {'size':self.def_font_sz}
-        if 'title' in kwargs and 'title_fontweight' not in kwargs: kwargs['title_fontproperties'].update({'weight':self.fontweight})
+        if 'title' in kwargs and 'title_fontweight' not in kwargs:
+            kwargs['title_fontproperties'] = {**kwargs['title_fontproperties'], 'weight': self.fontweight}
         if text_color is None: text_color = self.line_color
 
         # UPDATE THE LEGEND KWARGS WITH ANY NEW KWARGS
@@ -380,16 +536,8 @@ class BasePlotter:
         # UPDATE THE LEGEND KWARGS WITH ANY NEW KWARGS
         self.legend_kwargs = dict_update_nested(self.legend_kwargs,kwargs)
 
-        # GET OLD HANDLES AND LABELS, EXTEND WITH THE NEW INPUTS
-        handles, labels = self.get_legend_handles_labels()
-
-        if self.plot_type == 'strip':
-            temp_handles, temp_labels = [], []
-            for i in range(len(self.unique)):
-                temp_handles.append(handles[i * (len(self.unique) + 1)])  # +2*len(self.unique)])
-                temp_labels.append(labels[i * (len(self.unique) + 1)])  # +2*len(self.unique)])
-            handles, labels = temp_handles, temp_labels
-
+        # EXTEND THE ENTRIES THE LEGEND WAS BUILT WITH BY THE NEW INPUTS
+        handles, labels = list(self.handles or []), list(self.labels or [])
         handles.extend(new_handles)
         labels.extend(new_labels)
 
@@ -397,20 +545,6 @@ class BasePlotter:
         if self.legend is not None:
             self.set_legend(handles,labels,visible=visible, text_color=text_color, **self.legend_kwargs)
 
-    def plot_copied_legend(self):
-        included_keywords = ['loc', 'numpoints', 'markerscale',
-        'markerfirst', 'reverse', 'scatterpoints', 'scatteryoffsets', 'prop',
-        'fontsize', 'labelcolor', 'borderpad', 'labelspacing', 'handlelength',
-        'handleheight', 'handletextpad', 'borderaxespad', 'columnspacing', 'ncols',
-        'mode', 'fancybox', 'shadow', 'title', 'title_fontsize', 'framealpha',
-        'edgecolor', 'facecolor', 'bbox_to_anchor', 'bbox_transform', 'frameon',
-        'handler_map', 'title_fontproperties', 'alignment', 'ncol', 'draggable']
-        filtered_properties = {key: value for key, value in self.legend.properties().items() if key in included_keywords}
-        handles, labels = self.handles,self.labels
-        legend = self.ax.legend(handles,labels,**filtered_properties)
-        self.legend = legend
-        self.copied_legend = [handles,labels]
-
     def get_legend(self):
         # SIMPLE WAY TO GET THE LEGEND OBJECT OUT OF READYPLOT
         if self.legend is not None: return self.legend
@@ -418,156 +552,157 @@ class BasePlotter:
 
     # %% ERROR BARS
     def plot_errors(self,xlab,ylab,zlab):
-        # INITIALIZE VARS FOR ERROR BAR EXISTENCE AND GET AXIS TICKS IN CASE AN AXIS HAS STRING LABELS NOT NUMERIC
-        err_xvars = [self.xerror_vals,self.hi_xerror_vals,self.low_xerror_vals]
-        err_yvars = [self.yerror_vals, self.hi_yerror_vals, self.low_yerror_vals]
-        err_vars = err_xvars.copy()
-        err_vars.extend(err_yvars)
-        #print(err_vars)
-
-        x_ticks = self.ax.get_xticks()
-        x_labels = self.ax.get_xticklabels()
-        y_ticks = self.ax.get_yticks()
-        y_labels = self.ax.get_yticklabels()
-
-        x_min, x_max = self.ax.get_xlim()
-        y_min, y_max = self.ax.get_ylim()
-
-        # START LOOP IF ANY ERROR KEYWORDS HAVE BEEN PASSED< CREATE A TEMPORARY DF PER GROUP
-        if any(error_var is not None for error_var in err_vars):
-            for i,group in enumerate(self.unique):
-                try: tempDF = self.DF[self.DF[zlab] == group]
-                except KeyError: tempDF = self.DF
-
-                # GET THE X,Y POSITION OF EVERY POINT, IF THE X OR Y IS A STRING, MAP BY AXIS TICKS
-                for j,row in tempDF.iterrows():
-                    tempx = row[xlab]
-                    tempy = row[ylab]
-
-                    if isinstance(tempx, str):
-                        for k, label in enumerate(x_labels):
-                            if label.get_text() == tempx:
-                                tempx = x_ticks[i]
-                                break
-                    if isinstance(tempy, str):
-                        for k, label in enumerate(y_labels):
-                            if label.get_text() == tempy:
-                                tempy = y_ticks[i]
-                                break
-
-                    # PLOT ERROR BARS AND FIX THE ISSUE WHERE ONLY A HIGH OR LOW ERROR LEADS TO MISSING CONNECTION
-                    temp_x_err = np.array([row['x_errs'][0],row['x_errs'][1]])
-                    temp_y_err = np.array([row['y_errs'][0],row['y_errs'][1]])
-                    if tempx+temp_x_err[1] > x_max and self.error_lim_affect and any(a is not None for a in err_xvars):
-                        x_max = tempx+temp_x_err[1]
-                        self.ax.set_xlim(x_min,x_max)
-                    if tempy+temp_y_err[1] > y_max and self.error_lim_affect and any(a is not None for a in err_yvars):
-                        y_max = tempy+temp_y_err[1]
-                        self.ax.set_ylim(y_min,y_max)
-                    if tempx - temp_x_err[0] < x_min and self.error_lim_affect  and any(a is not None for a in err_xvars):
-                        x_min = tempx - temp_x_err[0]
-                        self.ax.set_xlim(x_min, x_max)
-                    if tempy - temp_y_err[0] < y_min and self.error_lim_affect and any(a is not None for a in err_yvars):
-                        y_min = tempy - temp_y_err[0]
-                        self.ax.set_ylim(y_min, y_max)
-                    linewidth = getattr(self, 'linewidth', self.def_line_w)
-                    self.fix_trailing_errors(tempx, tempy, temp_x_err, temp_y_err, self.colors[i],linewidth)
-                    self.ax.errorbar(tempx,tempy,xerr=temp_x_err.reshape(2,1),yerr=temp_y_err.reshape(2,1),
-                                     capsize = self.capsize,color=self.colors[i],linewidth=linewidth,capthick=linewidth)
-
-                    if any(a is not None for a in err_xvars): self.ax.set_xlim(x_min, x_max)
-                    if any(a is not None for a in err_yvars): self.ax.set_ylim(y_min, y_max)
-
         # PASS IF NO ERROR KEYWORDS HAVE BEEN PASSED
-        else:
-            pass
+        if self.low_x_errs is None: return
+        x_given = any(a is not None for a in [self.xerror_vals,self.hi_xerror_vals,self.low_xerror_vals])
+        y_given = any(a is not None for a in [self.yerror_vals,self.hi_yerror_vals,self.low_yerror_vals])
 
-    def fix_trailing_errors(self,tx,ty,txe,tye,c,l):
-        # FOR EACH ERROR, PLOT A LINE CONNECTING IT TO THE MAIN POINT IF IT EXISTS WITHOUT THE HI/LOW COUNTERPART
-        if not np.isnan(txe[0]) and np.isnan(txe[1]): self.ax.plot([tx, tx-txe[0]], [ty, ty], color=c, linewidth=l)
-        if not np.isnan(txe[1]) and np.isnan(txe[0]): self.ax.plot([tx, tx+txe[1]], [ty, ty], color=c, linewidth=l)
-        if not np.isnan(tye[0]) and np.isnan(tye[1]): self.ax.plot([tx, tx], [ty, ty-tye[0]], color=c, linewidth=l)
-        if not np.isnan(tye[1]) and np.isnan(tye[0]): self.ax.plot([tx, tx], [ty, ty+tye[1]], color=c, linewidth=l)
+        # GET THE X,Y POSITION OF EVERY POINT AT ONCE, STRING CATEGORIES ARE MAPPED BY THEIR AXIS TICKS
+        x = self.error_positions(self.DF[xlab], self.ax.xaxis)
+        y = self.error_positions(self.DF[ylab], self.ax.yaxis)
+        low_x, hi_x, low_y, hi_y = self.low_x_errs, self.hi_x_errs, self.low_y_errs, self.hi_y_errs
 
+        # ERRORS ONLY WIDEN THE AXIS LIMITS WITH error_lim_affect, OTHERWISE THE LIMITS ARE KEPT AS THEY ARE
+        x_min, x_max = self.ax.get_xlim()
+        y_min, y_max = self.ax.get_ylim()
+        if self.error_lim_affect and x_given:
+            x_min, x_max = np.nanmin(np.append(x - low_x, x_min)), np.nanmax(np.append(x + hi_x, x_max))
+        if self.error_lim_affect and y_given:
+            y_min, y_max = np.nanmin(np.append(y - low_y, y_min)), np.nanmax(np.append(y + hi_y, y_max))
+
+        # ONE BATCH OF STEMS AND CAPS PER GROUP IN THE GROUP'S COLOR
+        linewidth = getattr(self, 'linewidth', self.def_line_w)
+        groups = self.group_index()
+        for i,group in enumerate(self.unique):
+            rows = groups.rows[i]
+            self.draw_errors(x[rows], y[rows], low_x[rows], hi_x[rows], low_y[rows], hi_y[rows], self.colors[i], linewidth)
+
+        if x_given: self.ax.set_xlim(x_min, x_max)
+        if y_given: self.ax.set_ylim(y_min, y_max)
+
+    def error_positions(self,values,axis):
+        # NUMBERS ARE USED AS IS, STRINGS BY THE POSITION OF THE TICK WITH THAT LABEL, ANYTHING ELSE BY THE AXIS UNITS
+        if pd.api.types.is_numeric_dtype(values): return values.to_numpy(dtype=float)
+        if pd.api.types.is_string_dtype(values) or isinstance(values.dtype, pd.CategoricalDtype):
+            ticks = {label.get_text(): tick for label, tick in zip(axis.get_ticklabels(), axis.get_ticklocs())}
+            return pd.to_numeric(values.map(ticks), errors='coerce').to_numpy(dtype=float)
+        return np.asarray(axis.convert_units(values), dtype=float)
+
+    def draw_errors(self,x,y,low_x,hi_x,low_y,hi_y,color,linewidth):
+        # STEMS RUN FROM THE LOW TO THE HIGH END, AN ERROR WITH ONLY A LOW OR HIGH SIDE STARTS AT THE POINT ITSELF
+        left, right = x - np.nan_to_num(low_x), x + np.nan_to_num(hi_x)
+        down, up = y - np.nan_to_num(low_y), y + np.nan_to_num(hi_y)
+        has_x = ~(np.isnan(low_x) & np.isnan(hi_x))
+        has_y = ~(np.isnan(low_y) & np.isnan(hi_y))
+        stems = np.concatenate([np.stack([np.column_stack([left, y]), np.column_stack([right, y])], axis=1)[has_x],
+                                np.stack([np.column_stack([x, down]), np.column_stack([x, up])], axis=1)[has_y]])
+        self.ax.add_collection(LineCollection(stems, colors=color, linewidths=linewidth, zorder=2), autolim=False)
+
+        # CAPS ONLY WHERE AN END EXISTS (NAN ENDS ARE NOT DRAWN), VERTICAL FOR X ERRORS AND HORIZONTAL FOR Y ERRORS
+        cap_style = {'color': color, 'linestyle': 'none', 'markersize': 2 * self.capsize, 'markeredgewidth': linewidth}
+        if has_x.any(): self.ax.plot(np.concatenate([x - low_x, x + hi_x]), np.concatenate([y, y]), marker='|', **cap_style)
+        if has_y.any(): self.ax.plot(np.concatenate([x, x]), np.concatenate([y - low_y, y + hi_y]), marker='_', **cap_style)
+
+    # %% ERROR BARS AS FOUR FLOAT ARRAYS (low_x, hi_x, low_y, hi_y) ALIGNED BY POSITION WITH DF, NAN WHERE THERE IS NO ERROR
     def resolve_err_list(self):
-        # INITIALIZE OUPUTS AND STORE VARIABLES FOR KEY,VAL DICTIONARY ITERATION LATER
-        output_x = []
-        output_y = []
-        variables = {
-            'xerror_vals':self.xerror_vals,'low_xerror_vals':self.low_xerror_vals,'hi_xerror_vals':self.hi_xerror_vals,
-            'yerror_vals':self.yerror_vals,'low_yerror_vals':self.low_yerror_vals,'hi_yerror_vals':self.hi_yerror_vals}
-
-        # ITERATE THROUGH VARIABLES AND IF ANY ARE STRINGS RETRIEVE ERROR BAR DATA FROM THE DATA FRAME COLUMN
-        for key, val in variables.items():
-            if isinstance(val, str):
-                setattr(self, key, self.DF[val].tolist())
-
-        # ITERATE AND GET X AND Y ERRORS TO BE LIST VALUES WITH LOW AND HIGH, SET NONES TO NP.NAN
-        for i, row in self.DF.iterrows():
-            # Process x
-            if self.low_xerror_vals is None and self.hi_xerror_vals is None:
-                low_x = self.xerror_vals[i] if self.xerror_vals is not None else np.nan
-                hi_x = self.xerror_vals[i] if self.xerror_vals is not None else np.nan
-            else:
-                low_x = self.low_xerror_vals[i] if self.low_xerror_vals is not None else np.nan
-                hi_x = self.hi_xerror_vals[i] if self.hi_xerror_vals is not None else np.nan
-
-            # Process y
-            if self.low_yerror_vals is None and self.hi_yerror_vals is None:
-                low_y = self.yerror_vals[i] if self.yerror_vals is not None else np.nan
-                hi_y = self.yerror_vals[i] if self.yerror_vals is not None else np.nan
-            else:
-                low_y = self.low_yerror_vals[i] if self.low_yerror_vals is not None else np.nan
-                hi_y = self.hi_yerror_vals[i] if self.hi_yerror_vals is not None else np.nan
-
-            # Build output lists
-            output_x.append([low_x,hi_x])
-            output_y.append([low_y,hi_y])
-
-        # SET DATA FRAME'S X AND Y ERRORS AS [low,high] LIST ELEMENTS
-        self.DF['x_errs'] = [arr for arr in output_x]
-        self.DF['y_errs'] = [arr for arr in output_y]
-        return output_x,output_y
+        # SKIP ENTIRELY IF NO ERROR BARS WERE REQUESTED
+        if all(getattr(self, name) is None for name in self.err_names): errs = (None, None, None, None)
+        else: errs = self.error_arrays(self.DF)
+        self.low_x_errs, self.hi_x_errs, self.low_y_errs, self.hi_y_errs = errs
+        return errs
+
+    def error_arrays(self,DF,columns_only=False):
+        # A SYMMETRIC ERROR APPLIES TO BOTH SIDES UNLESS A LOW OR HIGH ERROR IS GIVEN
+        arrays = []
+        for both, low, hi in [('xerror_vals', 'low_xerror_vals', 'hi_xerror_vals'),
+                              ('yerror_vals', 'low_yerror_vals', 'hi_yerror_vals')]:
+            both, low, hi = getattr(self, both), getattr(self, low), getattr(self, hi)
+            if low is None and hi is None: low = hi = both
+
+            # A STRING IS A COLUMN OF DF, ANY OTHER SEQUENCE HOLDS ONE VALUE PER ROW (NONE OR NAN FOR NO ERROR)
+            for values in [low, hi]:
+                if isinstance(values, str): values = DF[values].to_numpy(dtype=float, na_value=np.nan)
+                elif values is None or columns_only: values = np.full(len(DF), np.nan)
+                elif isinstance(values, pd.Series): values = values.to_numpy(dtype=float, na_value=np.nan)
+                else: values = np.asarray(values, dtype=float)
+                if len(values) != len(DF): raise ValueError(f"Error bars have {len(values)} values for {len(DF)} rows")
+                arrays.append(values)
+        return tuple(arrays)
+
+    # %% GROUPS IN ZLAB, USED FOR COLOR AND MARKER SELECTION, WITH A DICTIONARY OF MARKERS PER GROUP
+    def resolve_groups(self):
+        self.invalidate_groups()
+        self.unique = list(self.group_index().unique)
+        try:
+            while len(self.unique) > len(self.markers): self.markers = self.markers + self.markers
+            self.marker_dict = dict(zip(self.unique,self.markers))
+        except TypeError: self.marker_dict = {}
+
+    # %% GROUP CODES AND ROW POSITIONS OF self.zlab, BUILT ONCE AND SHARED BY EVERY STAGE UNTIL DF OR THE LABELS CHANGE
+    def group_index(self,DF=None):
+        if DF is not None and DF is not self.DF: return GroupIndex(DF, self.xlab, self.zlab)
+        groups = self.__dict__.get('group_cache')
+        if groups is None or groups.key != (id(self.DF), len(self.DF), self.xlab, self.zlab):
+            groups = self.group_cache = GroupIndex(self.DF, self.xlab, self.zlab)
+        return groups
+
+    def invalidate_groups(self):
+        # CALL AFTER CHANGING THE zlab VALUES OF DF IN PLACE, A NEW DF OR NEW LABELS ARE DETECTED AUTOMATICALLY
+        self.group_cache = None
+
+    # %% CATEGORICAL X AXES, xlab IS ENCODED ONCE AND REUSED UNTIL THE COLUMN IS REPLACED
+    def encode_x(self):
+        if self.DF[self.xlab].dtype != self.__dict__.get('x_categories'):
+            self.DF[self.xlab] = encode_categories(self.DF[self.xlab])
+            self.x_categories = self.DF[self.xlab].dtype
+
+    # %% Y OF GROUP i ONLY, NAN EVERYWHERE ELSE (FOR THE PER-GROUP MARKER OVERLAYS)
+    def only_group(self,DF,ylab,i):
+        return DF[ylab].where(self.group_index(DF).mask(i))
+
+    # %% Y WITH EVERY OTHER GROUP PUSHED TO INFINITY (ROWS IN NO GROUP ARE KEPT), SO ONLY GROUP i SHOWS ON THE AXES
+    def other_groups_to_inf(self,DF,ylab,i):
+        groups = self.group_index(DF)
+        if len(groups.unique) < 2: return DF[ylab]
+        return DF[ylab].astype(float).mask((groups.codes >= 0) & (groups.codes != i), np.inf)
 
     # %% AXIS AND TICK MANAGEMENT
     def manage_axes(self):
-        # MANAGE GENERAL AXES
+        # MANAGE GENERAL AXES, TICK FONTS ARE SET ON THE TICKS THAT EXIST (NEW ONES COPY THE FIRST) SO NO LABELS ARE BUILT
         for axis in self.box_edges:
             self.ax.spines[axis].set_linewidth(self.def_line_w)
-        sns.despine()
-        for tick in self.ax.get_xticklabels():
-            tick.set_fontweight(self.fontweight)
-            tick.set_fontsize(self.def_font_sz * self.xtick_font_ratio)
-        for tick in self.ax.get_yticklabels():
-            tick.set_fontweight(self.fontweight)
-            tick.set_fontsize(self.def_font_sz * self.ytick_font_ratio)
+        sns.despine(fig=self.fig)
+        for tick in self.ax.xaxis.majorTicks:
+            for label in [tick.label1, tick.label2]:
+                label.set(fontweight=self.fontweight, fontsize=self.def_font_sz * self.xtick_font_ratio)
+        for tick in self.ax.yaxis.majorTicks:
+            for label in [tick.label1, tick.label2]:
+                label.set(fontweight=self.fontweight, fontsize=self.def_font_sz * self.ytick_font_ratio)
         try: self.manage_x_axis()
         except TypeError: pass
         try: self.manage_y_axis()
         except TypeError: pass
 
+    def scalar_formatter(self,axis,sci_lims):
+        # ONE SCIENTIFIC ScalarFormatter PER AXIS AND sci LIMITS, REUSED WHILE BOTH STAY THE SAME
+        key = (axis, tuple(sci_lims))
+        formatters = self.__dict__.setdefault('axis_formatters', {})
+        if formatters.get(axis.axis_name, (None,))[0] != key:
+            formatter = ticker.ScalarFormatter()
+            formatter.set_scientific(True)
+            formatter.set_powerlimits(sci_lims)
+            formatters[axis.axis_name] = (key, formatter)
+        return formatters[axis.axis_name][1]
 
     def manage_x_axis(self):
-        # MANAGE X AXIS
-        xtexts = []
-        for label in self.ax.get_xticklabels():
-            xtexts.append(label.get_text())
-        if all([numeric_checker(tick) for tick in xtexts]):
-            try:
-                x_min, x_max = self.ax.get_xlim()
-                abs_max = x_max if abs(x_max) > abs(x_min) else x_min
-                self.ax.xaxis.set_major_formatter(ticker.ScalarFormatter())
-                self.ax.ticklabel_format(axis='x', style='sci', scilimits=self.sci_x_lims)
-                if abs(abs_max) < 10**self.sci_x_lims[0] or abs(abs_max) > 10**self.sci_x_lims[1]:
-                    x_min, x_max = self.ax.get_xlim()
-                    if abs(x_min) < abs(0.2 * (x_max - x_min)): self.ax.set_xlim(0, x_max)
-                    elif abs(x_max) < abs(0.2 * (x_max - x_min)): self.ax.set_xlim(x_min, 0)
-                    x_min, x_max = self.ax.get_xlim()
-                else:
-                    pass#self.ax.xaxis.set_major_formatter(ticker.FuncFormatter(lambda val, pos: f'{val:.{self.x_axis_sig_figs}g}'))
-
-            except AttributeError:pass
-            except KeyError:pass
+        # MANAGE X AXIS, NUMERIC IF NO UNIT CONVERTER (CATEGORIES, DATES) IS SET ON IT
+        if axis_is_numeric(self.ax.xaxis):
+            x_min, x_max = self.ax.get_xlim()
+            abs_max = x_max if abs(x_max) > abs(x_min) else x_min
+            self.ax.xaxis.set_major_formatter(self.scalar_formatter(self.ax.xaxis, self.sci_x_lims))
+            if abs(abs_max) < 10**self.sci_x_lims[0] or abs(abs_max) > 10**self.sci_x_lims[1]:
+                if abs(x_min) < abs(0.2 * (x_max - x_min)): self.ax.set_xlim(0, x_max)
+                elif abs(x_max) < abs(0.2 * (x_max - x_min)): self.ax.set_xlim(x_min, 0)
 
             x_min, x_max = self.ax.get_xlim()
             if abs(x_min) < abs(0.2 * (x_max - x_min)) and self.plot_type not in ['bar','boxwhisker','strip']: self.ax.set_xlim(0, x_max)
@@ -586,26 +721,14 @@ class BasePlotter:
         tx.set_position((1.05, self.x_exp_location))
 
     def manage_y_axis(self):
-        # MANAGE Y AXIS
-        ytexts = []
-        for label in self.ax.get_yticklabels():
-            ytexts.append(label.get_text())
-        if all([numeric_checker(tick) for tick in ytexts]):
-            try:
-                y_min, y_max = self.ax.get_ylim()
-                abs_max = y_max if abs(y_max) > abs(y_min) else y_min
-                self.ax.yaxis.set_major_formatter(ticker.ScalarFormatter())
-                self.ax.ticklabel_format(axis='y', style='sci', scilimits=self.sci_y_lims)
-                if abs(abs_max) < 10**self.sci_y_lims[0] or abs(abs_max) > 10**self.sci_y_lims[1]:
-                    y_min, y_max = self.ax.get_ylim()
-                    if abs(y_min) < abs(0.2 * (y_max - y_min)):self.ax.set_ylim(0, y_max)
-                    elif abs(y_max) < abs(0.2 * (y_max - y_min)): self.ax.set_ylim(y_min, 0)
-                    y_min, y_max = self.ax.get_ylim()
-                else:
-                    pass#self.ax.yaxis.set_major_formatter(ticker.FuncFormatter(lambda val, pos: f'{val:.{self.y_axis_sig_figs}g}'))
-
-            except AttributeError:pass
-            except KeyError:pass
+        # MANAGE Y AXIS, NUMERIC IF NO UNIT CONVERTER (CATEGORIES, DATES) IS SET ON IT
+        if axis_is_numeric(self.ax.yaxis):
+            y_min, y_max = self.ax.get_ylim()
+            abs_max = y_max if abs(y_max) > abs(y_min) else y_min
+            self.ax.yaxis.set_major_formatter(self.scalar_formatter(self.ax.yaxis, self.sci_y_lims))
+            if abs(abs_max) < 10**self.sci_y_lims[0] or abs(abs_max) > 10**self.sci_y_lims[1]:
+                if abs(y_min) < abs(0.2 * (y_max - y_min)):self.ax.set_ylim(0, y_max)
+                elif abs(y_max) < abs(0.2 * (y_max - y_min)): self.ax.set_ylim(y_min, 0)
 
             y_min, y_max = self.ax.get_ylim()
             if abs(y_min) < abs(0.2 * (y_max - y_min)): self.ax.set_ylim(0, y_max)
@@ -640,8 +763,10 @@ class BasePlotter:
     def get_all(self,include_problematic = True):
         # GET ALL VARIABLES, EXCLUDE POTENTIALLY PROBLEMATIC VARIABLES IF TRYING TO PORT SETTINGS TO ANOTHER PLOT
         problematic = ['DF','x','y','z','xlab','ylab','zlab','DF_counter','max_list_x','max_list_y',
-                       'unique','marker_dict','fig','ax','plot_type','dir_name','input_dict']
-        output = {key: value for key, value in vars(self).items() if (key not in problematic or include_problematic)}
+                       'unique','marker_dict','fig','ax','plot_type','dir_name','input_dict','settings','group_cache',
+                       'stage_keys','plot_limits','own_figure','data_released']
+        output = {key: value for key, value in {**self.settings, **vars(self)}.items()
+                  if (key not in problematic or include_problematic)}
         return output
 
     def set_all(self,input_dict):
@@ -650,15 +775,11 @@ class BasePlotter:
             setattr(self, key, value)
 
     def get_copy_settings(self,include_problematic = False):
-        # OUTPUT ALL THE INPUT SETTINGS INTO THIS GRAPH FOR REPEATABILITY WITH OTHERS
+        # OUTPUT ALL THE INPUT SETTINGS INTO THIS GRAPH FOR REPEATABILITY WITH OTHERS, AS A SNAPSHOT OF THE SETTINGS
+        # LAYERS WITH THE VALUES CHANGED ON THIS PLOTTER ON TOP (ONLY THOSE ARE COPIED, THE LAYERS BELOW ARE SHARED)
         problematic = ['DF', 'x', 'y', 'z', 'xlab', 'ylab', 'zlab','imported_settings','legend','first_time_legend']
-        if include_problematic: output = {key: value for key, value in self.input_dict.items()}
-        else: output = {key: value for key, value in self.input_dict.items() if key not in problematic}
-        current_settings = self.get_all()
-        for key, value in output.items():
-            if key in self.get_all():
-                output[key] = current_settings[key]
-        return output
+        overrides = {key: value for key, value in vars(self).items() if key in self.settings}
+        return self.settings.snapshot(overrides, hidden=() if include_problematic else problematic)
 
 #%%---------------------------------------------------------------------------------------------------------------------
 # INTERNAL METHODS FOR HANDLING INPUTS, GENERAL ESTHETICS, AND SAVE HELPER FUNCTIONS
@@ -692,6 +813,18 @@ class BasePlotter:
         else: return tuple(outputs)
 
     def force_data_frame(self):
+        # ADOPT 1D NUMPY ARRAYS (INCLUDING NP.MEMMAP) AND LISTS OF EQUAL LENGTH DIRECTLY, WITHOUT INTERMEDIATE FRAMES
+        columns = {lab: np.ravel(val) if isinstance(val, np.ndarray) else val
+                   for lab, val in zip((self.xlab, self.ylab, self.zlab), (self.x, self.y, self.z))
+                   if isinstance(val, (list, np.ndarray)) and np.ndim(val) <= 2 and
+                   (np.ndim(val) == 1 or np.shape(val)[-1] == 1)}
+        lengths = {len(val) for val in columns.values()}
+        if self.xlab in columns and len(lengths) == 1:
+            # A MISSING Z BECOMES ONE EMPTY-STRING CATEGORY, STORED AS ONE BYTE PER ROW INSTEAD OF A STRING COLUMN
+            if self.zlab not in columns:
+                columns[self.zlab] = pd.Categorical.from_codes(np.zeros(lengths.pop(), dtype=np.int8), categories=[''])
+            return pd.DataFrame(columns, copy=False)
+
         # CREATE A TEMPORARY DATA FRAME, WE KNOW X IS PROVIDED BUT TRY/EXCEPT THE Y AND Z VALUES
         DF = pd.DataFrame()
         DF[self.xlab] = pd.DataFrame(ensure_data_frame(self.x))
@@ -711,10 +844,19 @@ class BasePlotter:
         # RETURN TEMPORARY DATAFRAME
         return DF
 
+    # %% NEW FIGURE FROM figure_pool, THROUGH PYPLOT, OR WITH use_pyplot=False ON AN AGG CANVAS PYPLOT NEVER TRACKS
+    def new_figure(self):
+        size = (self.fig_width, self.fig_height)
+        if self.figure_pool is not None: fig = self.figure_pool.acquire(figsize=size, dpi=self.dpi)
+        elif self.use_pyplot: fig = plt.figure(dpi=self.dpi)
+        else: fig = agg_figure(dpi=self.dpi)
+        self.own_figure = (fig, self.figure_pool)
+        return fig
+
     def ensure_fig_ax_exist(self):
         # CREATE A FIG IF IT DOESN'T EXIST
         if not hasattr(self, 'fig'):
-            self.fig = plt.figure(dpi=self.dpi)
+            self.fig = self.new_figure()
             self.ax = self.fig.add_subplot(111)
         # CREATE AN AX IF IT DOESN'T EXIST
         if not hasattr(self, 'ax'):
@@ -722,31 +864,11 @@ class BasePlotter:
 
     # %% ESTHETICS
     def format_colors(self):
-        # UPDATE SNS BACKGROUND SETTINGS
-        sns.color_palette(self.sns_palette)
-        sns.set_style(self.sns_style)
-        sns.set_context(self.sns_context)
-
-        # HANDLE DARKMODE
-        if self.darkmode:
-            self.line_color = 'white'
-            self.back_color = 'black'
-            sns.set_palette("muted")  # or "bright" or "pastel"
-        else:
-            sns.set_palette("deep")  # or "bright" or "pastel"
-
-        # TRANSLATE BACKGROUND COLOR TO TRANSPARENT IF TRANSPARENCY IS SET
-        self.back_color = to_rgb(self.back_color) + tuple([0]) if self.transparent else self.back_color
+        # HANDLE DARKMODE AND TRANSLATE BACKGROUND COLOR TO TRANSPARENT IF TRANSPARENCY IS SET
+        self.line_color, self.back_color = theme_colors(self.line_color, self.back_color, self.darkmode, self.transparent)
 
-        # SET ALL PLT DEFAULT COLORS BASED ON LINE AND BACK COLOR AND GRID_COLOR
-        plt.rcParams["figure.facecolor"] = self.back_color  # Background color of the plot
-        plt.rcParams["axes.facecolor"] = self.back_color  # Axes background color
-        plt.rcParams["axes.edgecolor"] = self.line_color  # Axes border color
-        plt.rcParams["axes.labelcolor"] = self.line_color  # Axis labels color
-        plt.rcParams['legend.facecolor'] = self.back_color  # Legend background
-        plt.rcParams["xtick.color"] = self.line_color  # X-axis tick color
-        plt.rcParams["ytick.color"] = self.line_color  # Y-axis tick color
-        plt.rcParams["grid.color"] = self.grid_color  # Gridline color
+        # LOOK UP THE CACHED SNS STYLE, CONTEXT, PALETTE AND PLT COLORS, APPLIED BY @themed AROUND EACH RENDER STEP
+        return theme_rc(self.sns_style, self.sns_context, self.darkmode, self.line_color, self.back_color, self.grid_color)
 
     # %% SAVE HELPER FUNCTION
     def save_name_autopopulated(self):
@@ -763,6 +885,7 @@ class BasePlotter:
 # GENERAL METHODS FOR CLASS HANDLING AND PLACEHOLDERS
 #-----------------------------------------------------------------------------------------------------------------------
     # %% PLACEHOLDER FOR CHILD CLASSES
+    @themed
     def just_plot(self,**kwargs):
         xlims = self.ax.get_xlim()
         ylims = self.ax.get_ylim()
@@ -777,6 +900,9 @@ class BasePlotter:
     def __getattr__(self, name):
         if name in self.__dict__:
             return self.__dict__[name]
+        # SETTINGS NOT OVERRIDDEN ON THE INSTANCE ARE READ THROUGH THE SETTINGS LAYERS
+        settings = self.__dict__.get('settings')
+        if settings is not None and name in settings: return settings[name]
         for base in type(self).mro():
             if name in base.__dict__:
                 return base.__dict__[name].__get__(self)
@@ -859,25 +985,29 @@ class BasePlotter:
     def set_xlines(self,xlines):
         if not isinstance(xlines,list): xlines = [xlines]
         for line in self.internal_xlines: line.remove()
-        self.internal_xlines = []
+        self.internal_xlines,self.spec_xlines = [],[]
         self.xlines = xlines
-        self.plot_xline_yline()
+        self.draw_xlines_ylines(xlines,[None],1)
+        self.mark_stage_clean('xlines')
     def set_ylines(self,ylines):
         if not isinstance(ylines, list): ylines = [ylines]
         for line in self.internal_ylines: line.remove()
-        self.internal_ylines = []
+        self.internal_ylines,self.spec_ylines = [],[]
         self.ylines = ylines
-        self.plot_xline_yline()
+        self.draw_xlines_ylines([None],ylines,1)
+        self.mark_stage_clean('ylines')
     def add_xlines(self,xlines):
         if not isinstance(xlines, list): xlines = [xlines]
         if self.xlines[0] is None: self.xlines = xlines
-        else: self.xlines.extend(xlines)
+        else: self.xlines = self.xlines + xlines
         self.plot_xline_yline(xlines=xlines)
+        self.mark_stage_clean('xlines')
     def add_ylines(self,ylines):
         if not isinstance(ylines, list): ylines = [ylines]
         if self.ylines[0] is None: self.ylines = ylines
-        else: self.ylines.extend(ylines)
+        else: self.ylines = self.ylines + ylines
         self.plot_xline_yline(ylines=ylines)
+        self.mark_stage_clean('ylines')
     def get_xlines(self,*args,**kwargs):
         return self.internal_xlines
     def get_ylines(self,*args,**kwargs):
@@ -885,41 +1015,36 @@ class BasePlotter:
     def set_patches(self,*args,**kwargs):
         if not isinstance(args, list): args = list(args)
         for patch in self.internal_patches: patch.remove()
-        self.internal_patches = []
-        for arg in args:
-            temp_patch = self.ax.add_patch(arg)
-            self.internal_patches.append(temp_patch)
+        self.internal_patches,self.spec_patches = [],[]
+        self.add_patches(*args)
     def add_patches(self,*args,**kwargs):
+        # PATCHES BUILT OUTSIDE READYPLOT ARE DRAWN AS GIVEN, THEIR SPEC IS READ FROM THEM FOR COPIES
         if not isinstance(args, list): args = list(args)
         for arg in args:
+            spec = patch_spec(arg)
+            if spec is not None: self.spec_patches = self.spec_patches + [spec]
             self.ax.add_patch(arg)
-            self.internal_patches.append(arg)
+            self.internal_patches = self.internal_patches + [arg]
 
     def add_rectangle(self,*args,**kwargs):
         clip_on, kwargs = mini_kwarg_resolver('clip_on',True,kwargs)
         in_layout, kwargs = mini_kwarg_resolver('in_layout',True,kwargs)
 
-        rect = patches.Rectangle((args[0], args[1]), args[2], args[3], clip_on=clip_on,in_layout=in_layout, **kwargs)
-        self.ax.add_patch(rect)
-        self.internal_patches.append(rect)
+        rect = ArtistSpec('rectangle', ((args[0], args[1]), args[2], args[3]),
+                          {'clip_on': clip_on, 'in_layout': in_layout, **kwargs})
+        self.draw_spec(rect, 'patches')
     def add_circle(self,*args,**kwargs):
         if len(args) > 1: radius = args[1]
         else:
             radius = kwargs['radius']
             del kwargs['radius']
-        circle = patches.Circle(args[0], radius = radius, **kwargs)
-        self.ax.add_patch(circle)
-        self.internal_patches.append(circle)
+        self.draw_spec(ArtistSpec('circle', (args[0],), {'radius': radius, **kwargs}), 'patches')
     def add_polygon(self,*args,**kwargs):
-        poly = patches.Plygon(args[0], **kwargs)
-        self.ax.add_patch(poly)
-        self.internal_patches.append(poly)
+        self.draw_spec(ArtistSpec('polygon', (args[0],), kwargs), 'patches')
     def get_patches(self,*args,**kwargs):
         return self.internal_patches
     def add_line(self,*args,**kwargs):
-        line = mlines.Line2D(args[0],args[1],**kwargs)
-        temp_line = self.ax.add_line(line)
-        self.internal_lines.append(temp_line)
+        self.draw_spec(ArtistSpec('line', (args[0],args[1]), kwargs), 'lines')
     def get_lines(self,*args,**kwargs):
         return self.internal_lines
 
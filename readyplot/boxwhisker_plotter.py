@@ -5,13 +5,14 @@ A child class for the base plotter which produces box whisker plots with possibl
 @author: Shawn Pavey
 """
 # %% IMPORT PACKAGES
-import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from matplotlib.patches import Rectangle
 
 from .base_plotter import BasePlotter
-from .utils import check_labels_in_DF, match_rgba_to_color, find_closest
+from .themes import themed
+from .streaming import stream_frame
+from .utils import check_labels_in_DF, match_rgba_to_color, find_closest, replace_column
 
 #%%---------------------------------------------------------------------------------------------------------------------
 # CHILD CLASS MAIN
@@ -19,28 +20,29 @@ from .utils import check_labels_in_DF, match_rgba_to_color, find_closest
 # %% INITIALIZE CHILD CLASS
 class BoxWhiskerPlotter(BasePlotter):
     def __init__(self, input_dict,**kwargs):
+        # FOLD A CHUNKSIZE CSV INPUT INTO PER-GROUP STATISTICS INSTEAD OF LOADING EVERY ROW
+        if input_dict['chunksize'] is not None and input_dict['DF'] is None and input_dict['csv_path'] is not None:
+            input_dict['DF'], kwargs = stream_frame('boxwhisker', input_dict, kwargs)
         super().__init__(input_dict,**kwargs)
         self.plot_type = 'boxwhisker'
 
     # %% DEFINE PLOTTER, PREPARE INPUTS
+    @themed
     def just_plot(self,**kwargs):
         self.ensure_fig_ax_exist()
-        self.DF[self.xlab] = self.DF[self.xlab].astype(str)
+        self.encode_x()
         conflict_vars, defaults_list, inputs, input_keys, outputs = self.generate_resolver_lists(locals(), kwargs)
         DF,kwargs,boxprops,showfliers,showmeans,meanprops,palette,linecolor,linewidth, width,dodge,ax = outputs
         palette,boxprops,showfliers,showmeans,meanprops,linecolor,linewidth,width,dodge,ax = super().var_existence_check(
             inputs,input_keys,defaults_list, kwargs=kwargs)
         DF,xlab,ylab,zlab,dodge = self.label_prep(locals())
-        self.width = width
+        self.width, self.legend_palette = width, palette
 
         # %% PLOT WITH SEABORN
         for i,u in enumerate(self.unique):
             line_palette = self.plot_line_palette[i] if self.plot_line_palette else self.line_color
-            tempDF = DF.copy()
-            if self.plot_line_palette is not None:
-                for v in self.unique:
-                    tempDF[ylab],tempDF.loc[tempDF[zlab]==v,ylab] = (
-                        tempDF[ylab].astype(float),float("inf")) if v!=u else (tempDF[ylab],tempDF.loc[tempDF[zlab]==v,ylab])
+            tempDF = DF
+            if self.plot_line_palette is not None: tempDF = replace_column(DF, ylab, self.other_groups_to_inf(DF, ylab, i))
 
             sns.boxplot(
                 x=xlab, y=ylab, data=tempDF,
@@ -49,15 +51,15 @@ class BoxWhiskerPlotter(BasePlotter):
                 meanprops=meanprops,
                 palette=palette,linecolor=line_palette,
                 linewidth=linewidth, width=width,
-                dodge = dodge,ax=ax,legend=i==0,fill=not self.apply_color_lines_only,**kwargs)
+                dodge = dodge,ax=ax,legend=False,fill=not self.apply_color_lines_only,**kwargs)
 
             if self.plot_line_palette is None:
                 break
 
         # %% EXTRA PLOT EDITING
         if any(getattr(self, attr) is not None for attr in self.err_names): self.plot_errors(xlab, ylab, zlab)
-        self.legend_fixer(locals())
-        self.local_scatter(locals())
+        # A STREAMED FRAME HOLDS A SAMPLE PLUS THE MIN/MAX ROWS, NOT THE RAW POINTS, SO IT IS NOT SCATTERED OVER THE BOXES
+        if self.chunksize is None or self.csv_path is None: self.local_scatter(locals())
         if self.custom_x_label is None: self.ax.set_xlabel("")
         else: self.ax.set_xlabel(self.custom_x_label)
         super().just_plot()
@@ -67,7 +69,7 @@ class BoxWhiskerPlotter(BasePlotter):
 #-----------------------------------------------------------------------------------------------------------------------
     # %% LOAD ALL PARENT METHODS UNLESS THEY EXIST HERE
     def __getattr__(self, name):
-        super().__getattr__(name)
+        return super().__getattr__(name)
 
     # %% CUSTOM METHODS
     # %% FIX
@@ -96,43 +98,37 @@ class BoxWhiskerPlotter(BasePlotter):
         xlab,ylab,zlab = check_labels_in_DF(self.DF,self.xlab,self.ylab,self.zlab)
         (zlab,dodge) = (xlab,False) if zlab is None else (zlab,dodge)
 
-        plt.ylim(DF[ylab].min(), DF[ylab].max())
+        self.ax.set_ylim(DF[ylab].min(), DF[ylab].max())
 
         return DF,xlab,ylab,zlab,dodge
 
-    def legend_fixer(self,l):
-        ax,palette = l['ax'],l['palette']
-
-        handles, labels = ax.get_legend_handles_labels()
-
-        for i, handle in enumerate(handles):
-            if 'Rectangle' in str(handle):
-                if self.plot_line_palette:
-                    handle.set_edgecolor(self.plot_line_palette[i])
-                elif self.apply_color_lines_only:
-                    handle.set_edgecolor(palette[i])
-                else:
-                    handle.set_edgecolor(self.line_color)
+    def legend_handle(self,i,color):
+        # THE BOX PATCH SEABORN DRAWS FOR THIS GROUP (FILLS DESATURATED TO 0.75), EDGED LIKE THE GROUP'S LINES
+        if self.plot_line_palette: edge_color = self.plot_line_palette[i]
+        elif self.apply_color_lines_only: edge_color = color
+        else: edge_color = self.line_color
+        face_color = 'none' if self.apply_color_lines_only else sns.desaturate(color, .75)
+        return Rectangle((0,0), 0, 0, facecolor=face_color, edgecolor=edge_color, linewidth=self.def_line_w)
 
     def local_scatter(self,l):
         palette,xlab,ylab,zlab,dodge,ax = l['palette'],l['xlab'],l['ylab'],l['zlab'],l['dodge'],l['ax']
 
+        unique = self.group_index().unique
         dark_palette = []
-        for i in range(len(self.DF[self.zlab].unique())):
+        for i in range(len(unique)):
             dark_palette.append(self.line_color)
         if self.apply_color_lines_only:
             dark_palette = palette
         elif self.plot_line_palette:
             dark_palette = self.plot_line_palette
 
-        for i, category in enumerate(self.DF[self.zlab].unique()):
-            df_copy = self.DF.copy()
-            df_copy.loc[df_copy[self.zlab] != category, self.ylab] = np.nan
+        for i, category in enumerate(unique):
+            df_copy = replace_column(self.DF, self.ylab, self.only_group(self.DF, self.ylab, i))
 
             sns.stripplot(
                 data=df_copy, x=xlab, y=ylab, hue=zlab,
                 dodge=dodge, palette=dark_palette,
                 marker=self.marker_dict[category], ax=ax, size=3, legend=False)
 
-        plt.xlabel(" ")
+        self.ax.set_xlabel(" ")
     
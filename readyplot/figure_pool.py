@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A figure pool file, figure_pool, which keeps cleared off-screen figures (their Agg canvas and renderer included) keyed by
+figure size, dpi and figure kwargs, so long-running batch jobs reuse a few figures instead of allocating one per plot
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+import threading
+from collections import OrderedDict
+from matplotlib import rcParams
+from .utils import agg_figure
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# FIGURE POOL
+#-----------------------------------------------------------------------------------------------------------------------
+class FigurePool:
+    """
+    Pass as figure_pool=FigurePool() to any plotter or subplots. Plotters take their figure from the pool instead of
+    creating one, and close() (or auto_close=True, or leaving a with block) clears it and hands it back. Pooled figures
+    are never registered with pyplot. At most max_idle cleared figures are kept, the least recently released go first.
+    The axes are rebuilt on every use, only the figure, its canvas and its renderer are reused.
+    """
+    def __init__(self, max_idle=4):
+        self.max_idle = max_idle
+        self.idle = OrderedDict()
+        self.lock = threading.Lock()
+
+    # %% A CLEARED FIGURE FOR THIS SIZE, DPI AND FIGURE KWARGS, REUSED IF ONE IS IDLE
+    def acquire(self, figsize=None, dpi=None, **kwargs):
+        key = pool_key(figsize, dpi, kwargs)
+        with self.lock:
+            figures = self.idle.get(key)
+            fig = figures.pop() if figures else None
+            if figures == []: del self.idle[key]
+        if fig is None:
+            fig = agg_figure(figsize=figsize, dpi=dpi, **kwargs)
+            fig.pool_key = key
+            return fig
+
+        # BACK TO THE SIZE, DPI AND (THEMED) COLORS A NEW FIGURE WOULD GET
+        fig.set_dpi(dpi or rcParams['figure.dpi'])
+        fig.set_size_inches(figsize or rcParams['figure.figsize'])
+        fig.set_facecolor(kwargs.get('facecolor', rcParams['figure.facecolor']))
+        fig.set_edgecolor(kwargs.get('edgecolor', rcParams['figure.edgecolor']))
+        return fig
+
+    # %% CLEAR A FIGURE AND KEEP IT FOR THE NEXT ACQUIRE WITH THE SAME KEY
+    def release(self, fig):
+        fig.clf()
+        with self.lock:
+            figures = self.idle.setdefault(fig.pool_key, [])
+            if fig not in figures: figures.append(fig)
+            self.idle.move_to_end(fig.pool_key)
+            while sum(len(figures) for figures in self.idle.values()) > self.max_idle:
+                key, figures = next(iter(self.idle.items()))
+                figures.pop(0)
+                if not figures: del self.idle[key]
+
+    def clear(self):
+        with self.lock: self.idle.clear()
+
+    def __len__(self):
+        return sum(len(figures) for figures in self.idle.values())
+
+    # %% A POOL IS COPIED WITH PLOT SETTINGS (E.G. PICKLED FOR A WORKER) AS A NEW EMPTY POOL
+    def __reduce__(self):
+        return (FigurePool, (self.max_idle,))
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# METHODS
+#-----------------------------------------------------------------------------------------------------------------------
+def pool_key(figsize, dpi, kwargs):
+    return (None if figsize is None else tuple(figsize), dpi, repr(sorted(kwargs.items())))
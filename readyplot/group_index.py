@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A group index file, group_index, which factorizes a plotter's zlab column (and on request xlab x zlab) once into group
+codes and row positions, so every plotting stage selects a group's rows by position instead of masking the full frame
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+import numpy as np
+import pandas as pd
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# METHODS
+#-----------------------------------------------------------------------------------------------------------------------
+# %% ROW POSITIONS PER CODE (ASCENDING WITHIN EACH CODE), ROWS WITH A NEGATIVE CODE BELONG TO NO GROUP
+def split_rows(codes, count):
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(count + 1))
+    return [order[bounds[i]:bounds[i + 1]] for i in range(count)]
+
+def factorize_column(DF, label):
+    # GROUPS IN ORDER OF FIRST APPEARANCE (THE SAME ORDER AS .unique()), A MISSING COLUMN IS ONE GROUP OF EVERY ROW
+    if label is None or label not in DF.columns: return np.zeros(len(DF), dtype=np.intp), [label], False
+    codes, uniques = pd.factorize(DF[label], sort=False, use_na_sentinel=False)
+    return codes, list(np.asarray(uniques)), True
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# GROUP INDEX
+#-----------------------------------------------------------------------------------------------------------------------
+class GroupIndex:
+    """
+    unique lists the zlab groups, codes gives each row's position in unique and rows[i] the row positions of unique[i].
+    grouped is False when zlab is not a column of DF, then every row is in the single group [zlab].
+    """
+    def __init__(self, DF, xlab, zlab):
+        self.DF, self.xlab, self.zlab = DF, xlab, zlab
+        self.key = (id(DF), len(DF), xlab, zlab)
+        self.codes, self.unique, self.grouped = factorize_column(DF, zlab)
+        self.rows = split_rows(self.codes, len(self.unique))
+        self.cell_rows, self.cell_dtype = None, None
+
+    # %% BOOLEAN MASK OF GROUP i, BUILT FROM ITS ROW POSITIONS
+    def mask(self, i):
+        mask = np.zeros(len(self.codes), dtype=bool)
+        mask[self.rows[i]] = True
+        return mask
+
+    # %% GROUPS IN SEABORN'S HUE ORDER: THE CATEGORIES OF A CATEGORICAL, SORTED IF NUMERIC, OTHERWISE AS THEY APPEAR
+    def hue_order(self):
+        values = self.DF[self.zlab]
+        if isinstance(values.dtype, pd.CategoricalDtype): return list(values.cat.categories)
+        levels = [u for u in self.unique if not pd.isna(u)]
+        return sorted(levels) if pd.api.types.is_numeric_dtype(values) else levels
+
+    # %% ROW POSITIONS PER (XLAB VALUE, ZLAB GROUP) CELL, BUILT ON FIRST USE AND AGAIN IF XLAB WAS RECAST IN PLACE
+    def cells(self):
+        dtype = self.DF[self.xlab].dtype if self.xlab in self.DF.columns else None
+        if self.cell_rows is None or dtype != self.cell_dtype:
+            x_codes, x_unique, _ = factorize_column(self.DF, self.xlab)
+            count = len(self.unique)
+            rows = split_rows(x_codes * count + self.codes, len(x_unique) * count)
+            self.cell_rows = {(x_unique[c // count], self.unique[c % count]): r for c, r in enumerate(rows) if len(r)}
+            self.cell_dtype = dtype
+        return self.cell_rows
@@ -7,6 +7,9 @@ A child class for the base plotter which produces histograms
 # %% IMPORT PACKAGES
 import seaborn as sns
 from .base_plotter import BasePlotter
+from .themes import themed
+from .streaming import stream_frame
+from .sql_source import sql_frame
 from .utils import check_labels_in_DF
 import matplotlib.pyplot as plt
 
@@ -16,14 +19,22 @@ import matplotlib.pyplot as plt
 # %% INITIALIZE CHILD CLASS
 class HistPlotter(BasePlotter):
     def __init__(self, input_dict,**kwargs):
+        # FOLD A CHUNKSIZE CSV INPUT INTO PER-GROUP STATISTICS INSTEAD OF LOADING EVERY ROW
+        if input_dict['chunksize'] is not None and input_dict['DF'] is None and input_dict['csv_path'] is not None:
+            input_dict['DF'], kwargs = stream_frame('hist', input_dict, kwargs)
+        # PUSH THE AGGREGATION INTO THE DATABASE FOR SQL INPUTS
+        elif input_dict['sql'] is not None and input_dict['DF'] is None:
+            input_dict['DF'], kwargs = sql_frame('hist', input_dict, kwargs)
         super().__init__(input_dict,**kwargs)
         self.plot_type = 'hist'
 
     # %% DEFINE PLOTTER, PREPARE INPUTS
+    @themed
     def just_plot(self,**kwargs):
         self.ensure_fig_ax_exist()
         kwargs, DF, palette, ax, legend = self.generate_resolver_lists(locals(), kwargs)
         xlab, ylab, zlab, palette = self.label_prep(locals())
+        self.legend_palette = palette
 
         print(kwargs)
 
@@ -31,7 +42,7 @@ class HistPlotter(BasePlotter):
         sns.histplot(
             x=xlab,y=ylab, data=DF,
             hue=zlab, palette=palette,
-            ax=ax, fill=not self.apply_color_lines_only,**kwargs)
+            ax=ax, fill=not self.apply_color_lines_only,legend=False,**kwargs)
 
         # %% EXTRA PLOT EDITING
         if any(getattr(self, attr) is not None for attr in self.err_names): self.plot_errors(xlab, ylab, zlab)
@@ -41,7 +52,7 @@ class HistPlotter(BasePlotter):
 #-----------------------------------------------------------------------------------------------------------------------
     # %% LOAD ALL PARENT METHODS UNLESS THEY EXIST HERE
     def __getattr__(self, name):
-        super().__getattr__(name)
+        return super().__getattr__(name)
 
     # %% CUSTOM METHODS
     def generate_resolver_lists(self,l,kwargs):
@@ -6,7 +6,11 @@ A child class for the base plotter which produces line plots
 """
 #%% IMPORT PACKAGES
 import seaborn as sns
+import matplotlib
+from matplotlib.lines import Line2D
 from .base_plotter import BasePlotter
+from .artist_specs import style_dashes
+from .themes import themed
 from .utils import check_labels_in_DF
 
 #%%---------------------------------------------------------------------------------------------------------------------
@@ -20,24 +24,27 @@ class LinePlotter(BasePlotter):
         self.markers = [False] if self.markers == False else self.markers
 
     # %% DEFINE PLOTTER, PREPARE INPUTS
+    @themed
     def just_plot(self,**kwargs):
         self.ensure_fig_ax_exist()
         conflict_vars,defaults_list,inputs,input_keys,outputs = self.generate_resolver_lists(locals(),kwargs)
         DF, kwargs, palette, style, markers, ax, estimator = outputs
         palette, style, markers, ax, estimator = super().var_existence_check(inputs,input_keys,defaults_list, kwargs=kwargs)
         xlab,ylab,zlab = self.label_prep(locals())
+        self.legend_palette = palette
 
         # %% PLOT WITH SEABORN
+        legend = self.seaborn_legend(style, zlab, kwargs)
         if zlab is None:
             sns.lineplot(
                 x=xlab, y=ylab, data=DF, hue=zlab,
                 color=palette[0], style=style, markers=markers,
-                ax=ax, estimator=estimator, **kwargs)
+                ax=ax, estimator=estimator, legend=legend, **kwargs)
         else:
             sns.lineplot(
                 x=xlab, y=ylab, data=DF, hue=zlab,
                 palette=palette, style=style, markers=markers,
-                ax=ax, estimator=estimator, **kwargs)
+                ax=ax, estimator=estimator, legend=legend, **kwargs)
 
         # %% EXTRA PLOT EDITING
         if any(getattr(self, attr) is not None for attr in self.err_names): self.plot_errors(xlab, ylab, zlab)
@@ -47,7 +54,7 @@ class LinePlotter(BasePlotter):
 #-----------------------------------------------------------------------------------------------------------------------
     # %% LOAD ALL PARENT METHODS UNLESS THEY EXIST HERE
     def __getattr__(self, name):
-        super().__getattr__(name)
+        return super().__getattr__(name)
 
     # %% CUSTOM METHODS
     # %% FIX
@@ -65,3 +72,10 @@ class LinePlotter(BasePlotter):
     def label_prep(self, l):
         xlab, ylab, zlab = check_labels_in_DF(self.DF, self.xlab, self.ylab, self.zlab)
         return xlab, ylab, zlab
+
+    def legend_handle(self,i,color):
+        # SEABORN'S LINE FOR THIS GROUP, ITS DASHES AND MARKER FOLLOW THE STYLE ORDER
+        marker = self.markers[i % len(self.markers)] or ''
+        return Line2D([], [], color=color, linewidth=matplotlib.rcParams['lines.linewidth'],
+                      dashes=style_dashes(i), marker=marker, markersize=matplotlib.rcParams['lines.markersize'],
+                      markerfacecolor=color, markeredgecolor='w', markeredgewidth=.75)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A loader file, loaders, which reads csv/excel/parquet/feather/arrow inputs into data frames and caches them so repeated plots of the same
+file only pay for one parse
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+import os
+import io
+import hashlib
+from collections import OrderedDict
+import pandas as pd
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# LOADER CACHE
+#-----------------------------------------------------------------------------------------------------------------------
+# %% IN-PROCESS LRU WITH A BYTE BUDGET AND AN OPTIONAL ON-DISK COLUMNAR SIDECAR FOR WARM STARTS IN LATER PROCESSES
+class LoaderCache:
+    def __init__(self, max_bytes=512 * 2**20, sidecar_dir=None):
+        self.max_bytes = max_bytes
+        self.sidecar_dir = sidecar_dir
+        self.frames = OrderedDict()
+        self.frame_bytes = {}
+        self.total_bytes = 0
+
+    def get(self, key):
+        # RETURN THE CACHED DATA FRAME AND MARK IT AS MOST RECENTLY USED, NONE IF IT IS NOT CACHED
+        if key not in self.frames: return None
+        self.frames.move_to_end(key)
+        return self.frames[key]
+
+    def put(self, key, DF):
+        # DATA FRAMES LARGER THAN THE WHOLE BUDGET ARE NEVER HELD IN MEMORY (THE SIDECAR CAN STILL SERVE THEM)
+        nbytes = int(DF.memory_usage(index=True, deep=True).sum())
+        if nbytes > self.max_bytes: return
+        if key in self.frames: self.discard(key)
+        self.frames[key] = DF
+        self.frame_bytes[key] = nbytes
+        self.total_bytes += nbytes
+
+        # EVICT LEAST RECENTLY USED FRAMES UNTIL THE BUDGET IS RESPECTED AGAIN
+        while self.total_bytes > self.max_bytes: self.discard(next(iter(self.frames)))
+
+    def discard(self, key):
+        del self.frames[key]
+        self.total_bytes -= self.frame_bytes.pop(key)
+
+    def clear(self):
+        self.frames.clear()
+        self.frame_bytes.clear()
+        self.total_bytes = 0
+
+    # %% SIDECAR HANDLING, PARQUET NEEDS PYARROW (OR FASTPARQUET) SO ANY FAILURE SIMPLY SKIPS THE SIDECAR
+    def sidecar_path(self, key):
+        if self.sidecar_dir is None: return None
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.sidecar_dir, digest + '.parquet')
+
+    def read_sidecar(self, key):
+        path = self.sidecar_path(key)
+        if path is None or not os.path.exists(path): return None
+        try: return pd.read_parquet(path)
+        except Exception: return None
+
+    def write_sidecar(self, key, DF):
+        path = self.sidecar_path(key)
+        if path is None: return
+        try:
+            os.makedirs(self.sidecar_dir, exist_ok=True)
+            DF.to_parquet(path + '.tmp')
+            os.replace(path + '.tmp', path)
+        except Exception:
+            if os.path.exists(path + '.tmp'): os.remove(path + '.tmp')
+
+CACHE = LoaderCache()
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# METHODS
+#-----------------------------------------------------------------------------------------------------------------------
+# %% CONFIGURE OR EMPTY THE SHARED CACHE
+def set_cache_options(max_bytes=None, sidecar_dir=False):
+    """
+    Sets the in-memory byte budget and/or the sidecar directory (None turns the sidecar off) of the loader cache.
+    """
+    if max_bytes is not None:
+        CACHE.max_bytes = max_bytes
+        while CACHE.total_bytes > CACHE.max_bytes: CACHE.discard(next(iter(CACHE.frames)))
+    if sidecar_dir is not False: CACHE.sidecar_dir = sidecar_dir
+
+def clear_cache():
+    CACHE.clear()
+
+# %% BUILD A KEY THAT CHANGES WHENEVER THE FILE CONTENT CAN HAVE CHANGED
+def file_key(path, sheet_name=None):
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size, sheet_name
+
+# %% RESOLVE THE COLUMNS A PLOT WILL TOUCH BEFORE ANY FILE IS READ
+ERROR_NAMES = ['xerror_vals','yerror_vals','low_xerror_vals','hi_xerror_vals','low_yerror_vals','hi_yerror_vals']
+
+def needed_columns(input_dict):
+    """
+    Returns the xlab/ylab/zlab and error-bar column names requested in input_dict, or None if the plot may need every
+    column. Projection only happens when all of xlab, ylab and zlab are passed (None is allowed), because the label
+    defaults otherwise depend on how many columns the file has.
+    """
+    if any(lab not in input_dict for lab in ['xlab', 'ylab', 'zlab']): return None
+    err_names = input_dict.get('err_names', ERROR_NAMES)
+    columns = [input_dict[lab] for lab in ['xlab', 'ylab', 'zlab'] if input_dict[lab] is not None]
+    columns.extend(input_dict[name] for name in err_names if isinstance(input_dict.get(name), str))
+    return list(dict.fromkeys(columns))
+
+def pyarrow_available():
+    from importlib.util import find_spec
+    return find_spec('pyarrow') is not None
+
+# %% DETECT ARROW-BACKED FILE FORMATS FROM THE FILE SUFFIX
+ARROW_SUFFIXES = {'.parquet': 'parquet', '.pq': 'parquet', '.feather': 'feather', '.arrow': 'ipc', '.ipc': 'ipc'}
+
+def arrow_format(path):
+    return ARROW_SUFFIXES.get(os.path.splitext(str(path))[1].lower())
+
+# %% READ A PARQUET/FEATHER/ARROW IPC FILE MEMORY-MAPPED, PUSHING THE COLUMN PROJECTION AND GROUP FILTER DOWN
+def read_arrow_file(path, file_format, usecols=None, group_col=None, groups=None):
+    try:
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+    except ImportError:
+        raise ImportError("Reading parquet, feather or arrow files requires pyarrow: pip install pyarrow")
+
+    # THE DATASET API SKIPS PARQUET ROW GROUPS (AND IPC RECORD BATCHES) WHOSE STATISTICS CANNOT MATCH THE FILTER
+    dataset = ds.dataset(os.path.abspath(path), format=file_format, filesystem=fs.LocalFileSystem(use_mmap=True))
+    columns = None if usecols is None else [col for col in dataset.schema.names if col in set(usecols)]
+    row_filter = None if groups is None else ds.field(group_col).isin(groups)
+    return dataset.to_table(columns=columns, filter=row_filter).to_pandas()
+
+# %% READ A FILE FROM SCRATCH, ARROW FORMATS IF GIVEN, CSV IF '.csv' IS IN THE NAME, OTHERWISE EXCEL
+def read_file(path, sheet_name=None, usecols=None, dtypes=None, engine=None, file_format=None, group_col=None,
+              groups=None):
+    if dtypes is not None and usecols is not None: dtypes = {k: v for k, v in dtypes.items() if k in usecols}
+    if file_format is not None:
+        DF = read_arrow_file(path, file_format, usecols=usecols, group_col=group_col, groups=groups)
+        return DF.astype(dtypes) if dtypes else DF
+    elif '.csv' in str(path):
+        # THE PYARROW ENGINE IS OPTIONAL AND DOES NOT ACCEPT CALLABLE USECOLS, SO RESOLVE NAMES FROM THE HEADER
+        if engine == 'pyarrow' and not pyarrow_available(): engine = None
+        if usecols is not None and engine == 'pyarrow':
+            usecols = [col for col in pd.read_csv(path, nrows=0).columns if col in usecols]
+        elif usecols is not None:
+            wanted = set(usecols)
+            usecols = lambda col: col in wanted
+        DF = pd.read_csv(path, usecols=usecols, dtype=dtypes, engine=engine)
+    else:
+        if usecols is not None:
+            wanted = set(usecols)
+            usecols = lambda col: col in wanted
+        DF = pd.read_excel(path, sheet_name=0 if sheet_name is None else sheet_name, usecols=usecols, dtype=dtypes)
+
+    # TEXT AND SPREADSHEET FORMATS CANNOT FILTER WHILE READING, SO DROP UNWANTED GROUPS RIGHT AFTER
+    return DF if groups is None else select_from_frame(DF, group_col=group_col, groups=groups)
+
+# %% PROJECT, RECAST AND FILTER AN ALREADY LOADED DATA FRAME
+def select_from_frame(DF, usecols=None, dtypes=None, group_col=None, groups=None):
+    if usecols is not None: DF = DF[[col for col in DF.columns if col in set(usecols)]]
+    if dtypes: DF = DF.astype({k: v for k, v in dtypes.items() if k in DF.columns})
+    if groups is not None: DF = DF[DF[group_col].isin(groups)].reset_index(drop=True)
+    return DF
+
+# %% READ SEVERAL (OR ALL) SHEETS OF ONE WORKBOOK IN A SINGLE PASS, CACHING EACH SHEET FOR LATER SINGLE-SHEET CALLS
+def load_workbook(path, sheet_names=None, usecols=None, dtypes=None):
+    """
+    Returns {sheet name: data frame} for sheet_names (every sheet if None) from one pd.read_excel call.
+    """
+    dtype_key = repr(sorted(dtypes.items(), key=str)) if dtypes else None
+    excel_usecols = None
+    if usecols is not None:
+        wanted = set(usecols)
+        excel_usecols = lambda col: col in wanted
+    if dtypes is not None and usecols is not None: dtypes = {k: v for k, v in dtypes.items() if k in usecols}
+    DFs = pd.read_excel(path, sheet_name=sheet_names, usecols=excel_usecols, dtype=dtypes)
+
+    for sheet_name, DF in DFs.items():
+        CACHE.put(file_key(path, sheet_name) + (None if usecols is None else tuple(usecols), dtype_key, None), DF)
+    return {sheet_name: DF.copy() for sheet_name, DF in DFs.items()}
+
+# %% CONVERT POLARS/PYARROW/OTHER DATA FRAME LIBRARY OBJECTS WITHOUT MATERIALIZING UNUSED COLUMNS
+def is_frame_like(obj):
+    if isinstance(obj, pd.DataFrame): return False
+    return hasattr(obj, '__dataframe__') or (hasattr(obj, '__arrow_c_stream__') and hasattr(obj, 'schema'))
+
+def frame_from_interchange(obj, usecols=None):
+    """
+    Converts any object implementing the Arrow C stream interface or the data frame interchange protocol to a pandas
+    data frame holding only the usecols columns (all columns if None). The Arrow path is preferred when pyarrow is
+    installed because numeric columns without nulls are then handed over without copying.
+    """
+    if hasattr(obj, '__arrow_c_stream__') and pyarrow_available():
+        import pyarrow as pa
+        table = obj if isinstance(obj, pa.Table) else pa.table(obj)
+        if usecols is not None: table = table.select([col for col in table.column_names if col in set(usecols)])
+        return table.to_pandas(split_blocks=True)
+
+    interchange = obj.__dataframe__(allow_copy=True)
+    if usecols is not None:
+        interchange = interchange.select_columns_by_name(
+            [col for col in interchange.column_names() if col in set(usecols)])
+    return pd.api.interchange.from_dataframe(interchange, allow_copy=True)
+
+# %% READ A FILE THROUGH THE CACHE
+def load_table(path, sheet_name=None, usecols=None, dtypes=None, engine=None, file_format=None, group_col=None,
+               groups=None):
+    """
+    Loads a csv, excel, parquet, feather or arrow IPC file into a data frame, parsing it at most once per
+    (path, mtime, size, sheet, columns, dtypes, groups).
+    usecols limits the read to the named columns (missing names are ignored), dtypes is passed on as the dtype mapping
+    and engine='pyarrow' is used for csv files when pyarrow is installed. file_format ('parquet', 'feather' or 'ipc')
+    reads the file memory-mapped through pyarrow, where groups (values of group_col) are filtered during the scan.
+    A request is served from an already cached full read of the same file when one exists. A copy is returned so
+    plotters can add or recast columns without touching the cached frame.
+    """
+    if groups is not None and group_col is None: raise ValueError("groups= requires zlab to name the group column")
+    if isinstance(groups, str): groups = [groups]
+    if groups is not None: groups = list(groups)
+
+    base_key = file_key(path, sheet_name)
+    dtype_key = repr(sorted(dtypes.items(), key=str)) if dtypes else None
+    group_key = None if groups is None else (group_col, tuple(groups))
+    key = base_key + (None if usecols is None else tuple(usecols), dtype_key, group_key)
+    DF = CACHE.get(key)
+
+    # REUSE A CACHED FULL READ BY SELECTING THE REQUESTED COLUMNS AND GROUPS FROM IT
+    full = CACHE.get(base_key + (None, None, None))
+    if DF is None and full is not None:
+        DF = select_from_frame(full, usecols=usecols, dtypes=dtypes, group_col=group_col, groups=groups).copy()
+        DF.attrs['source_bytes'] = base_key[2]
+        return DF
+
+    # ARROW FORMATS ARE ALREADY COLUMNAR AND MEMORY-MAPPED, SO ONLY CSV AND EXCEL READS GET A SIDECAR
+    if DF is None:
+        DF = CACHE.read_sidecar(key) if file_format is None else None
+        if DF is None:
+            DF = read_file(path, sheet_name, usecols=usecols, dtypes=dtypes, engine=engine, file_format=file_format,
+                           group_col=group_col, groups=groups)
+            if file_format is None: CACHE.write_sidecar(key, DF)
+        CACHE.put(key, DF)
+
+    # REMEMBER HOW MANY BYTES OF THE FILE THE FRAME COVERS SO APPENDED ROWS CAN BE TAIL-READ LATER (SEE read_csv_tail)
+    DF = DF.copy()
+    DF.attrs['source_bytes'] = base_key[2]
+    return DF
+
+# %% READ ONLY THE COMPLETE LINES APPENDED TO A CSV FILE SINCE offset, A TRAILING PARTIAL LINE WAITS FOR THE NEXT CALL
+def read_csv_tail(path, offset, usecols=None, dtypes=None):
+    """
+    Returns (new rows, new offset) for the bytes written to path after offset, using the header of the file for the
+    column names. Returns (None, offset) when no complete line was appended.
+    """
+    with open(path, 'rb') as file:
+        file.seek(offset)
+        tail = file.read()
+    end = tail.rfind(b'\n') + 1
+    if end == 0 or not tail[:end].strip(): return None, offset
+
+    names = list(pd.read_csv(path, nrows=0).columns)
+    if usecols is not None: usecols = [col for col in names if col in set(usecols)]
+    if dtypes is not None: dtypes = {k: v for k, v in dtypes.items() if k in (usecols or names)}
+    DF = pd.read_csv(io.BytesIO(tail[:end]), header=None, names=names, usecols=usecols, dtype=dtypes)
+    return DF, offset + end
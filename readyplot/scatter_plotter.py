@@ -5,10 +5,12 @@ A child class for the base plotter which produces scatter plots with potential t
 @author: Shawn Pavey
 """
 # %% IMPORT PACKAGES
-import matplotlib.pyplot as plt
 import seaborn as sns
-import scipy.stats as stats
+import matplotlib
+from matplotlib.lines import Line2D
+from matplotlib.markers import MarkerStyle
 from .base_plotter import BasePlotter
+from .themes import themed
 from .utils import check_labels_in_DF
 
 #%%---------------------------------------------------------------------------------------------------------------------
@@ -21,18 +23,20 @@ class ScatterPlotter(BasePlotter):
         self.plot_type,self.trendline,self.show_r2 = 'scatter',input_dict['trendline'],input_dict['show_r2']
 
     # %% DEFINE PLOTTER, PREPARE INPUTS
+    @themed
     def just_plot(self,**kwargs):
         self.ensure_fig_ax_exist()
         conflict_vars,defaults_list,inputs,input_keys,outputs = self.generate_resolver_lists(locals(),kwargs)
         DF, kwargs, palette, style, markers, ax = outputs
         palette, style, markers, ax = super().var_existence_check(inputs,input_keys,defaults_list, kwargs=kwargs)
         xlab,ylab,zlab = self.label_prep(locals())
+        self.legend_palette = palette
 
         # %% PLOT WITH SEABORN
         sns.scatterplot(
             x=xlab, y=ylab, data=DF, hue=zlab,
             palette=palette, style=style, markers=markers,
-            ax=ax, **kwargs)
+            ax=ax, legend=self.seaborn_legend(style, zlab, kwargs), **kwargs)
 
         # %% EXTRA PLOT EDITING
         if any(getattr(self, attr) is not None for attr in self.err_names): self.plot_errors(xlab, ylab, zlab)
@@ -44,7 +48,7 @@ class ScatterPlotter(BasePlotter):
 #-----------------------------------------------------------------------------------------------------------------------
     # %% LOAD ALL PARENT METHODS UNLESS THEY EXIST HERE
     def __getattr__(self, name):
-        super().__getattr__(name)
+        return super().__getattr__(name)
 
     # %% CUSTOM METHODS
     # %% FIX
@@ -65,26 +69,32 @@ class ScatterPlotter(BasePlotter):
         return xlab, ylab, zlab
 
     def local_trendline(self,l):
-        g_counter = 0
+        groups = self.group_index()
 
-        for g in self.unique:
+        for g_counter, g in enumerate(self.unique):
             if self.trendline:
-
+                groupDF = self.DF.iloc[groups.rows[g_counter]]
                 sns.regplot(
-                    x=self.xlab, y=self.ylab, data=self.DF.loc[self.DF[self.zlab] == g],
+                    x=self.xlab, y=self.ylab, data=groupDF,
                     ci=None, color=self.colors[self.unique.index(g)],
                     scatter=False, ax=self.ax)
 
                 if self.show_r2:
-                    tempDF = self.DF.loc[self.DF[self.zlab] == g]
-                    x = tempDF[self.xlab].to_numpy()
-                    y = tempDF[self.ylab].to_numpy()
+                    # SCIPY IS ONLY LOADED WHEN AN R-SQUARED ANNOTATION IS ACTUALLY REQUESTED
+                    from scipy import stats
+                    x = groupDF[self.xlab].to_numpy()
+                    y = groupDF[self.ylab].to_numpy()
                     slope, intercept, r_value, p_value, std_err = stats.linregress(x.astype(float), y.astype(float))
                     r_squared = r_value ** 2
 
-                    plt.text(self.max_list_x[self.DF_counter] * self.annote_x_start,
-                             self.max_list_y[self.DF_counter] * (self.annote_y_start - 0.05 * g_counter),
-                             f"R-squared = {r_squared:.2f}",
-                             fontsize=int(0.75 * self.def_font_sz), color=self.colors[self.unique.index(g)])
+                    self.ax.text(self.max_list_x[self.DF_counter] * self.annote_x_start,
+                                 self.max_list_y[self.DF_counter] * (self.annote_y_start - 0.05 * g_counter),
+                                 f"R-squared = {r_squared:.2f}",
+                                 fontsize=int(0.75 * self.def_font_sz), color=self.colors[self.unique.index(g)])
 
-            g_counter += 1
\ No newline at end of file
+    def legend_handle(self,i,color):
+        # SEABORN'S SCATTER MARKER FOR THIS GROUP, EDGED IN WHITE WHEN THE MARKER IS FILLED
+        marker, size = self.markers[i % len(self.markers)], matplotlib.rcParams['lines.markersize']
+        edge = {'markeredgecolor': 'w'} if MarkerStyle(marker).is_filled() else {}
+        return Line2D([], [], linestyle='', marker=marker, markersize=size, color=color, markerfacecolor=color,
+                      markeredgewidth=.08 * size, **edge)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A settings file, settings, which declares every expected input with its default once, so initializing a plotter is a
+single pass over the user inputs instead of re-declaring and introspecting the defaults on every call
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+from collections import ChainMap
+from dataclasses import dataclass, field, fields, MISSING
+from .utils import dict_update_nested
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# SETTINGS SCHEMA, EVERY FIELD IS AN EXPECTED INPUT, EVERY OTHER INPUT IS A KWARG PASSED ON TO SEABORN
+#-----------------------------------------------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class Settings:
+    # GENERAL ESSENTIALS IN FRONT-END OR BACK-END
+    # Input Data
+    DF: object = None
+    x: object = None
+    y: object = None
+    z: object = None
+    excel_path: object = None
+    sheet_name: object = None
+    csv_path: object = None
+    parquet_path: object = None
+    feather_path: object = None
+    arrow_path: object = None
+    groups: object = None
+    dtypes: object = None
+    csv_engine: object = None
+    chunksize: object = None
+    sql: object = None
+    connection: object = None
+
+    # Groups (xlab,ylab,zlab are resolved per call by prepare_data_frame_col_names)
+    colors: list = field(default_factory=lambda: ['#199940', 'r', 'b', 'y', 'c', 'm', 'k', 'w'])
+    markers: list = field(default_factory=lambda: ['o', 's', 'D', 'p', 'h', '*', 'x', '+', '^', 'v', '>', '<'])
+    hatches: list = field(default_factory=lambda: ['....', '---', '//', '++', 'OO', '**'])
+    style: object = None
+
+    # Input Handles
+    input_fig: object = None
+    input_ax: object = None
+    plot_type: object = None
+    first_time_legend: bool = True
+    handles: object = None
+    labels: object = None
+
+    # Output Fig
+    folder_name: str = "OUTPUT_FIGURES"
+    dpi: int = 300
+    fig_width: int = 7
+    fig_height: int = 5
+    use_pyplot: bool = True
+    auto_close: bool = False
+    low_memory: bool = False
+    figure_pool: object = None
+
+    # ERRORS, GENERAL TEXT, ESTHETICS
+    # Errors
+    capsize: float = 0.4
+    yerror_vals: object = None
+    hi_yerror_vals: object = None
+    low_yerror_vals: object = None
+    xerror_vals: object = None
+    hi_xerror_vals: object = None
+    low_xerror_vals: object = None
+    err_names: list = field(default_factory=lambda: ['xerror_vals','yerror_vals','low_xerror_vals','hi_xerror_vals',
+                                                     'low_yerror_vals','hi_yerror_vals'])
+    error_lim_affect: bool = False
+
+    # General Text
+    custom_x_label: object = None
+    custom_y_label: object = None
+    title: object = None
+    def_font_sz: int = 16
+    fontweight: str = 'bold'
+
+    # General Esthetics
+    line_color: str = 'black'
+    back_color: str = 'white'
+    darkmode: bool = False
+    apply_color_lines_only: bool = False
+    transparent: bool = False
+    sns_palette: str = "deep"
+    sns_style: str = "ticks"
+    sns_context: str = "notebook"
+    grid_color: str = "#444444"
+
+    # AXIS-RELATED SETTINGS
+    # Lines & Axes
+    box_edges: list = field(default_factory=lambda: ['bottom', 'left'])
+    def_line_w: float = 1.5
+    xtick_font_ratio: int = 1
+    ytick_font_ratio: int = 1
+    x_axis_sig_figs: int = 3
+    y_axis_sig_figs: int = 3
+
+    # Scientific Notation
+    x_exp_location: int = 0
+    y_exp_location: int = 0
+    low_x_cap0: bool = False
+    low_y_cap0: bool = False
+    sci_x_lims: tuple = (-1,3)
+    sci_y_lims: tuple = (-1,3)
+
+    # XLines and YLines, plus the annotation specs copies of a plot replay
+    xlines: list = field(default_factory=lambda: [None])
+    ylines: list = field(default_factory=lambda: [None])
+    spec_xlines: list = field(default_factory=list)
+    spec_ylines: list = field(default_factory=list)
+    spec_patches: list = field(default_factory=list)
+    spec_lines: list = field(default_factory=list)
+
+    # NICHE FEATURES GENERALLY PLOT-TYPE DEPENDENT
+    # Legend Tool for Strip-Plot Overlay
+    handles_in_legend: int = 10
+
+    # Bar and Box Features
+    dodge: bool = True
+    box_width: float = 0.8
+    plot_line_palette: object = None
+
+    # Trendline
+    trendline: bool = False
+    show_r2: bool = False
+    annote_x_start: float = 0.7
+    annote_y_start: float = 0.7
+
+    # DICTIONARIES TO PASS AS KWARGS TO OTHER PACKAGES
+    # Grouped Kwargs
+    legend: object = None
+    legend_kwargs: dict = field(default_factory=lambda: {'prop': {'weight': 'bold'}, 'framealpha': 1})
+    trendline_kwargs: object = None
+    xylines_kwargs: object = None
+
+
+# %% PRECOMPUTED ONCE AT IMPORT: KNOWN KEYS, IMMUTABLE DEFAULTS AND FACTORIES FOR THE MUTABLE (LIST/DICT) DEFAULTS
+LABELS = ('xlab', 'ylab', 'zlab')
+KNOWN_KEYS = frozenset([f.name for f in fields(Settings)] + list(LABELS))
+CONSTANT_DEFAULTS = {f.name: f.default for f in fields(Settings) if f.default is not MISSING}
+DEFAULT_FACTORIES = {f.name: f.default_factory for f in fields(Settings) if f.default_factory is not MISSING}
+NESTED_KWARGS = frozenset(['legend_kwargs', 'custom_error_kwargs'])
+# INPUTS HOLDING DATA (ERROR INPUTS UNLESS THEY NAME A COLUMN), RELEASED AFTER A RENDER WITH low_memory=True
+DATA_INPUTS = ('DF', 'x', 'y', 'z', 'xerror_vals', 'yerror_vals', 'low_xerror_vals', 'hi_xerror_vals', 'low_yerror_vals',
+               'hi_yerror_vals')
+
+# %% SETTINGS EACH COSMETIC RENDER STAGE DEPENDS ON, A CHANGE TO ANY OTHER SETTING (EXCEPT THE RENDER STATE) REDRAWS THE DATA
+STAGE_SETTINGS = {
+    'figure': ('fig_width', 'fig_height', 'dpi'),
+    'xlines': ('xlines',),
+    'ylines': ('ylines',),
+    'post_format': ('title', 'custom_x_label', 'custom_y_label', 'legend_kwargs', 'handles_in_legend', 'box_edges',
+                    'xtick_font_ratio', 'ytick_font_ratio', 'x_exp_location', 'y_exp_location', 'sci_x_lims', 'sci_y_lims'),
+}
+# WRITTEN WHILE RENDERING OR ONLY USED WHEN SAVING OR CLOSING, ANNOTATION SPECS ARE DRAWN AS SOON AS THEY ARE ADDED
+RENDER_STATE = frozenset(['legend', 'handles', 'labels', 'first_time_legend', 'plot_type', 'folder_name',
+                          'auto_close', 'figure_pool', 'low_memory', 'spec_xlines', 'spec_ylines', 'spec_patches', 'spec_lines'])
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# METHODS
+#-----------------------------------------------------------------------------------------------------------------------
+# %% SORT USER INPUTS INTO A LAYERED SETTINGS OBJECT AND SEABORN KWARGS IN ONE PASS
+def resolve_settings(input_dict, labels):
+    """
+    Returns (settings, kwargs). Settings are layered as user input > imported_settings > defaults, where labels holds
+    the xlab/ylab/zlab defaults from prepare_data_frame_col_names. Nothing is copied from the imported settings or the
+    defaults. Nested kwarg dictionaries (legend_kwargs) are merged into their defaults instead of replacing them, DFs is
+    accepted as a legacy name for DF, and unknown inputs become kwargs.
+    """
+    imported = input_dict.get('imported_settings') or {}
+    user, kwargs = {}, {}
+
+    # USER INPUTS OVERRIDE EVERYTHING, NESTED KWARGS ARE MERGED RECURSIVELY INTO THEIR DEFAULTS
+    for name, value in input_dict.items():
+        if name in NESTED_KWARGS:
+            user[name] = dict_update_nested(DEFAULT_FACTORIES[name](), value) if name in DEFAULT_FACTORIES else value
+        elif name in KNOWN_KEYS: user[name] = value
+        elif name not in ['DFs', 'imported_settings']: kwargs[name] = value
+
+    # LEGACY CATCH, SOME PEOPLE MAY USE DFs INSTEAD OF DF AND THIS WILL CATCH THAT
+    if 'DFs' in input_dict: user['DF'] = input_dict['DFs']
+
+    # MUTABLE DEFAULTS ARE BUILT FRESH FOR EVERY PLOTTER, THE IMMUTABLE ONES ARE ONE SHARED LAYER
+    fresh = {name: factory() for name, factory in DEFAULT_FACTORIES.items()}
+    fresh.update(labels)
+    return LayeredSettings(user, imported, fresh, CONSTANT_DEFAULTS), kwargs
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# LAYERED SETTINGS
+#-----------------------------------------------------------------------------------------------------------------------
+# %% CHAINED LOOKUPS THROUGH THE LAYERS, WRITES ONLY EVER GO TO THE TOP LAYER
+class LayeredSettings(ChainMap):
+    """
+    A ChainMap of settings layers (top first) where hidden keys read as missing. Lower layers are shared, never
+    written to, so building a child or a snapshot only costs the size of the top layer.
+    """
+    def __init__(self, *maps, hidden=frozenset()):
+        super().__init__(*maps)
+        self.hidden = frozenset(hidden)
+
+    def __getitem__(self, key):
+        if key in self.hidden: return self.__missing__(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        return key not in self.hidden and super().__contains__(key)
+
+    def __iter__(self):
+        return (key for key in super().__iter__() if key not in self.hidden)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def new_child(self, m=None, **kwargs):
+        return self.__class__({} if m is None else m, *self.maps, hidden=self.hidden)
+
+    def copy(self):
+        return self.snapshot()
+    __copy__ = copy
+
+    def snapshot(self, overrides=None, hidden=()):
+        # COPY ONLY THE TOP LAYER (PLUS ANY OVERRIDES) SO LATER WRITES TO EITHER SIDE NEVER REACH THE OTHER, HIDDEN
+        # VALUES ARE LEFT OUT OF THE COPY SO A SNAPSHOT DOES NOT KEEP THE DATA OR FIGURE OF ITS SOURCE ALIVE
+        hidden = self.hidden | frozenset(hidden)
+        top = {key: value for key, value in {**self.maps[0], **(overrides or {})}.items() if key not in hidden}
+        return self.__class__(top, *self.maps[1:], hidden=hidden)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A sql source file, sql_source, which reads plot data from a table or query over any DB-API connection (or a sqlite file
+path), pushing bar statistics and histogram binning into the database so only the aggregates reach python
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+import sys
+import numpy as np
+import pandas as pd
+from .loaders import needed_columns, select_from_frame
+from .streaming import moments_to_frame, counts_to_frame
+
+# %% PLOT TYPES WHOSE AGGREGATION RUNS IN THE DATABASE, OTHERS FETCH THE PLOTTED ROWS (SEE sql_rows)
+PUSHDOWN_TYPES = ('bar', 'hist')
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# QUERY BUILDING
+#-----------------------------------------------------------------------------------------------------------------------
+# %% QUOTE AN IDENTIFIER THE STANDARD SQL WAY ("name", WITH EMBEDDED QUOTES DOUBLED)
+def quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+# %% A BARE NAME IS A TABLE, ANYTHING WITH WHITESPACE IS A QUERY THAT BECOMES A SUBQUERY
+def source_clause(sql):
+    sql = sql.strip().rstrip(';')
+    if not any(char.isspace() for char in sql): return quote(sql)
+    return f"({sql}) AS _readyplot_source"
+
+# %% PARAMETER PLACEHOLDER FOR THE DRIVER BEHIND A CONNECTION (sqlite3 USES ?, psycopg/mysql DRIVERS USE %s)
+def placeholder(connection):
+    driver = sys.modules.get(type(connection).__module__.split('.')[0])
+    return '%s' if getattr(driver, 'paramstyle', 'qmark') in ['format', 'pyformat'] else '?'
+
+# %% WHERE CLAUSE FOR NON-NULL VALUE COLUMNS AND AN OPTIONAL LIST OF GROUPS
+def where_clause(connection, not_null, group_col=None, groups=None):
+    conditions = [f"{quote(col)} IS NOT NULL" for col in not_null]
+    params = []
+    if groups is not None:
+        conditions.append(f"{quote(group_col)} IN ({', '.join([placeholder(connection)] * len(groups))})")
+        params = list(groups)
+    return (' WHERE ' + ' AND '.join(conditions) if conditions else ''), params
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# METHODS
+#-----------------------------------------------------------------------------------------------------------------------
+# %% OPEN A SQLITE FILE READ-ONLY WHEN A PATH IS GIVEN, OTHERWISE USE THE CONNECTION AS IS
+def open_connection(connection):
+    if isinstance(connection, str):
+        import sqlite3
+        from pathlib import Path
+        return sqlite3.connect(Path(connection).resolve().as_uri() + '?mode=ro', uri=True), True
+    if connection is None: raise ValueError("sql inputs need a connection (a DB-API connection or a sqlite file path)")
+    return connection, False
+
+def query(connection, sql, params=None):
+    return pd.read_sql_query(sql, connection, params=params or None)
+
+def source_columns(connection, source):
+    return list(query(connection, f"SELECT * FROM {source} WHERE 1 = 0").columns)
+
+# %% FETCH ONLY THE COLUMNS (AND GROUPS) A PLOT NEEDS, FOR PLOT TYPES THAT DRAW EVERY ROW
+def sql_rows(input_dict):
+    connection, owned = open_connection(input_dict.get('connection'))
+    try:
+        source = source_clause(input_dict['sql'])
+        header, usecols = source_columns(connection, source), needed_columns(input_dict)
+        columns = header if usecols is None else [col for col in header if col in usecols]
+        if not columns: raise ValueError(f"None of the labels {usecols} are columns of {input_dict['sql']!r}, found {header}")
+        groups, zlab = input_dict.get('groups'), input_dict.get('zlab')
+        where, params = where_clause(connection, [], zlab, groups) if groups is not None else ('', [])
+        DF = query(connection, f"SELECT {', '.join(quote(col) for col in columns)} FROM {source}{where}", params)
+    finally:
+        if owned: connection.close()
+    return select_from_frame(DF, dtypes=input_dict.get('dtypes'))
+
+# %% BUILD THE AGGREGATED FRAME (AND ADJUSTED SEABORN KWARGS) FOR A PLOT TYPE, MIRRORING streaming.stream_frame
+def sql_frame(plot_type, input_dict, kwargs):
+    connection, owned = open_connection(input_dict['connection'])
+    try:
+        source = source_clause(input_dict['sql'])
+        header = source_columns(connection, source)
+        xlab, ylab, zlab = input_dict['xlab'], input_dict['ylab'], input_dict['zlab']
+        zlab = zlab if zlab in header else None
+        groups = input_dict.get('groups') if zlab is not None else None
+
+        # 2D HISTOGRAMS AND PLOT TYPES WITHOUT A PUSHDOWN FETCH THE ROWS THEMSELVES
+        if plot_type == 'hist' and ylab not in header: DF, kwargs = sql_hist(connection, source, xlab, zlab, groups, kwargs)
+        elif plot_type == 'bar': DF, kwargs = sql_bar(connection, source, xlab, ylab, zlab, groups, kwargs)
+        else: DF = None
+    finally:
+        if owned: connection.close()
+    return (sql_rows(input_dict) if DF is None else DF), kwargs
+
+def sql_bar(connection, source, xlab, ylab, zlab, groups, kwargs):
+    group_cols = [xlab] if zlab is None else [xlab, zlab]
+    keys, y = ', '.join(quote(col) for col in group_cols), quote(ylab)
+    where, params = where_clause(connection, [], zlab, groups)
+
+    # GROUPS IN ORDER OF FIRST APPEARANCE LIKE EVERY OTHER INPUT, NULL VALUES ARE LEFT TO COUNT() AND SUM() SO A GROUP'S
+    # FIRST ROW COUNTS EVEN WITHOUT A VALUE (GROUPS WITHOUT ANY VALUE ARE DROPPED BY moments_to_frame)
+    rows = f"(SELECT *, ROW_NUMBER() OVER () AS _readyplot_row FROM {source}) AS _readyplot_rows"
+    stats = query(connection, f"SELECT {keys}, COUNT({y}) AS count, SUM({y}) AS sum, SUM({y} * {y}) AS sumsq "
+                              f"FROM {rows}{where} GROUP BY {keys} ORDER BY MIN(_readyplot_row)", params)
+    stats = stats.set_index(group_cols).astype(float)
+    errorbar = kwargs.get('errorbar', ('ci', 95))
+    DF = moments_to_frame(stats, xlab, ylab, zlab, errorbar)
+    if errorbar is not None: kwargs['errorbar'] = ('se', 1)
+    return DF, kwargs
+
+def sql_hist(connection, source, xlab, zlab, groups, kwargs):
+    x = quote(xlab)
+    bins = kwargs.pop('bins', 50)
+    binrange, binwidth = kwargs.pop('binrange', None), kwargs.pop('binwidth', None)
+    where, params = where_clause(connection, [xlab], zlab, groups)
+
+    # FIXED EDGES ARE NEEDED BEFORE COUNTING, SO THE DATABASE FINDS THE RANGE UNLESS EDGES OR RANGE ARE GIVEN
+    if np.ndim(bins) == 1: edges = np.asarray(bins, dtype=float)
+    else:
+        if binrange is None: low, high = query(connection, f"SELECT MIN({x}), MAX({x}) FROM {source}{where}", params).iloc[0]
+        else: low, high = binrange
+        low, high = float(low), float(high)
+        if binwidth is not None: edges = np.arange(low, high + binwidth, binwidth)
+        else: edges = np.linspace(low, high, (bins if isinstance(bins, int) else 50) + 1)
+
+    # UNEVEN EDGES ARE BUCKETED WITH A CASE LADDER, EVEN ONES ARITHMETICALLY, THE LAST BIN INCLUDES ITS RIGHT EDGE
+    nbins, bounds = len(edges) - 1, [float(edge) for edge in edges]
+    if np.allclose(np.diff(edges), edges[1] - edges[0]):
+        width = (bounds[-1] - bounds[0]) / nbins
+        bucket = (f"CASE WHEN {x} >= {bounds[-1]!r} THEN {nbins - 1} "
+                  f"ELSE CAST(({x} - {bounds[0]!r}) / {width!r} AS INTEGER) END")
+    else:
+        bucket = 'CASE ' + ' '.join(f"WHEN {x} < {edge!r} THEN {i}" for i, edge in enumerate(bounds[1:-1]))
+        bucket += f" ELSE {nbins - 1} END"
+    in_range = f"{x} >= {bounds[0]!r} AND {x} <= {bounds[-1]!r}"
+    where = where + (' AND ' if where else ' WHERE ') + in_range
+    keys = '' if zlab is None else f"{quote(zlab)}, "
+    rows = query(connection, f"SELECT {keys}{bucket} AS _bin, COUNT(*) AS _count FROM {source}{where} "
+                             f"GROUP BY {keys}_bin ORDER BY {keys}_bin", params)
+
+    # SCATTER THE SPARSE (GROUP, BIN) COUNTS INTO ONE DENSE COUNT ARRAY PER GROUP
+    counts = {}
+    for key, group in (rows.groupby(zlab, sort=False) if zlab is not None else [(None, rows)]):
+        bins = np.minimum(group['_bin'].to_numpy(dtype=int), nbins - 1)
+        counts[key] = np.bincount(bins, weights=group['_count'].to_numpy(dtype=float), minlength=nbins).astype(np.int64)
+    kwargs['bins'], kwargs['weights'] = list(edges), '_count'
+    return counts_to_frame(counts, edges, xlab, zlab), kwargs
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A streaming file, streaming, which folds csv files that do not fit in memory chunk by chunk into small mergeable
+statistics per group, and expands those statistics into compact data frames the bar, box and hist plotters can render
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+from .loaders import ERROR_NAMES, select_from_frame
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# MERGEABLE REDUCERS, EACH FOLDS ONE CHUNK AT A TIME WITH update() AND KEEPS GROUPS IN ORDER OF FIRST APPEARANCE
+#-----------------------------------------------------------------------------------------------------------------------
+# %% COUNT, SUM AND SUM OF SQUARES PER GROUP (BARS)
+class MomentReducer:
+    def __init__(self, value_col, group_cols):
+        self.value_col, self.group_cols = value_col, group_cols
+        self.stats = None
+
+    def update(self, chunk):
+        values = chunk[self.value_col].astype(float)
+        frame = pd.DataFrame({'count': values.notna().astype(np.int64), 'sum': values.fillna(0),
+                              'sumsq': values.fillna(0) ** 2})
+        part = frame.groupby([chunk[col] for col in self.group_cols], sort=False).sum()
+        self.merge(part)
+
+    def merge(self, part):
+        if self.stats is None:
+            self.stats = part
+            return
+        order = self.stats.index.append(part.index[~part.index.isin(self.stats.index)])
+        self.stats = self.stats.add(part, fill_value=0).reindex(order)
+
+# %% UNIFORM BOTTOM-K SAMPLE PER GROUP PLUS EXACT MIN AND MAX, A MERGEABLE QUANTILE SKETCH (BOXES)
+class SampleReducer:
+    def __init__(self, value_col, group_cols, size=4096, seed=0):
+        self.value_col, self.group_cols, self.size = value_col, group_cols, size
+        self.rng = np.random.default_rng(seed)
+        self.samples = {}
+
+    def update(self, chunk):
+        for key, values in chunk.groupby([chunk[col] for col in self.group_cols], sort=False)[self.value_col]:
+            values = values.dropna().to_numpy(dtype=float)
+            if len(values): self.add(key, values, self.rng.random(len(values)))
+
+    def add(self, key, values, priorities):
+        # KEEPING THE K SMALLEST RANDOM PRIORITIES OF THE UNION IS AN EXACT UNIFORM SAMPLE OF EVERYTHING SEEN SO FAR
+        if key in self.samples:
+            old_values, old_priorities, low, high = self.samples[key]
+            values, priorities = np.concatenate([old_values, values]), np.concatenate([old_priorities, priorities])
+        else: low, high = np.inf, -np.inf
+        low, high = min(low, values.min()), max(high, values.max())
+        if len(values) > self.size:
+            keep = np.argpartition(priorities, self.size)[:self.size]
+            values, priorities = values[keep], priorities[keep]
+        self.samples[key] = (values, priorities, low, high)
+
+# %% COUNTS PER GROUP OVER FIXED BIN EDGES (HISTOGRAMS)
+class BinCountReducer:
+    def __init__(self, value_col, group_cols, edges):
+        self.value_col, self.group_cols, self.edges = value_col, group_cols, edges
+        self.counts = {}
+
+    def update(self, chunk):
+        groups = chunk.groupby([chunk[col] for col in self.group_cols], sort=False) if self.group_cols else [(None, chunk)]
+        for key, group in groups:
+            counts = np.histogram(group[self.value_col].dropna().to_numpy(dtype=float), bins=self.edges)[0]
+            self.counts[key] = self.counts[key] + counts if key in self.counts else counts
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# METHODS
+#-----------------------------------------------------------------------------------------------------------------------
+# %% PLOT TYPES THAT CAN DRAW FROM PER-GROUP STATISTICS, OTHERS LOAD A CHUNKSIZE CSV INPUT IN FULL
+STREAMING_TYPES = ('bar', 'boxwhisker', 'hist')
+
+# %% A CHUNKSIZE CSV INPUT IS STREAMED ONLY IF ITS LABELS ARE COLUMNS OF THE FILE AND NO PER-ROW ERROR BARS ARE GIVEN
+def can_stream(input_dict):
+    """
+    Streamed frames hold per-group statistics, not rows, so unnamed labels (which default to the file's columns) and
+    error bars (one value per row) need the rows loaded in full instead.
+    """
+    header = pd.read_csv(input_dict['csv_path'], nrows=0).columns
+    if input_dict.get('xlab') not in header: return False
+    if input_dict.get('ylab') is not None and input_dict['ylab'] not in header: return False
+    return all(input_dict.get(name) is None for name in input_dict.get('err_names', ERROR_NAMES))
+
+# %% READ A CSV FILE CHUNK BY CHUNK, DROPPING UNWANTED GROUPS FROM EVERY CHUNK
+def read_chunks(path, columns, chunksize, dtypes=None, engine=None, group_col=None, groups=None):
+    if dtypes is not None: dtypes = {k: v for k, v in dtypes.items() if k in columns}
+    # THE PYARROW ENGINE CANNOT READ IN CHUNKS, SO IT FALLS BACK TO THE DEFAULT ENGINE
+    if engine == 'pyarrow': engine = None
+    usecols = columns if groups is None else list(dict.fromkeys(columns + [group_col]))
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize, dtype=dtypes, engine=engine):
+        yield chunk if groups is None else select_from_frame(chunk, group_col=group_col, groups=groups)
+
+# %% FOLD A CSV FILE INTO ONE OR MORE REDUCERS WITHOUT EVER HOLDING MORE THAN ONE CHUNK
+def stream_csv(path, reducers, columns, chunksize, dtypes=None, engine=None, group_col=None, groups=None):
+    for chunk in read_chunks(path, columns, chunksize, dtypes, engine, group_col, groups):
+        for reducer in reducers: reducer.update(chunk)
+    return reducers
+
+def value_range(path, column, chunksize, dtypes=None, engine=None, group_col=None, groups=None):
+    low, high = np.inf, -np.inf
+    for chunk in read_chunks(path, [column], chunksize, dtypes, engine, group_col, groups):
+        values = chunk[column].astype(float)
+        low, high = min(low, values.min()), max(high, values.max())
+    return low, high
+
+# %% HALF-WIDTH OF THE ERROR BAR SEABORN WOULD DRAW FOR A GROUP, FROM ITS COUNT, MEAN AND STANDARD DEVIATION
+def error_half_width(errorbar, count, sd):
+    method, level = (errorbar, None) if isinstance(errorbar, str) else errorbar
+    if method == 'sd': return (1 if level is None else level) * sd
+    elif method == 'se': return (1 if level is None else level) * sd / np.sqrt(count)
+    elif method == 'ci':
+        # BOOTSTRAPPING NEEDS THE RAW ROWS, SO CONFIDENCE INTERVALS USE THE NORMAL APPROXIMATION
+        z = NormalDist().inv_cdf(0.5 + (95 if level is None else level) / 200)
+        return z * sd / np.sqrt(count)
+    raise ValueError(f"errorbar={errorbar!r} cannot be computed from streamed statistics, use 'ci', 'se', 'sd' or None")
+
+# %% EXPAND GROUP MOMENTS INTO A TWO-ROW PSEUDO SAMPLE PER GROUP
+def moments_to_frame(stats, xlab, ylab, zlab, errorbar=('ci', 95)):
+    """
+    Two rows at mean -/+ d have the group mean as their mean and d as their standard error, so seaborn's barplot with
+    errorbar=('se', 1) draws the same bar and error bar that errorbar would give on the raw rows.
+    """
+    stats = stats[stats['count'] > 0]
+    count = stats['count'].to_numpy(dtype=float)
+    mean = stats['sum'].to_numpy() / count
+    var = (stats['sumsq'].to_numpy() - count * mean ** 2) / np.maximum(count - 1, 1)
+    sd = np.sqrt(np.clip(var, 0, None))
+    half = np.zeros(len(mean)) if errorbar is None else np.where(count > 1, error_half_width(errorbar, count, sd), 0)
+
+    keys = stats.index.to_frame(index=False)
+    keys.columns = [xlab] if zlab is None else [xlab, zlab]
+    DF = pd.concat([keys, keys], ignore_index=True)
+    DF[ylab] = np.concatenate([mean - half, mean + half])
+    order = np.arange(len(DF)).reshape(2, -1).T.ravel()
+    return DF.iloc[order].reset_index(drop=True)
+
+# %% CONCATENATE GROUP SAMPLES (WITH THEIR EXACT EXTREMES) INTO ONE LONG FRAME
+def samples_to_frame(samples, xlab, ylab, zlab):
+    frames = []
+    for key, (values, priorities, low, high) in samples.items():
+        key = key if isinstance(key, tuple) else (key,)
+        values = np.concatenate([values, [low, high]])
+        frame = pd.DataFrame({xlab: np.repeat(key[0], len(values)), ylab: values})
+        if zlab is not None: frame[zlab] = key[1]
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+# %% ONE ROW PER (GROUP, BIN) WITH THE BIN CENTER AND ITS COUNT AS A WEIGHT
+def counts_to_frame(counts, edges, xlab, zlab, weight_col='_count'):
+    centers = (np.asarray(edges[:-1]) + np.asarray(edges[1:])) / 2
+    frames = []
+    for key, group_counts in counts.items():
+        frame = pd.DataFrame({xlab: centers, weight_col: group_counts})
+        if zlab is not None: frame[zlab] = key[0] if isinstance(key, tuple) else key
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+# %% BUILD THE REDUCED FRAME (AND ADJUSTED SEABORN KWARGS) FOR A PLOT TYPE FROM input_dict['csv_path']
+def stream_frame(plot_type, input_dict, kwargs):
+    path, chunksize, dtypes = input_dict['csv_path'], input_dict['chunksize'], input_dict.get('dtypes')
+    header = pd.read_csv(path, nrows=0).columns
+    xlab, ylab, zlab = input_dict['xlab'], input_dict['ylab'], input_dict['zlab']
+    if xlab not in header: raise ValueError(f"xlab={xlab!r} is not a column of {path}, streaming needs the column names")
+
+    # groups= KEEPS ONLY THOSE VALUES OF zlab, AS IT DOES FOR FILES READ IN FULL
+    groups = input_dict.get('groups')
+    if groups is not None and zlab not in header: raise ValueError("groups= requires zlab to name the group column")
+    groups = None if groups is None else [groups] if isinstance(groups, str) else list(groups)
+    read = {'dtypes': dtypes, 'engine': input_dict.get('csv_engine'), 'group_col': zlab, 'groups': groups}
+    zlab = zlab if zlab in header else None
+
+    if plot_type == 'hist':
+        if ylab in header: raise ValueError("Streamed histograms are one-dimensional, do not pass ylab with chunksize")
+        group_cols = [] if zlab is None else [zlab]
+        bins = kwargs.pop('bins', 50)
+        binrange, binwidth = kwargs.pop('binrange', None), kwargs.pop('binwidth', None)
+
+        # FIXED EDGES ARE NEEDED BEFORE COUNTING, SO AN EXTRA PASS FINDS THE RANGE UNLESS EDGES OR RANGE ARE GIVEN
+        if np.ndim(bins) == 1: edges = np.asarray(bins, dtype=float)
+        else:
+            low, high = binrange if binrange is not None else value_range(path, xlab, chunksize, **read)
+            if binwidth is not None: edges = np.arange(low, high + binwidth, binwidth)
+            else: edges = np.linspace(low, high, (bins if isinstance(bins, int) else 50) + 1)
+        reducer = BinCountReducer(xlab, group_cols, edges)
+        stream_csv(path, [reducer], [xlab] + group_cols, chunksize, **read)
+        kwargs['bins'], kwargs['weights'] = list(edges), '_count'
+        return counts_to_frame(reducer.counts, edges, xlab, zlab), kwargs
+
+    if ylab not in header: raise ValueError(f"ylab={ylab!r} is not a column of {path}, streaming needs the column names")
+    group_cols = [xlab] if zlab is None else [xlab, zlab]
+    if plot_type == 'bar':
+        reducer = MomentReducer(ylab, group_cols)
+        stream_csv(path, [reducer], group_cols + [ylab], chunksize, **read)
+        DF = moments_to_frame(reducer.stats, xlab, ylab, zlab, kwargs.get('errorbar', ('ci', 95)))
+        if kwargs.get('errorbar', ('ci', 95)) is not None: kwargs['errorbar'] = ('se', 1)
+        return DF, kwargs
+
+    reducer = SampleReducer(ylab, group_cols)
+    stream_csv(path, [reducer], group_cols + [ylab], chunksize, **read)
+    return samples_to_frame(reducer.samples, xlab, ylab, zlab), kwargs
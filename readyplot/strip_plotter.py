@@ -5,12 +5,14 @@ A child class for the base plotter which produces stripplots
 @author: Shawn Pavey
 """
 # %% IMPORT PACKAGES
-import matplotlib.pyplot as plt
 import seaborn as sns
-import numpy as np
 from .base_plotter import BasePlotter
-from .utils import match_rgba_to_color, check_labels_in_DF
+from .settings import STAGE_SETTINGS
+from .themes import themed
+from .utils import match_rgba_to_color, check_labels_in_DF, replace_column, hue_colors
 from matplotlib.colors import to_rgb
+from matplotlib.lines import Line2D
+from colorsys import rgb_to_hls
 import warnings
 
 #%%---------------------------------------------------------------------------------------------------------------------
@@ -18,19 +20,23 @@ import warnings
 #-----------------------------------------------------------------------------------------------------------------------
 # %% INITIALIZE CHILD CLASS
 class StripPlotter(BasePlotter):
+    # THE MEAN AND ERROR MARKERS ARE SIZED BY fig_width, SO CHANGING IT REDRAWS THE DATA
+    stage_settings = {**STAGE_SETTINGS, 'figure': ('fig_height', 'dpi')}
+
     def __init__(self, input_dict,**kwargs):
         super().__init__(input_dict,**kwargs)
         self.plot_type = 'strip'
 
     # %% DEFINE PLOTTER, PREPARE INPUTS
+    @themed
     def just_plot(self,**kwargs):
         self.ensure_fig_ax_exist()
-        self.DF[self.xlab] = self.DF[self.xlab].astype(str)
+        self.encode_x()
         conflict_vars,defaults_list,inputs,input_keys,outputs = self.generate_resolver_lists(locals(),kwargs)
         DF,kwargs, markers,palette,dodge,ax,capsize,linewidth,width = outputs
         palette, linewidth, width = super().var_existence_check(inputs,input_keys,defaults_list, kwargs=kwargs)
         xlab,ylab,zlab,dodge = self.label_prep(locals())
-        self.width = width
+        self.width, self.legend_palette = width, palette
 
         # %% PLOT WITH SEABORN, FIRST INVISIBLE BAR PLOTS FOR ERRORS, THEN STRIPPLOT ITERATION FOR MARKER HANDLING
         self.pre_lines = self.ax.get_lines()
@@ -48,16 +54,12 @@ class StripPlotter(BasePlotter):
 
         for i, u in enumerate(self.unique):
             marker = self.markers[i]
-            tempDF = DF.copy()
-            for v in self.unique:
-                tempDF[ylab], tempDF.loc[tempDF[zlab] == v, ylab] = (
-                    tempDF[ylab].astype(float), float("inf")) if v != u else (
-                tempDF[ylab], tempDF.loc[tempDF[zlab] == v, ylab])
+            tempDF = replace_column(DF, ylab, self.other_groups_to_inf(DF, ylab, i))
 
             sns.stripplot(
                 x=xlab, y=ylab, data=tempDF, hue=zlab,
                 palette=palette, linewidth=linewidth, dodge=dodge, marker=marker,
-                ax=ax, **kwargs)
+                ax=ax, legend=False, **kwargs)
 
         # %% EXTRA PLOT EDITING
         if any(getattr(self, attr) is not None for attr in self.err_names): self.plot_errors(xlab, ylab, zlab)
@@ -71,7 +73,7 @@ class StripPlotter(BasePlotter):
 #-----------------------------------------------------------------------------------------------------------------------
 # %% LOAD ALL PARENT METHODS UNLESS THEY EXIST HERE
     def __getattr__(self, name):
-        super().__getattr__(name)
+        return super().__getattr__(name)
 
 # %% CUSTOM METHODS
     def generate_resolver_lists(self,loc_vars,kwargs):
@@ -89,7 +91,7 @@ class StripPlotter(BasePlotter):
         dodge,DF = l['dodge'],l['DF']
         xlab,ylab,zlab = check_labels_in_DF(self.DF,self.xlab,self.ylab,self.zlab)
         (zlab,dodge) = (xlab,False) if zlab is None else (zlab,dodge)
-        plt.ylim(DF[ylab].min(), DF[ylab].max())
+        self.ax.set_ylim(DF[ylab].min(), DF[ylab].max())
         return xlab,ylab,zlab,dodge
 
     def hatches_and_colors(self,l):
@@ -110,4 +112,9 @@ class StripPlotter(BasePlotter):
 
                 counter +=1
 
-
+    def legend_handle(self,i,color):
+        # THE MARKER OF THIS GROUP'S STRIPPLOT, EDGED IN SEABORN'S AUTOMATIC GRAY (0.6 x THE DARKEST PALETTE LIGHTNESS)
+        palette = hue_colors(self.legend_palette or self.colors, self.group_index().hue_order())
+        gray = min(rgb_to_hls(*to_rgb(c))[1] for c in palette) * .6
+        return Line2D([], [], linestyle='', marker=self.markers[i % len(self.markers)], markersize=5, color=color,
+                      markerfacecolor=color, markeredgecolor=(gray, gray, gray), markeredgewidth=self.def_line_w)
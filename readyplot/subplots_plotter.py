@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A class which produces subplots existing ready plot objects
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+import os
+from .base_plotter import BasePlotter
+from .utils import check_labels_in_DF, dict_update_nested, agg_figure
+from .themes import theme_colors, theme_rc, theme_context, settle_figure
+from matplotlib.colors import to_rgb
+import matplotlib.patches as patches
+from pathlib import Path
+import matplotlib.lines as mlines
+
+# %% plt.subplots KWARGS THAT BELONG TO Figure.subplots RATHER THAN TO THE FIGURE
+SUBPLOT_KWARGS = ['sharex', 'sharey', 'squeeze', 'width_ratios', 'height_ratios', 'subplot_kw', 'gridspec_kw']
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# CHILD CLASS MAIN
+#-----------------------------------------------------------------------------------------------------------------------
+# %% INITIALIZE SUB PLOTTER
+class SubPlots(BasePlotter):
+    def __init__(self, *args,**kwargs):
+        for name, value in kwargs.items(): setattr(self, name, value)
+        self.input_args = list(args)
+        self.input_kwargs = kwargs
+
+        if len(args) == 1: self.shape = args[0]
+        elif len(args) == 2: self.shape = (args[0],args[1])
+
+    # %% DEFINE PLOTTER, PREPARE INPUTS
+    def plot(self,*temp_args,save=True,folder_name = "OUTPUT_FIGURES",adjust_mismatch=True,ax_num=0,**kwargs):
+        # INITIATE
+        kwargs = dict_update_nested(self.input_kwargs,kwargs)
+        setattr(self,'folder_name',folder_name)
+        args = []
+        individual_kwargs_list = []
+
+        # HANDLE ARGS
+        for ar in temp_args:
+            if isinstance(ar,dict):
+                individual_kwargs_list[-1] = ar
+            else:
+                args.append(ar)
+                individual_kwargs_list.append({})
+
+        # HANDLE KWARGS AND SET SELF ITEMS
+        for name, value in kwargs.items(): setattr(self, name, value)
+        if len(self.input_args) != 0 and len(args) == 0:  args = self.input_args
+
+        # INITIALIZE SOME DEFAULTS
+        if 'figsize' not in kwargs: self.figsize=(4,3)
+
+        if not hasattr(self, 'shape'): self.shape = (1,len(args))
+        self.empty_locator = np.zeros(shape=self.shape)
+
+        try:
+            # LOAD SETTINGS FROM THE FIRST PLOT TO CONTROL FIGURE THEME
+            template_plot = args[0][0] if isinstance(args[0], list) or isinstance(args[0], tuple) else args[0]
+            first_plot_settings = template_plot.get_copy_settings()
+
+            self.grid_color = first_plot_settings['grid_color']
+            self.line_color, self.back_color = theme_colors(first_plot_settings['line_color'],
+                                                            first_plot_settings['back_color'],
+                                                            first_plot_settings['darkmode'],
+                                                            first_plot_settings['transparent'])
+
+            # THE FIRST PLOT'S THEME (SNS STYLE, CONTEXT, PALETTE AND PLT COLORS) IS SCOPED TO THIS FIGURE
+            self.theme = theme_rc(first_plot_settings['sns_style'], first_plot_settings['sns_context'],
+                                  first_plot_settings['darkmode'], self.line_color, self.back_color, self.grid_color)
+
+        except AttributeError:
+            print('SKIPPED LOADING SETTINGS')
+            first_plot_settings, self.theme = {'transparent': False, 'darkmode': False}, theme_rc()
+
+        # DRAW THROUGH PYPLOT UNLESS use_pyplot=False IS PASSED HERE OR WAS SET ON THE FIRST PLOT
+        self.use_pyplot = kwargs.pop('use_pyplot', first_plot_settings.get('use_pyplot', True))
+        self.figure_pool = kwargs.pop('figure_pool', first_plot_settings.get('figure_pool'))
+        self.auto_close = kwargs.pop('auto_close', first_plot_settings.get('auto_close', False))
+        self.low_memory = kwargs.pop('low_memory', first_plot_settings.get('low_memory', False))
+
+        # THE TILES ARE BUILT INSIDE THE THEME, SAVING DRAWS THEM OUTSIDE IT (SEE themes.settle_figure)
+        with theme_context(self.theme):
+            fig, axs = self.plot_tiles(args,individual_kwargs_list,first_plot_settings,ax_num,kwargs)
+            settle_figure(fig)
+        if save: self.save()
+        return fig, axs
+
+    # %% CREATE THE SUBPLOTS AND RE-PLOT EVERY READYPLOT INTO ITS TILE
+    def plot_tiles(self,args,individual_kwargs_list,first_plot_settings,ax_num,kwargs):
+        from .__init__ import bar, boxwhisker, hist, line, scatter, strip
+
+        # INITIALIZE SUBPLOTS, WITHOUT PYPLOT (OR FROM A POOL) THE FIGURE KWARGS AND THE SUBPLOT KWARGS ARE SPLIT BY HAND
+        if self.use_pyplot and self.figure_pool is None:
+            self.fig, self.axs = plt.subplots(self.shape[0], self.shape[1],**kwargs)
+        else:
+            subplot_kwargs = {key: kwargs.pop(key) for key in SUBPLOT_KWARGS if key in kwargs}
+            self.fig = agg_figure(**kwargs) if self.figure_pool is None else self.figure_pool.acquire(**kwargs)
+            self.axs = self.fig.subplots(self.shape[0], self.shape[1],**subplot_kwargs)
+        self.own_figure = (self.fig, self.figure_pool)
+        self.set_ax_from_collection(ax_num=ax_num)
+
+        self.counter = 0
+        self.abs_counter = 0
+        self.rps = []
+
+        # ITERATE THROUGH THE EMPTY SUBPLOT POSITIONS
+        for ar in args:
+            row, col = self.get_next_position()
+            rps = ar if isinstance(ar, list) or isinstance(ar, tuple) else [ar]
+
+            # IF MULTIPLE READYPLOTS ARE PASSED IN A LIST TO ONE POSITION, STACK THEM, ELSE JUST APPLY FOR SINGLE
+            for rp in rps:
+                if rp.__dict__.get('data_released'):
+                    raise ValueError("A plot rendered with low_memory=True released its data and cannot be redrawn "
+                                     "into subplots, pass low_memory=True only to plots that are not reused")
+                # SNAPSHOT SETTINGS (NOTHING BELOW THE TOP LAYER IS COPIED) AND COLLECT THIS TILE'S OVERRIDES
+                current_settings = rp.get_copy_settings(include_problematic=True)
+                overrides = {key: dict_update_nested(current_settings[key], value)
+                             if isinstance(value, dict) and isinstance(current_settings.get(key), dict) else value
+                             for key, value in individual_kwargs_list[self.abs_counter].items()}
+
+                # HANDLE SOME UNIQUE VARIABLES FOR PROPER BEHAVIOR
+                overrides['first_time_legend'] = True
+                overrides['low_memory'] = self.low_memory
+                if self.shape[0] == 1:
+                    try:
+                        overrides['input_ax'] = self.axs[col]
+                    except:
+                        overrides['input_ax'] = self.axs
+                elif self.shape[1] == 1: overrides['input_ax'] = self.axs[row]
+                else: overrides['input_ax'] = self.axs[row, col]
+
+                if first_plot_settings['transparent']: overrides['transparent'] = True
+                if first_plot_settings['darkmode']: overrides['darkmode'] = True
+                overrides['imported_settings'] = current_settings
+
+                # CREATE A NEW READYPLOT ITEM WITH COPIED SETTINGS BASED ON PLOT TYPE
+                if rp.get('plot_type') == 'bar': new_rp = bar(**overrides)
+                elif rp.get('plot_type') == 'boxwhisker': new_rp = boxwhisker(**overrides)#,input_ax=self.axs[row,col])
+                elif rp.get('plot_type') == 'hist': new_rp = hist(**overrides)
+                elif rp.get('plot_type') == 'line': new_rp = line(**overrides)
+                elif rp.get('plot_type') == 'scatter': new_rp = scatter(**overrides)
+                elif rp.get('plot_type') == 'strip': new_rp = strip(**overrides)
+                else: new_rp = None
+                new_rp.plot(save=False)
+                self.rps.append(new_rp)
+
+            self.empty_locator[row][col] = 1
+            self.abs_counter += 1
+
+        # SET FIGURE SIZE BASED ON THE INPUT FIGSIZE AND THE TILE SHAPE
+        self.fig.set_size_inches(self.figsize[0]*self.shape[1],self.figsize[1]*self.shape[0])
+        self.fig.tight_layout()
+
+        # FIND ALL THE EMPTY AXES AND SET THEM TO BE INVISIBELE
+        while self.abs_counter < self.shape[0]*self.shape[1]:
+            row, col = self.get_next_position()
+
+            self.axs[row,col].spines['top'].set_visible(False)
+            self.axs[row,col].spines['right'].set_visible(False)
+            self.axs[row,col].spines['bottom'].set_visible(False)
+            self.axs[row,col].spines['left'].set_visible(False)
+            self.axs[row,col].tick_params(axis='both', which='both', length=0, width=0, colors='none')
+            self.axs[row,col].set_xlabel('', color='none')
+            self.axs[row,col].set_ylabel('', color='none')
+            self.axs[row,col].set_xticklabels([], color='none')
+            self.axs[row,col].set_yticklabels([], color='none')
+            self.axs[row,col].grid(False)
+            self.axs[row,col].set_facecolor('none')
+
+            self.abs_counter += 1
+
+        # LOCATE EMPTY AXES
+        for row in range(self.empty_locator.shape[0]):
+            if np.any(self.empty_locator[row][:] == 0):
+                filled_axes = []
+                for col in range(self.empty_locator.shape[1]):
+                    if self.empty_locator[row,col] == 1:
+                        filled_axes.append(self.axs[row,col])
+
+                # GET WIDTH OF SUBPLOTS
+                first_pos = self.axs[0,0].get_position()
+                second_pos = self.axs[0,1].get_position()
+                sub_width = second_pos.x0 - first_pos.x0
+
+                # CENTER EXISTING SUBPLOTS TO FILL THE SPACE
+                if len(filled_axes) > 0:
+                    current_pos = filled_axes[0].get_position()
+                    current_x = current_pos.x0 + ((self.shape[1] - len(filled_axes))/2) * sub_width
+                    for ax in filled_axes:
+                        pos = ax.get_position()
+                        ax.set_position([current_x, pos.y0, pos.width, pos.height])
+                        current_x += sub_width
+
+        return self.fig, self.axs
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# LOCAL METHODS
+#-----------------------------------------------------------------------------------------------------------------------
+    def get_next_position(self):
+        # CALCULATE ROW AND COLUMN INDICES BASED ON COUNTER
+        rows, cols = self.shape
+        row = self.counter // cols
+        col = self.counter % cols
+
+        # INCREMENT AND WRAP AROUND WHEN COLS EXCEEDED
+        self.counter = (self.counter + 1) % (rows * cols)
+        return row, col
+
+    def get_subplot_coordinates(self,sub_num):
+        # GET COORDINATES BASED ON THE NUMBER OF THE FIGURE
+        nrows,ncols = self.shape[0], self.shape[1]
+        if sub_num < 0 or sub_num >= nrows * ncols:
+            raise ValueError(f"Invalid subplot number. It should be between 1 and {nrows * ncols}.")
+        row = sub_num // ncols
+        col = sub_num % ncols
+        return row, col
+
+    def kwarg_conflict_resolver(self, kwargs, conflict_vars):
+        # COMBINE INPUT KWARGS WITH GENERAL KWARGS
+        if len(kwargs) != 0: kwargs = {**self.kwargs, **kwargs}
+        else: kwargs = self.kwargs
+
+        # FOR VAR IN THE SUPPLIED CONFLICT_VARS LIST, IF IT IS IN THE SUPPLIED KWARGS USE IT, ELSE GET SELF.VAR
+        outputs = []
+        for var in conflict_vars:
+            if var in kwargs:
+                outputs.append(kwargs[var])
+                del kwargs[var]
+            else: outputs.append(getattr(self,var,None))
+
+        # RETURN UPDATED KWARGS LIST AND UNPACKED OUTPUTS
+        return kwargs, *outputs
+
+    def save(self, **kwargs):
+        # IF THE FOLDER NAME DOES NOT HAVE A '.' USE SAVE NAME AUTOPOPULATED FUNCTION WHICH BUILDS A NAME
+        if '.' not in self.folder_name:
+            save_name, dir_name = self.save_name_autopopulated()
+
+        # IF A '.' IS IN THE FOLDER NAME, JUST USE THAT AS THE ENTIRE SAVE
+        else:
+            self.dir_name = self.folder_name.split(os.sep)[:-1]
+            self.dir_name = os.path.join(os.sep, *self.dir_name) if self.folder_name[0] == os.sep else os.path.join('',
+                                                                                                                    *self.dir_name)
+            save_name, dir_name = self.folder_name, self.dir_name
+
+        # TRY TO MAKE A DIRECTORY OR USE THE CURRENT ONE
+        try:
+            os.mkdir(dir_name)
+        except FileExistsError:
+            pass#print(f"Directory '{dir_name}' already exists, overwriting and/or adding data.")
+        #print(f"Directory '{dir_name}' created successfully.")
+
+        # SAVE FIGURE
+        self.fig.savefig(save_name, bbox_inches='tight', **kwargs) #transparent=self.transparent, **kwargs)
+        fig, axs = self.fig, self.axs
+        if self.auto_close: self.close()
+        return fig, axs
+
+    # %% CLOSE THE FIGURE AND LET THE TILE PLOTTERS FORGET THEIR AXES IN IT
+    def close(self):
+        for rp in self.__dict__.get('rps', []): rp.close()
+        super().close()
+        self.__dict__.pop('axs', None)
+
+    def save_name_autopopulated(self):
+        # MAKE SAVE NAME FROM DF.NAME (SET DURING SET_TITLES) AND PLOT TYPE, HANDLE "/"
+        self.save_name = 'SUBPLOTS'
+
+        # MAKE AND RETURN SAVE NAME AND DIRECTORY NAME
+        save_name = Path(os.path.join(self.folder_name + os.sep, self.save_name + '.png'))
+        dir_name = self.folder_name
+        return save_name,dir_name
+
+    def get_rps(self):
+        return self.rps
+
+    def set_ax_from_collection(self,ax_num=0):
+        row, col = self.get_subplot_coordinates(ax_num)
+        if self.shape[0] == 1:
+            try:
+                self.ax = self.axs[col]
+            except:
+                self.ax = self.axs
+        elif self.shape[1] == 1: self.ax = self.axs[row]
+        else: self.ax = self.axs[row][col]
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# EXTRA MATPLOTLIB TYPE FUNCTIONS WHICH USERS MIGHT EXPECT TO NEED
+#-----------------------------------------------------------------------------------------------------------------------
+    # %% AXES
+    def xlim(self,*args,**kwargs):
+        self.set_xlim(*args,**kwargs)
+    def ylim(self,*args,**kwargs):
+        self.set_ylim(*args,**kwargs)
+    def set_xlim(self,*args,**kwargs):
+        self.ax.set_xlim(*args,**kwargs)
+    def set_ylim(self,*args,**kwargs):
+        self.ax.set_ylim(*args,**kwargs)
+    def get_xlim(self,*args,**kwargs):
+        self.ax.get_xlim(*args,**kwargs)
+    def get_ylim(self,*args,**kwargs):
+        self.ax.get_ylim(*args,**kwargs)
+
+    def xticks(self,*args,**kwargs):
+        self.fig.xticks(*args,**kwargs)
+    def yticks(self,*args,**kwargs):
+        self.fig.yticks(*args,**kwargs)
+    def get_xticks(self,*args,**kwargs):
+        self.ax.get_xticks(*args,**kwargs)
+    def get_yticks(self,*args,**kwargs):
+        self.ax.get_yticks(*args,**kwargs)
+    def get_xticklabels(self,*args,**kwargs):
+        self.ax.get_xticklabels(*args,**kwargs)
+    def get_yticklabels(self,*args,**kwargs):
+        self.ax.get_yticklabels(*args,**kwargs)
+
+    def gca(self,*args,**kwargs):
+        plt.gca(*args,**kwargs)
+    def gcf(self,*args,**kwargs):
+        plt.gcf(*args,**kwargs)
+
+    def axhline(self,*args,**kwargs):
+        self.ax.axhline(*args,**kwargs)
+    def axvline(self,*args,**kwargs):
+        self.ax.axvline(*args,**kwargs)
+    def grid(self,*args,**kwargs):
+        self.ax.grid(*args,**kwargs)
+
+    def set_aspect(self,*args,**kwargs):
+        self.ax.set_aspect(*args,**kwargs)
+    def get_aspect(self,*args,**kwargs):
+        self.ax.get_aspect(*args,**kwargs)
+
+    def set_facecolor(self,*args,**kwargs):
+        self.ax.set_facecolor(*args,**kwargs)
+    def get_facecolor(self,*args,**kwargs):
+        self.ax.get_facecolor(*args,**kwargs)
+
+    def set_position(self,*args,**kwargs):
+        self.ax.set_position(*args,**kwargs)
+    def get_position(self,*args,**kwargs):
+        self.ax.get_position(*args,**kwargs)
+
+    # %% TITLES, LABELS
+    def title(self,*args,**kwargs):
+        self.ax.set_title(*args,**kwargs)
+    def get_title(self,*args,**kwargs):
+        self.ax.get_title(*args,**kwargs)
+    def xlabel(self,*args,**kwargs):
+        self.ax.set_xlabel(*args,**kwargs)
+    def get_xlabel(self,*args,**kwargs):
+        self.ax.get_xlabel(*args,**kwargs)
+    def ylabel(self,*args,**kwargs):
+        self.ax.set_ylabel(*args,**kwargs)
+    def get_ylabel(self,*args,**kwargs):
+        self.ax.get_ylabel(*args,**kwargs)
+
+    # %% LEGENDS
+    def legend(self,*args,**kwargs):
+        included_keywords = ['loc', 'numpoints', 'markerscale',
+                             'markerfirst', 'reverse', 'scatterpoints', 'scatteryoffsets', 'prop',
+                             'fontsize', 'labelcolor', 'borderpad', 'labelspacing', 'handlelength',
+                             'handleheight', 'handletextpad', 'borderaxespad', 'columnspacing', 'ncols',
+                             'mode', 'fancybox', 'shadow', 'title', 'title_fontsize', 'framealpha',
+                             'edgecolor', 'facecolor', 'bbox_transform', 'frameon',
+                             'handler_map', 'title_fontproperties', 'alignment', 'ncol', 'draggable']
+        filtered_properties = {}
+        for key,value in self.ax.get_legend().properties().items():
+            if key in included_keywords: filtered_properties[key] = value
+            if key == 'title': filtered_properties[key] = value.get_text()
+        filtered_properties = dict_update_nested(filtered_properties, kwargs)
+
+        handles, labels = self.ax.get_legend_handles_labels()
+
+        text_color = self.ax.get_legend().get_texts()[0].get_color()
+        text_fontweight = self.ax.get_legend().get_texts()[0].get_fontweight()
+        text_fontsize = self.ax.get_legend().get_texts()[0].get_fontsize()
+
+        legend = self.ax.legend(handles,labels,**filtered_properties)
+
+        for text in legend.get_texts():
+            text.set_color(text_color)
+            text.set_fontweight(text_fontweight)
+            text.set_fontsize(text_fontsize)
+
+        legend.get_title().set_color(text_color)
+        legend.get_title().set_fontweight(text_fontweight)
+
+        return legend
+    def get_legend(self,*args,**kwargs):
+        self.legend = self.ax.get_legend(*args,**kwargs)
+        return self.legend
+    def text(self,*args,**kwargs):
+        self.fig.text(*args,**kwargs)
+    def get_texts(self,*args,**kwargs):
+        self.fig.get_texts(*args,**kwargs)
+    def figtext(self,*args,**kwargs):
+        self.fig.figtext(*args,**kwargs)
+    def annotate(self,*args,**kwargs):
+        self.fig.annotate(*args,**kwargs)
+    def suptitle(self,*args,**kwargs):
+        self.fig.suptitle(*args,**kwargs)
+    def get_suptitle(self,*args,**kwargs):
+        self.fig.get_suptitle(*args,**kwargs)
+    def add_patch(self,*args,**kwargs):
+        if not isinstance(args, list): args = list(args)
+        for arg in args:
+            self.ax.add_patch(arg)
+    def add_rectangle(self,*args,**kwargs):
+        rect = patches.Rectangle((args[0], args[1]), args[2], args[3], **kwargs)
+        self.ax.add_patch(rect)
+    def add_line(self,*args,**kwargs):
+        line = mlines.Line2D(args[0], args[1], **kwargs)
+        self.ax.add_line(line)
+
+    # %% FIGURE AND LAYOUT CUSTOMIZATION
+    def set_figheight(self,val,**kwargs):
+        self.fig_height = val
+        self.fig.set_figheight(self.fig_height,**kwargs)
+    def get_figheight(self,*args,**kwargs):
+        self.fig.get_figheight(*args,**kwargs)
+    def set_figwidth(self,val,**kwargs):
+        self.fig_width = val
+        self.fig.set_figwidth(self.fig_width,**kwargs)
+    def get_figwidth(self,*args,**kwargs):
+        self.fig.get_figwidth(*args,**kwargs)
+    def show(self):
+        self.fig.show()
+    def draw(self):
+        self.fig.draw()
\ No newline at end of file
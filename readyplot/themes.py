@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A themes file, themes, which resolves every combination of seaborn style, context, palette and line/back/grid colors
+once into an immutable rc dictionary, applied with a scoped matplotlib rc_context while the artists are built instead of
+changing the global matplotlib and seaborn state.
+rcParams are process-wide, so building the artists (pre_format, just_plot, post_format) holds THEME_LOCK and themed
+builds in other threads wait for it. Drawing and saving do not: settle_figure fixes the little matplotlib would still
+read from rcParams while drawing (generic font families, cycle colors, lazily created ticks, tick label size) before
+the theme is restored, so the expensive part of a render (drawing and encoding) runs concurrently across threads.
+pyplot calls made outside readyplot do not take the lock and can see the theme of a build running in another thread,
+wrap them in `with THEME_LOCK:` when they must not.
+@author: Shawn Pavey
+"""
+# %% IMPORT PACKAGES
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from contextlib import contextmanager
+import threading
+import re
+
+# %% rcParams ARE PROCESS-WIDE, SO THEMED BUILDS OF DIFFERENT THREADS TAKE TURNS INSTEAD OF SEEING EACH OTHER'S THEME
+# (HELD WHILE ARTISTS ARE CREATED, MATPLOTLIB AND SEABORN READ rcParams THROUGHOUT, NOT ONLY WHEN THE THEME IS APPLIED)
+THEME_LOCK = threading.RLock()
+
+#%%---------------------------------------------------------------------------------------------------------------------
+# METHODS
+#-----------------------------------------------------------------------------------------------------------------------
+# %% CUSTOM SNS STYLES/CONTEXTS (DICTS) AND RGB LISTS ARE FROZEN SO THEY CAN BE CACHE KEYS
+def freeze(value):
+    if isinstance(value, dict): return ('dict', tuple(sorted((key, freeze(val)) for key, val in value.items())))
+    if isinstance(value, list): return tuple(freeze(val) for val in value)
+    return value
+
+def thaw(value):
+    if isinstance(value, tuple) and len(value) == 2 and value[0] == 'dict': return {k: v for k, v in value[1]}
+    return value
+
+# %% LINE AND BACK COLORS AFTER DARKMODE AND TRANSPARENCY ARE APPLIED
+def theme_colors(line_color, back_color, darkmode=False, transparent=False):
+    from matplotlib.colors import to_rgb
+    if darkmode: line_color, back_color = 'white', 'black'
+    if transparent: back_color = to_rgb(back_color) + tuple([0])
+    return line_color, back_color
+
+# %% THE RC DICTIONARY FOR A THEME, BUILT ONCE PER COMBINATION
+def theme_rc(sns_style='ticks', sns_context='notebook', darkmode=False, line_color='black', back_color='white',
+             grid_color='#444444'):
+    """
+    Colors are taken as already resolved by theme_colors. The palette follows darkmode (muted in darkmode, deep
+    otherwise) as pre_format always has.
+    """
+    palette = 'muted' if darkmode else 'deep'
+    return compiled_theme(freeze(sns_style), freeze(sns_context), palette, freeze(line_color), freeze(back_color),
+                          freeze(grid_color))
+
+@lru_cache(maxsize=None)
+def compiled_theme(sns_style, sns_context, palette, line_color, back_color, grid_color):
+    import seaborn as sns
+    from cycler import cycler
+
+    # SAME RC VALUES sns.set_style, sns.set_context AND sns.set_palette WOULD WRITE GLOBALLY
+    rc = dict(sns.axes_style(thaw(sns_style)))
+    rc.update(sns.plotting_context(thaw(sns_context)))
+    rc['axes.prop_cycle'] = cycler('color', sns.color_palette(palette))
+
+    # PLT DEFAULT COLORS BASED ON LINE AND BACK COLOR AND GRID_COLOR
+    rc.update({"figure.facecolor": back_color,  # Background color of the plot
+               "axes.facecolor": back_color,  # Axes background color
+               "axes.edgecolor": line_color,  # Axes border color
+               "axes.labelcolor": line_color,  # Axis labels color
+               "legend.facecolor": back_color,  # Legend background
+               "xtick.color": line_color,  # X-axis tick color
+               "ytick.color": line_color,  # Y-axis tick color
+               "grid.color": grid_color})  # Gridline color
+    return MappingProxyType(rc)
+
+# %% APPLY A THEME UNTIL THE BLOCK EXITS, THEN RESTORE THE PREVIOUS rcParams, HOLDING THEME_LOCK THE WHOLE TIME
+@contextmanager
+def theme_context(theme):
+    import matplotlib
+    with THEME_LOCK, matplotlib.rc_context(theme): yield
+
+# %% CALLED INSIDE theme_context: FIX WHAT DRAWING WOULD LOOK UP IN rcParams, SO THE FIGURE DRAWS THE SAME OUTSIDE IT
+def settle_figure(fig):
+    import matplotlib
+    from matplotlib import font_manager
+    from matplotlib.artist import getp
+    from matplotlib.colors import to_rgba
+    from matplotlib.lines import Line2D
+    from matplotlib.text import Text
+
+    # THE FIRST MAJOR AND MINOR TICK OF AN AXIS ARE CREATED ON FIRST USE FROM rcParams, LATER TICKS COPY THEIR STYLE,
+    # AND THE NUMBER OF TICKS THAT FIT IS ESTIMATED FROM THE rcParams LABEL SIZE UNLESS ONE IS IN THE AXIS' TICK KWARGS
+    # (WRITTEN THERE DIRECTLY, set_tick_params WOULD ALSO RESIZE THE TICK LABELS ALREADY STYLED)
+    for ax in fig.axes:
+        for axis in [ax.xaxis, ax.yaxis]:
+            axis.majorTicks[0], axis.minorTicks[0]
+            axis._major_tick_kw.setdefault('labelsize', matplotlib.rcParams[axis.axis_name + 'tick.labelsize'])
+
+    # LINES AND TEXTS KEEP THEIR COLORS AS GIVEN, A CYCLE COLOR ('C0') WOULD BE LOOKED UP IN THE PALETTE WHEN DRAWN
+    # (THE LINE COLOR GOES FIRST SO MARKER COLORS FOLLOWING IT ('auto') STAY THAT WAY)
+    for line in fig.findobj(Line2D):
+        for name in ['color', 'markeredgecolor', 'markerfacecolor', 'markerfacecoloralt']:
+            if is_cycle_color(getp(line, name)): line.set(**{name: to_rgba(getp(line, name))})
+
+    # GENERIC FAMILIES ('sans-serif') ARE LOOKED UP IN rcParams WHEN TEXT IS DRAWN, SWAP THEM FOR THE FAMILY THE THEME
+    # RESOLVES TO (A FAMILY NAME, NOT A FONT FILE, SO A WEIGHT OR SIZE SET ON THE TEXT LATER STILL PICKS ITS FACE)
+    for text in fig.findobj(Text):
+        if is_cycle_color(text.get_color()): text.set_color(to_rgba(text.get_color()))
+        prop = text.get_fontproperties()
+        if any(family in font_manager.font_family_aliases for family in prop.get_family()):
+            text.set_fontfamily(font_manager.get_font(font_manager.findfont(prop)).family_name)
+
+def is_cycle_color(color):
+    return isinstance(color, str) and re.fullmatch(r'C[0-9]+', color) is not None
+
+# %% RUN A PLOTTER METHOD INSIDE THE PLOTTER'S THEME, METHODS CALLED FROM AN ALREADY THEMED METHOD REUSE ITS CONTEXT
+def themed(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.__dict__.get('theme_active', False): return method(self, *args, **kwargs)
+        theme = self.format_colors()
+        self.__dict__['theme_active'] = True
+        try:
+            with theme_context(theme): return method(self, *args, **kwargs)
+        finally: self.__dict__['theme_active'] = False
+    return wrapper
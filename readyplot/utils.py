@@ -6,10 +6,7 @@ A utility file, utils, which holds many common small functions that are often ma
 """
 #%% IMPORT PACKAGES
 def numeric_checker(string):
-    import re
-    string = re.sub(r'−', '-', string)
-    string.replace("–", "")
-    string.replace("-", "")
+    string = string.replace('−', '-')
     try:
         float(string)
         output = True
@@ -17,6 +14,38 @@ def numeric_checker(string):
         output = False
     return output
 
+def axis_is_numeric(axis):
+    # A LINEAR AXIS WITHOUT A UNITS CONVERTER (CATEGORICAL AND DATE AXES HAVE ONE) PLOTS PLAIN NUMBERS
+    converter = axis.get_converter() if hasattr(axis, 'get_converter') else axis.converter
+    return converter is None and axis.get_scale() == 'linear'
+
+def fingerprint(value):
+    # COMPARABLE STAND-IN FOR A SETTING, DATA (FRAMES, SERIES, ARRAYS) BY IDENTITY AND SHAPE, CONTAINERS ITEM BY ITEM
+    if getattr(value, 'ndim', 0) > 0: return ('data', id(value), value.shape)
+    if isinstance(value, (list, tuple)): return tuple(fingerprint(item) for item in value)
+    if isinstance(value, dict): return tuple((key, fingerprint(item)) for key, item in value.items())
+    return value
+
+def retained_bytes(value, seen):
+    # BYTES HELD BY value, FRAMES AND ARRAYS BY THEIR BUFFERS, CONTAINERS AND READYPLOT OBJECTS WITH EVERYTHING THEY HOLD
+    # (OTHER OBJECTS, E.G. FIGURES, ONLY BY THEIR OWN SIZE), OBJECTS ALREADY IN seen COUNT AS 0
+    import sys
+    from collections.abc import Mapping
+    if id(value) in seen: return 0
+    seen.add(id(value))
+    if hasattr(value, 'memory_usage'):
+        size = value.memory_usage(deep=True)
+        return int(size.sum() if hasattr(size, 'sum') else size)
+    if hasattr(value, 'nbytes') and hasattr(value, 'dtype'): return int(value.nbytes)
+    if isinstance(value, Mapping):
+        return sys.getsizeof(value) + sum(retained_bytes(k, seen) + retained_bytes(v, seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(retained_bytes(item, seen) for item in value)
+    if type(value).__module__.startswith('readyplot') and hasattr(value, '__dict__'):
+        return sys.getsizeof(value) + retained_bytes(vars(value), seen)
+    try: return sys.getsizeof(value)
+    except TypeError: return 0
+
 def min_maxer(mn,mx,cap0 = False):
     from math import log10,floor
     mag = 10**int(floor(log10(abs(mx))))
@@ -185,17 +214,16 @@ def find_closest(dictionary, x_pos):
 
 def dict_update_nested(default_dictionary, input_dictionary):
     """
-    Recursively update a nested dictionary
+    Recursively merge input_dictionary into default_dictionary, returning a new dictionary. Neither input is modified,
+    nested dictionaries that are not updated are shared instead of copied
     """
+    output = dict(default_dictionary)
     for key, value in input_dictionary.items():
-        if isinstance(value, dict):
-            if key in default_dictionary:
-                default_dictionary[key] = dict_update_nested(default_dictionary[key], value)
-            else:
-                default_dictionary[key] = value
+        if isinstance(value, dict) and isinstance(output.get(key), dict):
+            output[key] = dict_update_nested(output[key], value)
         else:
-            default_dictionary[key] = value
-    return default_dictionary
+            output[key] = value
+    return output
 
 def is_transparent(color):
     """
@@ -227,6 +255,52 @@ def is_transparent(color):
     return rgba[3] == 0
 
 
+def hue_colors(palette, levels):
+    # THE COLOR SEABORN GIVES EACH HUE LEVEL FOR A PALETTE DICT, LIST OR NAME
+    if isinstance(palette, dict): return [palette[level] for level in levels]
+    if isinstance(palette, (list, tuple)): return [palette[i % len(palette)] for i in range(len(levels))]
+    import seaborn as sns
+    return list(sns.color_palette(palette, len(levels)))
+
+
+def encode_categories(values):
+    """
+    Returns values as a pandas Categorical whose categories are the labels astype(str) would give, in order of first
+    appearance (the order seaborn uses for string columns). Only one label per distinct value is converted. A column
+    that is already encoded this way is returned as is, and values whose labels collide fall back to astype(str).
+    """
+    import numpy as np
+    import pandas as pd
+    if isinstance(values.dtype, pd.CategoricalDtype) and values.cat.categories.inferred_type in ['string', 'empty']:
+        used = pd.unique(values.cat.codes.to_numpy())
+        if np.array_equal(used[used >= 0], np.arange(len(values.cat.categories))): return values
+
+    codes, uniques = pd.factorize(values, sort=False, use_na_sentinel=False)
+    labels = pd.Index(uniques).astype(str)
+    keep = ~labels.isna()
+    if labels[keep].has_duplicates: return values.astype(str)
+    new_codes = np.full(len(labels), -1)
+    new_codes[keep] = np.arange(keep.sum())
+    return pd.Series(pd.Categorical.from_codes(new_codes[codes], categories=labels[keep]), index=values.index,
+                     name=values.name)
+
+
+def replace_column(DF, label, values):
+    # A SHALLOW COPY OF DF WITH ONE COLUMN SWAPPED, THE OTHER COLUMNS ARE SHARED RATHER THAN COPIED
+    DF = DF.copy(deep=False)
+    DF[label] = values
+    return DF
+
+
+def agg_figure(**kwargs):
+    # A FIGURE ON ITS OWN AGG CANVAS, NEVER REGISTERED WITH PYPLOT, SO IT CAN BE BUILT AND SAVED FROM ANY THREAD
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+
 def count_number_characters(x):
     s = str(x).lstrip('.').lstrip('-')
     if '.' in s: